@@ -2,8 +2,14 @@
 # Protocolo compatible:
 #   PC -> "0\n"  | Pico -> "0\n"  | luego imprime "READY\n"
 
-import sys, time
-from machine import Pin, PWM
+import sys, time, math
+import _thread
+from machine import Pin, PWM, Timer
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None  # sin PIO: el encoder se cuenta con el IRQ count_pulses
 
 # ============================================================
 #   HARDWARE
@@ -46,7 +52,22 @@ VELOCIDAD_CICLOS      = 7
 ANGULO_ENTRE_SENSORES = 88.5   # corrige si mides otro valor
 
 FACTOR_APRENDIZAJE   = 0.0     # DESACTIVADO para evitar drift
-MARGEN_DEG_PRE_FRENO = 1.0     # margen para pre-freno
+
+# Control de velocidad (Timer periódico): PI sobre las RPM medidas del encoder, con rampas trapezoidales.
+# La salida es duty_u16 = rpm_a_duty(consigna) (prealimentación) + KP·error + KI·∫error.
+# El Timer es suave: su tick corre en el núcleo 0 (hilo principal) mientras el núcleo 1 cambia las órdenes, así que
+# los campos de ctl y el duty se escriben siempre bajo _ctl_lock (el tick no espera: si está tomado, salta ese tick).
+CONTROL_HZ     = 500     # frecuencia del lazo
+RPM_WINDOW     = 10      # ticks usados para estimar las RPM (20 ms a 500 Hz)
+CTRL_KP        = 2000.0  # duty por RPM de error
+CTRL_KI        = 20000.0 # duty por RPM·s de error acumulado
+CTRL_I_MAX     = 2.0     # límite del integrador (RPM·s), anti-windup
+ACCEL_RPM_S    = 120.0   # aceleración / frenado de las rampas (RPM por segundo)
+RPM_MIN_FRENO  = 3       # velocidad mínima al final de un frenado
+
+# Encoder por PIO: máquina de estados usada y profundidad de su FIFO RX (sin unir)
+PIO_SM_ENCODER  = 0
+PIO_FIFO_DEPTH  = 4
 
 MIN_GPP = 0.001
 MAX_GPP = 0.2
@@ -57,7 +78,6 @@ SAFETY_FACTOR_DOWN = 1.5
 # ============================================================
 #   ESTADO GLOBAL GENERAL
 # ============================================================
-pulse_count       = 0
 last_state_a      = encoder_pin_a.value()
 current_direction = FORWARD
 
@@ -76,6 +96,10 @@ angulo_referencial_anterior = 0.0
 is_calibrating   = False
 cal_blink_state  = False
 
+# Formato de reporte al host: lista ['modo', 1, 'velocity', 7, 'angle', 12.3] (por defecto)
+# o compacto "T,<modo>,<velocity>,<angle>" tras recibir "FMT C" (se vuelve a lista con "FMT L", "0" o END)
+report_compact = False
+
 # ============================================================
 #   ESTADO ESPECÍFICO MODO 2
 # ============================================================
@@ -88,6 +112,96 @@ mode2_velocity          = 7
 mode2_allow_hall90      = False   # True si final_angle ~ 90° (permitir tocar Hall90)
 mode2_error_flag        = False
 
+# Rescate del modo 1 en curso: pulsos a recorrer hacia FORWARD (0 → sin rescate)
+mode1_rescate = 0
+
+# Modo que ejecuta el núcleo 1 (0 → ninguno: HOME, ENDPOS, GOTO, calibración), para la telemetría de _motion_sleep
+modo_en_curso = 0
+
+# ============================================================
+#   ESTADO COMPARTIDO ENTRE NÚCLEOS
+# ============================================================
+# Núcleo 0: comandos del host y salida serial (telemetría y mensajes).
+# Núcleo 1: motor, encoder, calibración y modos. Los callbacks suaves (Pin.irq, Timer(-1)) los agenda
+#   MicroPython en el hilo principal: corren en el núcleo 0 aunque se registren desde el núcleo 1.
+# Solo se comunican por este bloque, siempre bajo su lock.
+class _Shared:
+    def __init__(self):
+        self.lock       = _thread.allocate_lock()
+        self.commands   = []      # órdenes pendientes para el núcleo 1, (orden, preempt)
+        self.abort      = False   # interrumpe el movimiento bloqueante en curso
+        self.report     = None    # última línea de telemetría publicada por el modo activo
+        self.report_seq = 0
+        self.messages   = []      # mensajes del núcleo 1 pendientes de imprimir
+
+shared = _Shared()
+MAX_MESSAGES = 32
+
+class MotionAborted(Exception):
+    pass
+
+def _out(*parts):
+    """Mensaje del núcleo 1 al host; lo imprime el núcleo 0 (nunca se escribe stdout desde los dos núcleos)."""
+    msg = " ".join([str(p) for p in parts])
+    with shared.lock:
+        if len(shared.messages) < MAX_MESSAGES:
+            shared.messages.append(msg)
+
+def _report(line):
+    global _ultimo_reporte
+    with shared.lock:
+        shared.report = line
+        shared.report_seq += 1
+    _ultimo_reporte = time.ticks_ms()
+
+_ultimo_reporte = 0       # ticks_ms del último _report (solo lo usa el núcleo 1)
+
+def _reporte_en_movimiento():
+    # Telemetría desde el encoder mientras un movimiento bloqueante no deja correr al manejador del modo
+    v = int(ctl.rpm_obj)
+    a = angulo_referencial_actual()
+    if report_compact:
+        _report("T,%d,%d,%s" % (modo_en_curso, v, a))
+    else:
+        _report(str(["modo", modo_en_curso, "velocity", v, "angle", a]))
+
+def _post(command, preempt=True):
+    """
+    Núcleo 0 → núcleo 1. Con preempt, descarta las órdenes pendientes y el movimiento en curso se aborta en su
+    siguiente espera; sin preempt (PAUSE / RESUME) se encola detrás de las demás.
+    """
+    with shared.lock:
+        if preempt:
+            shared.commands = []
+            shared.abort = True
+        shared.commands.append((command, preempt))
+
+def _take_command():
+    with shared.lock:
+        if not shared.commands:
+            return None
+        command, preempt = shared.commands.pop(0)
+        if preempt:
+            shared.abort = False
+        return command
+
+def _motion_sleep(seconds):
+    """
+    Espera de los lazos de movimiento: punto donde una orden nueva del host puede interrumpirlos. Mientras dura, la
+    telemetría sigue saliendo cada INTERVAL_MS aunque el modo activo no pueda reportar.
+    """
+    fin = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+    while True:
+        if shared.abort:
+            raise MotionAborted()
+        ahora = time.ticks_ms()
+        if time.ticks_diff(ahora, _ultimo_reporte) >= INTERVAL_MS:
+            _reporte_en_movimiento()
+        resto = time.ticks_diff(fin, ahora)
+        if resto <= 0:
+            return
+        time.sleep_ms(min(resto, 10))
+
 # ============================================================
 #   LEDs: helpers
 # ============================================================
@@ -140,6 +254,7 @@ def inicializar_motor():
     enable.duty_u16(0)
 
 def rpm_a_duty(rpm):
+    """Mapa lineal RPM → duty; prealimentación del lazo (o el mando completo si no hay Timer)."""
     if rpm <= 0:
         return 0
     if rpm > RPM_MAX:
@@ -147,40 +262,307 @@ def rpm_a_duty(rpm):
     return int((rpm / RPM_MAX) * 65535)
 
 def control_motor(direction, rpm):
-    global current_direction
-    duty = rpm_a_duty(rpm)
-    enable.duty_u16(duty)
+    """Fija sentido y velocidad objetivo; el lazo de control acelera en rampa hasta ella."""
+    with _ctl_lock:
+        _fijar_marcha(direction, rpm)
+    _cambio_de_sentido(direction)
+
+def _fijar_marcha(direction, rpm):
+    # Con _ctl_lock tomado
+    if ctl.timer is None:
+        enable.duty_u16(rpm_a_duty(rpm))   # sin Timer: lazo abierto
+    elif direction != ctl.direccion or not ctl.activo:
+        # arranque o inversión: la rampa y el integrador empiezan de cero
+        ctl.rpm_sp   = 0.0
+        ctl.integral = 0.0
+    ctl.direccion = direction
+    ctl.rpm_obj   = rpm
+    ctl.activo    = rpm > 0
     if direction == FORWARD:
         in1.value(1)
         in2.value(0)
     else:
         in1.value(0)
         in2.value(1)
+
+def _cambio_de_sentido(direction):
+    global current_direction
+    if direction != current_direction:
+        _acumular_angulo()
     current_direction = direction
 
 def stop_motor():
+    _detener()
+    _out("Motor detenido")
+
+def _detener():
+    # Parada inmediata (sin rampa); también cancela el movimiento de mover()
+    with _ctl_lock:
+        _parar()
+
+def _parar():
+    # Con _ctl_lock tomado
+    ctl.activo  = False
+    ctl.rpm_obj = 0
+    ctl.rpm_sp  = 0.0
+    if not ctl.mov_fin:
+        ctl.mov_ok  = False
+        ctl.mov_fin = True
     enable.duty_u16(0)
     in1.value(0)
     in2.value(0)
-    print("Motor detenido")
+
+# ------------------------------------------------------------
+#   Lazo de control (Timer)
+# ------------------------------------------------------------
+class _Control:
+    def __init__(self):
+        self.timer     = None     # None → lazo abierto (rpm_a_duty) y sin movimientos autónomos
+        self.activo    = False    # False → duty 0
+        self.direccion = FORWARD
+        self.rpm_obj   = 0        # velocidad pedida
+        self.rpm_sp    = 0.0      # consigna tras la rampa
+        self.rpm_med   = 0.0      # velocidad medida
+        self.integral  = 0.0
+        self.cuenta    = 0        # última cuenta cruda leída por el lazo
+        self.hist      = [0] * RPM_WINDOW
+        self.hist_i    = 0
+        # Movimiento de mover(): termina solo al llegar a mov_pulsos, al activarse mov_pin o al pasar mov_limite
+        self.mov_inicio = 0
+        self.mov_pulsos = 0       # 0 → sin objetivo en pulsos
+        self.mov_limite = 0       # 0 → sin límite
+        self.mov_pin    = None    # Hall activo-bajo que termina el movimiento
+        self.mov_fin    = True
+        self.mov_ok     = True
+
+ctl = _Control()
+_ctl_lock = _thread.allocate_lock()     # ctl y el duty: núcleo 1 (órdenes) contra el tick del Timer (núcleo 0)
+
+def _gpp(direccion):
+    gpp = GRADOS_POR_PULSO_FORWARD if direccion == FORWARD else GRADOS_POR_PULSO_BACKWARD
+    return gpp if gpp > 0 else 0.014
+
+def _revisar_movimiento(raw):
+    """Cierra el movimiento en curso si ya terminó. Retorna los pulsos recorridos. Con _ctl_lock tomado."""
+    c = ctl
+    recorrido = abs(raw - c.mov_inicio)
+    if c.mov_fin:
+        return recorrido
+    if c.mov_pin is not None and c.mov_pin.value() == 0:
+        ok = True
+    elif c.mov_pulsos and recorrido >= c.mov_pulsos:
+        ok = True
+    elif c.mov_limite and recorrido >= c.mov_limite:
+        ok = False
+    else:
+        return recorrido
+    c.mov_ok  = ok
+    c.mov_fin = True
+    _parar()
+    return recorrido
+
+def _control_tick(t):
+    # Corre en el núcleo 0 (Timer suave); si el núcleo 1 está cambiando ctl, este tick se salta
+    if not _ctl_lock.acquire(0):
+        return
+    try:
+        _paso_control()
+    finally:
+        _ctl_lock.release()
+
+def _paso_control():
+    c = ctl
+    raw = _leer_cuenta_hw()
+    c.cuenta = raw
+    viejo = c.hist[c.hist_i]
+    c.hist[c.hist_i] = raw
+    c.hist_i = (c.hist_i + 1) % RPM_WINDOW
+    gpp = _gpp(c.direccion)
+    # °/s = pulsos · gpp · CONTROL_HZ / RPM_WINDOW ; RPM = (°/s) / 6
+    c.rpm_med = abs(raw - viejo) * gpp * CONTROL_HZ / (6.0 * RPM_WINDOW)
+
+    if not c.activo:
+        enable.duty_u16(0)
+        return
+    recorrido = _revisar_movimiento(raw)
+    if not c.activo:
+        enable.duty_u16(0)
+        return
+
+    objetivo = c.rpm_obj
+    if not c.mov_fin and c.mov_pulsos:
+        # Frenado trapezoidal: la velocidad desde la que se puede parar en los grados que faltan, v = √(2·a·d)
+        resto = (c.mov_pulsos - recorrido) * gpp
+        frenado = math.sqrt(2.0 * ACCEL_RPM_S * 6.0 * max(resto, 0.0)) / 6.0
+        objetivo = min(objetivo, max(RPM_MIN_FRENO, frenado))
+
+    paso = ACCEL_RPM_S / CONTROL_HZ
+    if c.rpm_sp < objetivo:
+        c.rpm_sp = min(objetivo, c.rpm_sp + paso)
+    else:
+        c.rpm_sp = max(objetivo, c.rpm_sp - paso)
+
+    error = c.rpm_sp - c.rpm_med
+    c.integral = min(max(c.integral + error / CONTROL_HZ, -CTRL_I_MAX), CTRL_I_MAX)
+    duty = rpm_a_duty(c.rpm_sp) + CTRL_KP * error + CTRL_KI * c.integral
+    enable.duty_u16(int(min(max(duty, 0), 65535)))
+
+def iniciar_control():
+    """Arranca el lazo a CONTROL_HZ. Sin Timer disponible, el motor sigue en lazo abierto."""
+    if ctl.timer is not None:
+        return True
+    raw = _leer_cuenta_hw()
+    ctl.cuenta = raw
+    ctl.hist = [raw] * RPM_WINDOW
+    try:
+        timer = Timer(-1)
+        timer.init(mode=Timer.PERIODIC, freq=CONTROL_HZ, callback=_control_tick)
+    except (ValueError, OSError) as e:
+        _out("WARN: Timer de control no disponible, lazo abierto:", e)
+        return False
+    ctl.timer = timer
+    return True
+
+def mover(direction, rpm, pulsos=0, pin_parada=None, limite_pulsos=0):
+    """
+    Movimiento no bloqueante: arranca hacia 'direction' y el lazo lo detiene solo al recorrer 'pulsos' (frenando en
+    rampa), al activarse 'pin_parada' o, sin éxito, al pasar 'limite_pulsos'. Ver movimiento_terminado().
+    """
+    with _ctl_lock:
+        ctl.mov_inicio = leer_cuenta()
+        ctl.mov_pulsos = pulsos
+        ctl.mov_pin    = pin_parada
+        ctl.mov_limite = limite_pulsos
+        ctl.mov_ok     = False
+        _fijar_marcha(direction, rpm)
+        ctl.mov_fin    = False
+    _cambio_de_sentido(direction)
+
+def movimiento_terminado():
+    if ctl.timer is None:
+        with _ctl_lock:
+            _revisar_movimiento(leer_cuenta())   # sin Timer lo revisa quien pregunta
+    return ctl.mov_fin
+
+def esperar_movimiento():
+    """Espera (abortable) el fin del movimiento de mover(). Retorna True si llegó, False si agotó el límite."""
+    while not movimiento_terminado():
+        _motion_sleep(0.001)
+    return ctl.mov_ok
+
+# ------------------------------------------------------------
+#   Conteo de cuadratura
+# ------------------------------------------------------------
+# La cuenta cruda la lleva una máquina de estados PIO (sin perder flancos a RPM altas); si rp2 no está disponible,
+# el IRQ count_pulses. El resto del código solo ve pulsos relativos al último reset_pulsos(), y los grados se
+# calculan a partir de la cuenta únicamente cuando se piden.
+_encoder_sm  = None   # rp2.StateMachine del contador, None → IRQ
+_isr_count   = 0      # cuenta cruda del IRQ
+_pulse_base  = 0      # cuenta cruda en el último reset_pulsos()
+_angulo_base = 0      # cuenta cruda en el último cambio de sentido (angulo_referencial acumula hasta ahí)
+
+if rp2 is not None:
+    @rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT)
+    def _quadrature():
+        # X = cuenta (+1 si A != B tras el flanco de A, -1 si A == B, igual que count_pulses).
+        # A en jmp_pin, B en in_base. La cuenta se empuja al FIFO RX en cada vuelta (sin bloquear).
+        label("low")                    # A en 0: esperar flanco de subida
+        mov(isr, x)
+        push(noblock)
+        jmp(pin, "rise")
+        jmp("low")
+        label("rise")
+        mov(isr, null)
+        in_(pins, 1)
+        mov(y, isr)                     # Y = B
+        jmp(not_y, "inc_rise")
+        jmp(x_dec, "high")              # subida con B=1 → -1
+        jmp("high")
+        label("inc_rise")               # subida con B=0 → +1  (x = ~(~x - 1))
+        mov(x, invert(x))
+        jmp(x_dec, "inc_rise_done")
+        label("inc_rise_done")
+        mov(x, invert(x))
+        label("high")                   # A en 1: esperar flanco de bajada
+        mov(isr, x)
+        push(noblock)
+        jmp(pin, "high")
+        mov(isr, null)
+        in_(pins, 1)
+        mov(y, isr)
+        jmp(not_y, "dec_fall")
+        mov(x, invert(x))               # bajada con B=1 → +1
+        jmp(x_dec, "inc_fall_done")
+        label("inc_fall_done")
+        mov(x, invert(x))
+        jmp("low")
+        label("dec_fall")               # bajada con B=0 → -1
+        jmp(x_dec, "low")
+        jmp("low")
 
 def count_pulses(pin):
-    global pulse_count, last_state_a, angulo_referencial
+    """Respaldo sin PIO: solo cuenta, sin aritmética de punto flotante en el IRQ."""
+    global _isr_count, last_state_a
     state_a = encoder_pin_a.value()
     state_b = encoder_pin_b.value()
     if state_a != last_state_a:
-        sentido = -1 if state_a == state_b else 1
-        pulse_count += sentido
-
-        # ángulo neto desde el origen (solo para logging)
-        if current_direction == FORWARD:
-            angulo_referencial += sentido * GRADOS_POR_PULSO_FORWARD
-        else:
-            angulo_referencial += sentido * GRADOS_POR_PULSO_BACKWARD
-
+        _isr_count += -1 if state_a == state_b else 1
         last_state_a = state_a
 
-encoder_pin_a.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=count_pulses)
+def registrar_encoder():
+    """
+    Arranca el contador por PIO y, si no se puede (sin rp2 o sin máquina libre), registra count_pulses.
+    El IRQ de respaldo es suave (hard=False): MicroPython lo agenda en el hilo principal, así que corre en el núcleo 0
+    aunque se registre desde el núcleo 1. Solo incrementa _isr_count; el PIO no depende de ningún núcleo.
+    """
+    global _encoder_sm
+    if rp2 is not None:
+        try:
+            sm = rp2.StateMachine(PIO_SM_ENCODER, _quadrature, in_base=encoder_pin_b, jmp_pin=encoder_pin_a)
+            sm.exec("set(x, 0)")
+            sm.active(1)
+            _encoder_sm = sm
+            return
+        except Exception as e:
+            _out("WARN: contador PIO no disponible, se usa IRQ:", e)
+    encoder_pin_a.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=count_pulses)
+
+def leer_cuenta():
+    """Cuenta cruda con signo del encoder; con el lazo activo, la de su último tick (solo el lazo lee el PIO)."""
+    if ctl.timer is not None:
+        return ctl.cuenta
+    return _leer_cuenta_hw()
+
+def _leer_cuenta_hw():
+    sm = _encoder_sm
+    if sm is None:
+        return _isr_count
+    # El FIFO está lleno de cuentas viejas (los push sin bloqueo se descartan); al vaciarlo el PIO vuelve a
+    # empujar, así que la lectura PIO_FIFO_DEPTH + 1 es posterior a esta llamada.
+    for _ in range(PIO_FIFO_DEPTH + 1):
+        raw = sm.get()
+    return raw - 0x100000000 if raw & 0x80000000 else raw
+
+def leer_pulsos():
+    """Pulsos desde el último reset_pulsos()."""
+    return leer_cuenta() - _pulse_base
+
+def reset_pulsos():
+    global _pulse_base
+    _pulse_base = leer_cuenta()
+
+def _acumular_angulo():
+    # Cambio de sentido: lleva a angulo_referencial los pulsos del tramo anterior con su grados/pulso
+    global angulo_referencial, _angulo_base
+    raw = leer_cuenta()
+    gpp = GRADOS_POR_PULSO_FORWARD if current_direction == FORWARD else GRADOS_POR_PULSO_BACKWARD
+    angulo_referencial += (raw - _angulo_base) * gpp
+    _angulo_base = raw
+
+def angulo_referencial_actual():
+    """Ángulo neto desde el origen (logging y telemetría de _motion_sleep), calculado al pedirlo."""
+    gpp = GRADOS_POR_PULSO_FORWARD if current_direction == FORWARD else GRADOS_POR_PULSO_BACKWARD
+    return angulo_referencial + (leer_cuenta() - _angulo_base) * gpp
 
 def grados_a_pulsos(grados, direccion):
     if grados < 0:
@@ -198,9 +580,9 @@ def grados_a_pulsos(grados, direccion):
 
 def calcular_grados():
     if current_direction == FORWARD:
-        return abs(pulse_count * GRADOS_POR_PULSO_FORWARD)
+        return abs(leer_pulsos() * GRADOS_POR_PULSO_FORWARD)
     else:
-        return abs(pulse_count * GRADOS_POR_PULSO_BACKWARD)
+        return abs(leer_pulsos() * GRADOS_POR_PULSO_BACKWARD)
 
 def corregir_dinamicamente(grados, pulsos):
     """
@@ -228,7 +610,7 @@ def _hall_activo_debounced(pin, muestras=5, dt_ms=3):
     for _ in range(muestras):
         if pin.value() == 1:
             return False
-        time.sleep(dt_ms / 1000)
+        _motion_sleep(dt_ms / 1000)
     return True
 
 def hall0_activo():
@@ -240,10 +622,10 @@ def hall90_activo():
 def esperar_liberacion(pin, debounce_ms=20):
     while True:
         if pin.value() == 1:
-            time.sleep(debounce_ms / 1000)
+            _motion_sleep(debounce_ms / 1000)
             if pin.value() == 1:
                 break
-        time.sleep(0.005)
+        _motion_sleep(0.005)
 
 def estimar_pulsos_entre_sensores():
     gpp = (GRADOS_POR_PULSO_FORWARD + GRADOS_POR_PULSO_BACKWARD) / 2
@@ -257,78 +639,65 @@ def buscar_hall(pin_objetivo, direccion, rpm_busqueda, timeout_pulsos):
     con límite de 'timeout_pulsos'.
     Retorna True si detectó el Hall, False si se alcanzó el timeout.
     """
-    global pulse_count
-    base = pulse_count
-    control_motor(direccion, rpm_busqueda)
-    while True:
-        if pin_objetivo.value() == 0:
-            stop_motor()
-            return True
-        if abs(pulse_count - base) >= timeout_pulsos:
-            stop_motor()
-            return False
-        time.sleep(0.001)
+    mover(direccion, rpm_busqueda, pin_parada=pin_objetivo, limite_pulsos=timeout_pulsos)
+    found = esperar_movimiento()
+    stop_motor()
+    return found
 
 def go_home(rpm_busqueda=VELOCIDAD_MEDICION):
     """
     Regresa con seguridad al 0° (Hall 0).
-    Deja: pulse_count=0, current_direction=BACKWARD parado en 0°.
+    Deja: pulsos en 0, current_direction=BACKWARD parado en 0°.
     """
-    global pulse_count, current_direction
+    global current_direction
 
     # Si ya está activo el Hall 0, libera un poco hacia FORWARD y regresa
     if hall0_activo():
         small_release = max(5, estimar_pulsos_entre_sensores() // 10)
-        base = pulse_count
-        control_motor(FORWARD, max(3, rpm_busqueda))
-        while abs(pulse_count - base) < small_release:
-            time.sleep(0.001)
+        mover(FORWARD, max(3, rpm_busqueda), pulsos=small_release)
+        esperar_movimiento()
         stop_motor()
         esperar_liberacion(hall_sensor_0_a)
 
     timeout = int(1.5 * max(estimAR := estimar_pulsos_entre_sensores(), 50))
     found = buscar_hall(hall_sensor_0_a, BACKWARD, max(3, rpm_busqueda), timeout)
     if not found:
-        print("WARN: No se encontró Hall 0 dentro del timeout.")
+        _out("WARN: No se encontró Hall 0 dentro del timeout.")
         stop_motor()
         return False
 
     stop_motor()
-    pulse_count = 0
+    reset_pulsos()
     current_direction = BACKWARD
-    print("Home alcanzado (0°).")
+    _out("Home alcanzado (0°).")
     return True
 
 # ============================================================
 #   CALIBRACIÓN Y MEDICIÓN DE ÁNGULO ENTRE SENSORES
 # ============================================================
 def medir_angulo_entre_sensores():
-    global pulse_count
-
-    print("→ Midiendo ángulo real entre sensores Hall...")
+    _out("→ Midiendo ángulo real entre sensores Hall...")
 
     # 1. Buscar primero el sensor de 90° hacia adelante
-    control_motor(FORWARD, VELOCIDAD_MEDICION)
-    while hall_sensor_90.value() == 1:
-        time.sleep(0.001)
+    mover(FORWARD, VELOCIDAD_MEDICION, pin_parada=hall_sensor_90)
+    esperar_movimiento()
     stop_motor()
-    time.sleep(0.2)
-    print("Sensor 90° detectado (inicio de medición)")
+    _motion_sleep(0.2)
+    _out("Sensor 90° detectado (inicio de medición)")
 
     # 2. Medir desde aquí hacia el sensor de 0° en dirección opuesta
-    pulse_count = 0
-    control_motor(BACKWARD, VELOCIDAD_MEDICION)
-    while hall_sensor_0_a.value() == 1:
-        time.sleep(0.001)
+    reset_pulsos()
+    mover(BACKWARD, VELOCIDAD_MEDICION, pin_parada=hall_sensor_0_a)
+    esperar_movimiento()
     stop_motor()
-    print("Sensor 0° detectado (fin de medición)")
+    _out("Sensor 0° detectado (fin de medición)")
 
     # 3. Calcular el ángulo medido
     gpp = (GRADOS_POR_PULSO_FORWARD + GRADOS_POR_PULSO_BACKWARD) / 2
     if gpp <= 0:
         gpp = 0.014
-    angulo = abs(pulse_count) * gpp
-    print(f"Ángulo medido entre sensores (90° → 0°): {angulo:.2f}°")
+    angulo = abs(leer_pulsos()) * gpp
+    _out(f"Ángulo medido entre sensores (90° → 0°): {angulo:.2f}°")
     return angulo
 
 def calibrar_motor():
@@ -338,16 +707,15 @@ def calibrar_motor():
     - Ambos LEDs (integrado + NeoPixel) parpadean con un periodo fijo (~150 ms).
     - Durante la calibración se envía "CALIBRANDO" por el serial.
     """
-    global pulse_count
 
     # Aseguramos arrancar desde HOME
-    print("Calibración: yendo primero a HOME...")
+    _out("Calibración: yendo primero a HOME...")
     go_home()
     stop_motor()
-    time.sleep(0.3)
+    _motion_sleep(0.3)
 
-    print("Iniciando calibración (ciclos entre Hall 0° y 90°)...")
-    pulse_count = 0
+    _out("Iniciando calibración (ciclos entre Hall 0° y 90°)...")
+    reset_pulsos()
     ciclos = 8
     forward_pulses = []
     backward_pulses = []
@@ -360,35 +728,33 @@ def calibrar_motor():
     blink_last = time.ticks_ms()
 
     for i in range(ciclos + 1):
-        print(f"→ Ciclo {i+1}: moviendo {direccion}")
-        pulse_count = 0
-        control_motor(direccion, VELOCIDAD_CALIBRACION)
+        _out(f"→ Ciclo {i+1}: moviendo {direccion}")
+        reset_pulsos()
+        mover(direccion, VELOCIDAD_CALIBRACION, pin_parada=sensor_siguiente)
 
         # mientras nos movemos hacia el siguiente sensor, hacemos parpadeo
-        while sensor_siguiente.value() == 1:
+        while not movimiento_terminado():
             now = time.ticks_ms()
             if time.ticks_diff(now, blink_last) >= 150:  # periodo ~150 ms
                 blink_last = now
                 _led_calibrating_toggle()
-                sys.stdout.write("CALIBRANDO\n")
-            time.sleep(0.001)
-
-        time.sleep(0.02)
+                _out("CALIBRANDO")
+            _motion_sleep(0.001)
         stop_motor()
 
         if i > 0:
-            pulsos = abs(pulse_count)
+            pulsos = abs(leer_pulsos())
             if direccion == FORWARD:
                 forward_pulses.append(pulsos)
             else:
                 backward_pulses.append(pulsos)
-            print(f"Pulsos en ciclo {i+1}: {pulsos}")
+            _out(f"Pulsos en ciclo {i+1}: {pulsos}")
         else:
-            print(f"(Ignorado) Pulsos en ciclo {i+1}: {abs(pulse_count)}")
+            _out(f"(Ignorado) Pulsos en ciclo {i+1}: {abs(leer_pulsos())}")
 
         direccion = BACKWARD if direccion == FORWARD else FORWARD
         sensor_actual, sensor_siguiente = sensor_siguiente, sensor_actual
-        time.sleep(0.5)
+        _motion_sleep(0.5)
 
     _led_all_off()
 
@@ -403,23 +769,23 @@ def calibrar_motor():
     GRADOS_POR_PULSO_FORWARD  = min(max(GRADOS_POR_PULSO_FORWARD,  MIN_GPP), MAX_GPP)
     GRADOS_POR_PULSO_BACKWARD = min(max(GRADOS_POR_PULSO_BACKWARD, MIN_GPP), MAX_GPP)
 
-    print("Calibración completada.")
-    print(f"Promedio FORWARD: {prom_forward}, BACKWARD: {prom_backward}")
-    print(f"GRADOS_POR_PULSO_FORWARD inicial: {GRADOS_POR_PULSO_FORWARD:.6f}")
-    print(f"GRADOS_POR_PULSO_BACKWARD inicial: {GRADOS_POR_PULSO_BACKWARD:.6f}")
+    _out("Calibración completada.")
+    _out(f"Promedio FORWARD: {prom_forward}, BACKWARD: {prom_backward}")
+    _out(f"GRADOS_POR_PULSO_FORWARD inicial: {GRADOS_POR_PULSO_FORWARD:.6f}")
+    _out(f"GRADOS_POR_PULSO_BACKWARD inicial: {GRADOS_POR_PULSO_BACKWARD:.6f}")
 
     stop_motor()
-    pulse_count = 0
+    reset_pulsos()
     return True
 
 def _calibrar_y_medir_y_home():
     """Secuencia estándar: calibrar -> medir ángulo entre sensores -> volver a 0° y parar."""
-    global calibracion_lista, pulse_count
-    global angulo_referencial, angulo_referencial_anterior, current_direction
+    global calibracion_lista
+    global angulo_referencial, angulo_referencial_anterior, current_direction, _angulo_base
     global global_calibrated, is_calibrating
 
-    print("=== Calibración global iniciada ===")
-    sys.stdout.write("CALIBRANDO\n")
+    _out("=== Calibración global iniciada ===")
+    _out("CALIBRANDO")
 
     global_calibrated = False
     calibracion_lista = 0
@@ -429,15 +795,18 @@ def _calibrar_y_medir_y_home():
     calibrar_motor()
     try:
         medir_angulo_entre_sensores()
+    except MotionAborted:
+        raise
     except Exception as e:
-        print("Aviso: medir_angulo_entre_sensores() falló:", e)
+        _out("Aviso: medir_angulo_entre_sensores() falló:", e)
 
     go_home()
     stop_motor()
 
     # Estado limpio en 0°
-    pulse_count = 0
+    reset_pulsos()
     angulo_referencial = 0.0
+    _angulo_base = leer_cuenta()
     angulo_referencial_anterior = 0.0
     current_direction = FORWARD
 
@@ -449,10 +818,10 @@ def _calibrar_y_medir_y_home():
     _led_set_calibrated()
 
     # 🔹 NUEVA LÍNEA PARA LA GUI:
-    sys.stdout.write("CALIBRACION LISTA\n")
+    _out("CALIBRACION LISTA")
 
-    sys.stdout.write("Motor en Home (0°) [Calibrado]\n")
-    print("=== Calibración global terminada ===")
+    _out("Motor en Home (0°) [Calibrado]")
+    _out("=== Calibración global terminada ===")
 
 
 # ============================================================
@@ -460,57 +829,31 @@ def _calibrar_y_medir_y_home():
 # ============================================================
 def _mode2_move_relative(delta_deg, direction):
     """
-    Mueve 'delta_deg' grados en 'direction' usando el encoder,
-    con pre-freno y protección de Hall0 / Hall90.
+    Mueve 'delta_deg' grados en 'direction' con mover() (frenado en rampa del lazo) y protección de Hall0 / Hall90.
     Bloqueante.
     Retorna True si OK, False si hubo error (Hall inesperado).
     """
-    global pulse_count, mode2_error_flag
+    global mode2_error_flag
 
     if delta_deg <= 0:
         return True
 
-    # Promedio de grados por pulso
-    gpp = (GRADOS_POR_PULSO_FORWARD + GRADOS_POR_PULSO_BACKWARD) / 2
-    if gpp <= 0:
-        gpp = 0.014
-
-    target_pulses = grados_a_pulsos(delta_deg, direction)
-    margen_pulsos = max(1, int(MARGEN_DEG_PRE_FRENO / gpp))
-    pre_freno_start = max(0, target_pulses - margen_pulsos)
-
-    rpm_high = mode2_velocity
-    rpm_low  = max(3, rpm_high // 3)  # precaución
-
-    pulse_count = 0
-    control_motor(direction, rpm_high)
-
-    while True:
-        # Protección Hall 90 (solo en FORWARD si no se permite)
-        if direction == FORWARD and (not mode2_allow_hall90) and hall_sensor_90.value() == 0:
-            print("Modo2: Hall 90° inesperado durante movimiento.")
-            mode2_error_flag = True
-            stop_motor()
-            return False
-
-        # Protección Hall 0 (por si se pasa de 0 y no estábamos buscando HOME)
-        if direction == BACKWARD and hall_sensor_0_a.value() == 0:
-            print("Modo2: Hall 0° inesperado durante movimiento.")
-            mode2_error_flag = True
-            stop_motor()
-            return False
-
-        pulsos = abs(pulse_count)
-        if pulsos >= target_pulses:
-            break
-
-        # Pre-freno cerca del objetivo
-        if pulsos >= pre_freno_start:
-            control_motor(direction, rpm_low)
-
-        time.sleep(0.001)
+    # El Hall del extremo hacia el que se mueve termina el movimiento: 90° en FORWARD (salvo que se permita
+    # tocarlo), 0° en BACKWARD (por si se pasa de 0 y no estábamos buscando HOME)
+    if direction == FORWARD:
+        pin, nombre = (None if mode2_allow_hall90 else hall_sensor_90), "90°"
+    else:
+        pin, nombre = hall_sensor_0_a, "0°"
 
+    reset_pulsos()
+    mover(direction, mode2_velocity, pulsos=grados_a_pulsos(delta_deg, direction), pin_parada=pin)
+    esperar_movimiento()
     stop_motor()
+
+    if pin is not None and pin.value() == 0:
+        _out("Modo2: Hall " + nombre + " inesperado durante movimiento.")
+        mode2_error_flag = True
+        return False
     return True
 
 def _mode2_move_to_angle(target_deg):
@@ -539,7 +882,7 @@ def _manual_move_from_home_to_angle(target_deg, rpm, allow_hall90=False):
     Asume que estamos en HOME (0°). Sube hasta target_deg y se detiene ahí.
     No recalibra; usa GRADOS_POR_PULSO_* actuales.
     """
-    global pulse_count, current_direction
+    global current_direction
 
     # Saneos
     if target_deg < 0:
@@ -547,48 +890,28 @@ def _manual_move_from_home_to_angle(target_deg, rpm, allow_hall90=False):
     if target_deg > ANGULO_ENTRE_SENSORES:
         target_deg = ANGULO_ENTRE_SENSORES
 
-    # Promedio GPP
-    gpp = (GRADOS_POR_PULSO_FORWARD + GRADOS_POR_PULSO_BACKWARD) / 2
-    if gpp <= 0:
-        gpp = 0.014
-
-    target_pulses = grados_a_pulsos(target_deg, FORWARD)
-    margen_pulsos = max(1, int(MARGEN_DEG_PRE_FRENO / gpp))
-    pre_freno_start = max(0, target_pulses - margen_pulsos)
-
-    pulse_count = 0
+    reset_pulsos()
     current_direction = FORWARD
-    rpm_high = rpm
-    rpm_low  = max(3, rpm_high // 3)
-
-    control_motor(FORWARD, rpm_high)
-
-    while True:
-        # Si NO permitimos tocar 90°, cualquier hall90 es error
-        if hall_sensor_90.value() == 0 and (not allow_hall90):
-            print("MANUAL: Hall 90° inesperado durante movimiento. Abortando y volviendo a HOME.")
-            stop_motor()
-            go_home()
-            return False
 
-        pulsos = abs(pulse_count)
-        if pulsos >= target_pulses:
-            break
-
-        if pulsos >= pre_freno_start:
-            control_motor(FORWARD, rpm_low)
+    # Si NO permitimos tocar 90°, el Hall 90 termina el movimiento y es error
+    pin = None if allow_hall90 else hall_sensor_90
+    mover(FORWARD, rpm, pulsos=grados_a_pulsos(target_deg, FORWARD), pin_parada=pin)
+    esperar_movimiento()
+    stop_motor()
 
-        time.sleep(0.001)
+    if pin is not None and pin.value() == 0:
+        _out("MANUAL: Hall 90° inesperado durante movimiento. Abortando y volviendo a HOME.")
+        go_home()
+        return False
 
-    stop_motor()
-    print(f"MANUAL: Alcanzado ángulo ~{target_deg}°")
+    _out(f"MANUAL: Alcanzado ángulo ~{target_deg}°")
     return True
 
 def manual_home():
     """
     Comando HOME: ir a 0° usando Hall0. No recalibra.
     """
-    print("MANUAL: HOME solicitado")
+    _out("MANUAL: HOME solicitado")
     go_home()
     stop_motor()
 
@@ -600,25 +923,24 @@ def manual_endpos():
       - Va de HOME hasta que detecte el Hall de 90° y se detiene ahí.
       - Si no detecta Hall90 dentro de un límite de pulsos, se detiene con WARN.
     """
-    global pulse_count
 
-    print("MANUAL: ENDPOS solicitado")
+    _out("MANUAL: ENDPOS solicitado")
 
     # 1) Siempre arrancamos de HOME
     go_home()
     stop_motor()
-    time.sleep(0.2)
+    _motion_sleep(0.2)
 
     # 2) Buscar Hall 90° hacia adelante con timeout en pulsos
-    pulse_count = 0
+    reset_pulsos()
     timeout = int(1.5 * max(estimAR := estimar_pulsos_entre_sensores(), 50))
-    print(f"MANUAL ENDPOS: buscando Hall90 con timeout {timeout} pulsos aprox...")
+    _out(f"MANUAL ENDPOS: buscando Hall90 con timeout {timeout} pulsos aprox...")
     found = buscar_hall(hall_sensor_90, FORWARD, VELOCIDAD_MEDICION, timeout)
 
     if found:
-        print("MANUAL ENDPOS: Hall 90° alcanzado, motor detenido.")
+        _out("MANUAL ENDPOS: Hall 90° alcanzado, motor detenido.")
     else:
-        print("WARN MANUAL ENDPOS: No se encontró Hall 90° dentro del timeout, motor detenido.")
+        _out("WARN MANUAL ENDPOS: No se encontró Hall 90° dentro del timeout, motor detenido.")
 
 def manual_goto_angle(angle_deg):
     """
@@ -626,7 +948,7 @@ def manual_goto_angle(angle_deg):
       - NO requiere calibración previa.
       - Primero va a HOME y luego sube hasta angle_deg.
     """
-    print(f"MANUAL: GOTO solicitado → {angle_deg}°")
+    _out(f"MANUAL: GOTO solicitado → {angle_deg}°")
 
     go_home()
     stop_motor()
@@ -642,8 +964,8 @@ def mode1_action(cfg):
     Modo 1: igual que antes, pero YA NO fuerza calibración previa.
     (Recomendado calibrar primero, pero no obligatorio).
     """
-    global pulse_count, current_direction
-    global velocidad_constante, angulo_constante
+    global current_direction
+    global velocidad_constante, angulo_constante, mode1_rescate
 
     try:
         v, kv = _get_val_and_key(cfg, ["velocity", "velocidad", "speed"], 7, "velocity")
@@ -664,40 +986,46 @@ def mode1_action(cfg):
             gpp = 0.014
 
         pulsos_obj = grados_a_pulsos(angulo_constante, FORWARD)
-        margen_pulsos    = max(1, int(MARGEN_DEG_PRE_FRENO / gpp))
-        pulsos_pre_freno = max(0, pulsos_obj - margen_pulsos)
-        rpm_pre_freno    = max(3, int(velocidad_constante / 3))
 
-        pulsos_abs = abs(pulse_count)
+        pulsos_abs = abs(leer_pulsos())
+
+        # ---------- RESCATE en curso: sube mode1_rescate pulsos sin bloquear ----------
+        if mode1_rescate:
+            if movimiento_terminado():
+                stop_motor()
+                current_direction = FORWARD
+                reset_pulsos()
+                mode1_rescate = 0
+                grados_actuales = float(angulo_constante)
+            else:
+                faltan = max(0, mode1_rescate - pulsos_abs)
+                grados_actuales = max(0.0, angulo_constante - faltan * gpp)
 
         # ---------- FORWARD: de 0° hacia angulo_constante ----------
-        if current_direction == FORWARD:
+        elif current_direction == FORWARD:
             # Límite duro Hall90
             if hall90_activo():
-                print("Modo1: Hall 90° detectado. Invirtiendo a BACKWARD.")
+                _out("Modo1: Hall 90° detectado. Invirtiendo a BACKWARD.")
                 stop_motor()
                 grados = calcular_grados()
                 corregir_dinamicamente(grados, pulsos_abs)
-                pulse_count = 0
+                reset_pulsos()
                 current_direction = BACKWARD
                 control_motor(current_direction, velocidad_constante)
 
             # Objetivo por encoder alcanzado
             elif pulsos_abs >= pulsos_obj:
-                print("Modo1: objetivo encoder alcanzado (UP). Invirtiendo a BACKWARD.")
+                _out("Modo1: objetivo encoder alcanzado (UP). Invirtiendo a BACKWARD.")
                 stop_motor()
                 grados = calcular_grados()
                 corregir_dinamicamente(grados, pulsos_abs)
-                pulse_count = 0
+                reset_pulsos()
                 current_direction = BACKWARD
                 control_motor(current_direction, velocidad_constante)
 
-            else:
-                # Pre-freno cerca del objetivo
-                if pulsos_abs >= pulsos_pre_freno:
-                    control_motor(FORWARD, rpm_pre_freno)
-                else:
-                    control_motor(FORWARD, velocidad_constante)
+            elif movimiento_terminado():
+                # Subida hasta el objetivo con mover(): el lazo frena en rampa al llegar (o para en el Hall 90)
+                mover(FORWARD, velocidad_constante, pulsos=pulsos_obj - pulsos_abs, pin_parada=hall_sensor_90)
 
             # Estimación de ángulo (clamp al objetivo)
             grados_actuales = calcular_grados()
@@ -708,12 +1036,12 @@ def mode1_action(cfg):
         else:
             # 1) Caso ideal: Hall0 detectado
             if hall0_activo():
-                print("Modo1: Hall 0° detectado. Invirtiendo a FORWARD (reset a 0°).")
+                _out("Modo1: Hall 0° detectado. Invirtiendo a FORWARD (reset a 0°).")
                 stop_motor()
-                pulse_count = 0
+                reset_pulsos()
                 grados_actuales = 0.0
                 current_direction = FORWARD
-                control_motor(current_direction, velocidad_constante)
+                mover(FORWARD, velocidad_constante, pulsos=pulsos_obj, pin_parada=hall_sensor_90)
 
             # 2) Caso anómalo: NO hay Hall0 y ya recorrió demasiados pulsos
             else:
@@ -721,20 +1049,15 @@ def mode1_action(cfg):
                 max_pulsos_down = int(SAFETY_FACTOR_DOWN * pulsos_span)
 
                 if pulsos_abs >= max_pulsos_down:
-                    print("Modo1: BAJANDO sin Hall0. Activando rescate por encoder.")
+                    _out("Modo1: BAJANDO sin Hall0. Activando rescate por encoder.")
                     stop_motor()
                     pulsos_fallo = pulsos_abs
 
-                    pulse_count = 0
-                    current_direction = FORWARD
-                    control_motor(FORWARD, velocidad_constante)
-                    while abs(pulse_count) < pulsos_fallo:
-                        time.sleep(0.001)
-                    stop_motor()
-
-                    current_direction = FORWARD
-                    pulse_count = 0
-                    grados_actuales = float(angulo_constante)
+                    reset_pulsos()
+                    mode1_rescate = pulsos_fallo
+                    mover(FORWARD, velocidad_constante, pulsos=pulsos_fallo)
+                    grados_tmp = angulo_constante - pulsos_fallo * gpp
+                    grados_actuales = grados_tmp if grados_tmp > 0 else 0.0
 
                 else:
                     control_motor(BACKWARD, velocidad_constante)
@@ -744,13 +1067,18 @@ def mode1_action(cfg):
                     grados_actuales = grados_tmp
 
         # Reporte al host
-        sys.stdout.write(str(["modo", 1, kv, velocidad_constante, ka, grados_actuales]) + "\n")
+        if report_compact:
+            _report("T,1,%d,%s" % (velocidad_constante, grados_actuales))
+        else:
+            _report(str(["modo", 1, kv, velocidad_constante, ka, grados_actuales]))
 
+    except MotionAborted:
+        raise
     except Exception as e:
         stop_motor()
         go_home()
         stop_motor()
-        sys.stdout.write("ERROR en modo 1: " + str(e) + "\n")
+        _out("ERROR en modo 1: " + str(e))
 
 # ============================================================
 #   MODO 2: Barrido init_angle ↔ final_angle step-by-step (5 ciclos) + HOME
@@ -835,7 +1163,7 @@ def mode2_action(cfg):
             if mode2_idx <= 0:
                 mode2_rep_count += 1
                 if mode2_rep_count >= 5:
-                    print("Modo2: 5 ciclos completados, regresando a HOME.")
+                    _out("Modo2: 5 ciclos completados, regresando a HOME.")
                     go_home()
                     stop_motor()
                     mode2_current_angle_est = 0.0
@@ -852,7 +1180,7 @@ def mode2_action(cfg):
                     mode2_idx = next_idx
 
         if not ok:
-            print("ERROR: Modo2 detectó condición anómala, regresando a HOME.")
+            _out("ERROR: Modo2 detectó condición anómala, regresando a HOME.")
             go_home()
             stop_motor()
             mode2_current_angle_est = 0.0
@@ -863,7 +1191,11 @@ def mode2_action(cfg):
 
     grados_actuales = mode2_current_angle_est
 
-    sys.stdout.write(str([
+    if report_compact:
+        _report("T,2,%d,%s" % (v, grados_actuales))
+        return
+
+    _report(str([
         "modo", 2,
         kia, ia,
         kfa, fa,
@@ -872,7 +1204,7 @@ def mode2_action(cfg):
         "angle", grados_actuales,
         "rep", mode2_rep_count,
         "idx", mode2_idx
-    ]) + "\n")
+    ]))
 
 # ============================================================
 #   MODO 3 y 4 (placeholders sin lógica de motor)
@@ -882,7 +1214,7 @@ def mode3_action(cfg):
     iv, kiv = _get_val_and_key(cfg, ["init_vel", "velocidad_inicial"], 7, "init_vel")
     fv, kfv = _get_val_and_key(cfg, ["final_vel", "velocidad_final"], 30, "final_vel")
     sv, ksv = _get_val_and_key(cfg, ["step_vel"], 1, "step_vel")
-    sys.stdout.write(str(["modo", 3, ka, a, kiv, iv, kfv, fv, ksv, sv]) + "\n")
+    _report(str(["modo", 3, ka, a, kiv, iv, kfv, fv, ksv, sv]))
 
 def mode4_action(cfg):
     ia, kia = _get_val_and_key(cfg, ["init_angle", "angulo_inicial"], 0, "init_angle")
@@ -891,7 +1223,7 @@ def mode4_action(cfg):
     iv, kiv = _get_val_and_key(cfg, ["init_vel", "velocidad_inicial"], 7, "init_vel")
     fv, kfv = _get_val_and_key(cfg, ["final_vel", "velocidad_final"], 30, "final_vel")
     sv, ksv = _get_val_and_key(cfg, ["step_vel"], 1, "step_vel")
-    sys.stdout.write(str(["modo", 4, kia, ia, kfa, fa, ksa, sa, kiv, iv, kfv, fv, ksv, sv]) + "\n")
+    _report(str(["modo", 4, kia, ia, kfa, fa, ksa, sa, kiv, iv, kfv, fv, ksv, sv]))
 
 MODE_HANDLERS = {
     1: mode1_action,
@@ -989,23 +1321,118 @@ def _mode_number_from_cfg(cfg):
         return int(m.group(1))
     return int(mode_raw)
 
-def main():
-    global calibracion_lista, global_calibrated
+def _motion_worker():
+    """
+    Núcleo 1: ejecuta las órdenes del núcleo 0 (calibración, HOME, ENDPOS, GOTO, STOP) y el modo activo cada
+    INTERVAL_MS. Una orden nueva con preempt interrumpe el movimiento bloqueante en curso (MotionAborted).
+    """
+    global calibracion_lista, global_calibrated, is_calibrating
     global mode2_state, mode2_rep_count, mode2_idx, mode2_current_angle_est, mode2_error_flag
+    global mode1_rescate, modo_en_curso
+
+    registrar_encoder()
+    inicializar_motor()
+    iniciar_control()
+    modo, cfg, paused = None, {}, False
+    next_t = time.ticks_ms()
+
+    while True:
+        command = _take_command()
+        try:
+            if command is not None:
+                name = command[0]
+                if name == "RUN":
+                    modo, cfg, paused = command[1], command[2], False
+                    modo_en_curso = modo
+                    mode1_rescate = 0
+                    # Si entra un nuevo modo 2, reseteamos estado interno del modo 2
+                    if modo == 2:
+                        mode2_state             = 0
+                        mode2_rep_count         = 0
+                        mode2_idx               = 0
+                        mode2_current_angle_est = 0.0
+                        mode2_error_flag        = False
+                    next_t = time.ticks_ms()
+                elif name == "PAUSE":
+                    paused = True
+                elif name == "RESUME":
+                    paused = False
+                    next_t = time.ticks_add(time.ticks_ms(), INTERVAL_MS)
+                else:
+                    modo, cfg, paused = None, {}, False
+                    modo_en_curso = 0
+                    mode1_rescate = 0
+                    stop_motor()
+                    if name == "CAL":
+                        _calibrar_y_medir_y_home()
+                    elif name == "HOME":
+                        manual_home()
+                    elif name == "ENDPOS":
+                        manual_endpos()
+                    elif name == "GOTO":
+                        manual_goto_angle(command[1])
+                    elif name == "STOP":
+                        go_home()
+                        stop_motor()
+                        calibracion_lista = 0  # global_calibrated se conserva
+                    elif name == "END":
+                        calibracion_lista = 0
+                        global_calibrated = False
+                        _led_set_idle_not_calibrated()
+                        inicializar_motor()
+            elif modo and not paused:
+                now = time.ticks_ms()
+                if time.ticks_diff(now, next_t) >= 0:
+                    MODE_HANDLERS[modo](cfg)
+                    next_t = time.ticks_add(now, INTERVAL_MS)
+        except MotionAborted:
+            stop_motor()
+            if is_calibrating:
+                is_calibrating = False
+                _led_set_idle_not_calibrated()
+            _out("Movimiento interrumpido")
+        except Exception as e:
+            stop_motor()
+            modo, cfg = None, {}
+            modo_en_curso = 0
+            _out("ERROR: " + str(e))
+        time.sleep_ms(1)
+
+def _write_output(last_seq):
+    """Núcleo 0: imprime los mensajes pendientes del núcleo 1 y la telemetría si hay una nueva."""
+    with shared.lock:
+        messages = shared.messages
+        shared.messages = []
+        seq, report = shared.report_seq, shared.report
+    for msg in messages:
+        sys.stdout.write(msg + "\n")
+    if seq != last_seq and report is not None:
+        sys.stdout.write(report + "\n")
+    return seq
+
+def main():
+    """Núcleo 0: protocolo con el host y salida serial. Nunca espera al motor."""
+    global calibracion_lista, global_calibrated, report_compact
 
     state = STATE_IDLE
-    modo, cfg = None, {}
     printed_ready = False
     handshaken = False
-    next_t = time.ticks_ms()
+    last_seq = 0
 
     # Inicio: sin calibración → NeoPixel naranja
     global_calibrated = False
     calibracion_lista = 0
     _led_set_idle_not_calibrated()
 
+    _thread.start_new_thread(_motion_worker, ())
+
     while True:
+        last_seq = _write_output(last_seq)
         line = _readline_nonblocking()
+        if not line:
+            time.sleep_ms(2)
+            if not handshaken or state != STATE_IDLE or printed_ready:
+                continue
 
         # ==== Handshake y comandos globales / manuales (SIEMPRE) ====
         if line:
@@ -1016,42 +1443,39 @@ def main():
                 sys.stdout.write("0\n")
                 handshaken = True
                 printed_ready = False
+                report_compact = False
+                continue
+
+            # Formato de reporte: "FMT C" compacto, "FMT L" lista
+            if t_upper in ("FMT C", "FMT L"):
+                report_compact = t_upper == "FMT C"
+                sys.stdout.write(t_upper + "\n")
                 continue
 
             # END: reset duro
             if t_upper == "END":
                 sys.stdout.write("STOP\n")
                 state = STATE_IDLE
-                modo, cfg = None, {}
                 printed_ready = False
                 handshaken = False
-                calibracion_lista = 0
-                global_calibrated = False
-                _led_set_idle_not_calibrated()
-                stop_motor()
+                report_compact = False
+                _post(("END",))
                 continue
 
-            # ----- CALIBRACION, HOME, ENDPOS, GOTO: SIEMPRE activos -----
+            # ----- CALIBRACION, HOME, ENDPOS, GOTO: SIEMPRE activos (abortan el modo / movimiento en curso) -----
             if t_upper == "CALIBRACION":
-                # Abortamos cualquier modo, paramos motor y calibramos
                 state = STATE_IDLE
-                modo, cfg = None, {}
-                stop_motor()
-                _calibrar_y_medir_y_home()
+                _post(("CAL",))
                 continue
 
             if t_upper == "HOME":
                 state = STATE_IDLE
-                modo, cfg = None, {}
-                stop_motor()
-                manual_home()
+                _post(("HOME",))
                 continue
 
             if t_upper == "ENDPOS":
                 state = STATE_IDLE
-                modo, cfg = None, {}
-                stop_motor()
-                manual_endpos()
+                _post(("ENDPOS",))
                 continue
 
             if t_upper.startswith("GOTO"):
@@ -1065,37 +1489,32 @@ def main():
                     angle = None
 
                 state = STATE_IDLE
-                modo, cfg = None, {}
-                stop_motor()
                 if angle is not None:
-                    manual_goto_angle(angle)
+                    _post(("GOTO", angle))
                 else:
+                    _post(("IDLE",))
                     sys.stdout.write("ERROR: formato GOTO inválido. Usa 'GOTO 20' o 'GOTO:20'\n")
                 continue
 
         if not handshaken:
-            time.sleep(0.01)
             continue
 
         # READY inicial
         if state == STATE_IDLE and not printed_ready:
             sys.stdout.write("READY\n")
-            inicializar_motor()
             printed_ready = True
 
+        if not line:
+            continue
+        t_upper = line.strip().upper()
+
         # ================== STATE_IDLE ==================
         if state == STATE_IDLE:
-            if not line:
-                time.sleep(0.01)
-                continue
-
-            t_upper = line.strip().upper()
-
             if t_upper == "STOP":
                 calibracion_lista = 0
                 sys.stdout.write("STOP\n")
                 printed_ready = False
-                stop_motor()
+                _post(("IDLE",))
                 continue
             elif t_upper == "RUN":
                 sys.stdout.write("RUN\n")
@@ -1112,67 +1531,28 @@ def main():
                 if modo not in MODE_HANDLERS:
                     sys.stdout.write("ERROR: 'modo' debe ser 1..4\n")
                     continue
-
-                # Si entra un nuevo modo 2, reseteamos estado interno del modo 2
-                if modo == 2:
-                    mode2_state             = 0
-                    mode2_rep_count         = 0
-                    mode2_idx               = 0
-                    mode2_current_angle_est = 0.0
-                    mode2_error_flag        = False
-
+                _post(("RUN", modo, cfg))
                 state = STATE_RUN
-                next_t = time.ticks_ms()
             except Exception as e:
                 sys.stdout.write("ERROR: " + str(e) + "\n")
-                time.sleep(0.01)
                 continue
 
-        # ================== STATE_RUN ==================
-        elif state == STATE_RUN:
-            if line:
-                t_upper = line.strip().upper()
-                if t_upper in ("PAUSE", "PAUSA"):
-                    sys.stdout.write("PAUSE\n")
+        # ================== STATE_RUN / STATE_PAUSED ==================
+        else:
+            if t_upper in ("PAUSE", "PAUSA"):
+                sys.stdout.write("PAUSE\n")
+                if state == STATE_RUN:
+                    _post(("PAUSE",), preempt=False)
                     state = STATE_PAUSED
-                    continue
-                elif t_upper == "RUN":
-                    sys.stdout.write("RUN\n")
-                    next_t = time.ticks_add(time.ticks_ms(), INTERVAL_MS)
-                elif t_upper == "STOP":
-                    go_home()
-                    stop_motor()
-                    calibracion_lista = 0  # global_calibrated se conserva
-                    sys.stdout.write("STOP\n")
-                    state = STATE_IDLE
-                    modo, cfg, printed_ready = None, {}, False
-                    continue
-
-            if modo:
-                now = time.ticks_ms()
-                if time.ticks_diff(now, next_t) >= 0:
-                    MODE_HANDLERS[modo](cfg)
-                    next_t = time.ticks_add(now, INTERVAL_MS)
-            time.sleep(0)
-
-        # ================== STATE_PAUSED ==================
-        elif state == STATE_PAUSED:
-            if line:
-                t_upper = line.strip().upper()
-                if t_upper == "RUN":
-                    sys.stdout.write("RUN\n")
-                    state = STATE_RUN
-                    next_t = time.ticks_add(time.ticks_ms(), INTERVAL_MS)
-                elif t_upper == "STOP":
-                    go_home()
-                    stop_motor()
-                    calibracion_lista = 0
-                    sys.stdout.write("STOP\n")
-                    state = STATE_IDLE
-                    modo, cfg, printed_ready = None, {}, False
-                elif t_upper in ("PAUSE", "PAUSA"):
-                    sys.stdout.write("PAUSE\n")
-            time.sleep(0.01)
+            elif t_upper == "RUN":
+                sys.stdout.write("RUN\n")
+                _post(("RESUME",), preempt=False)
+                state = STATE_RUN
+            elif t_upper == "STOP":
+                _post(("STOP",))
+                sys.stdout.write("STOP\n")
+                state = STATE_IDLE
+                printed_ready = False
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,30 @@
 import sys
 import time
+from array import array
+
+try:                                    # MICROPYTHON
+    from time import ticks_us, ticks_diff, sleep_us
+except ImportError:                     # CPYTHON (HOST-SIDE TESTS)
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+    def sleep_us(us):
+        time.sleep(us / 1_000_000)
+
+try:
+    import uselect as select
+except ImportError:
+    import select
+
+try:
+    from machine import Timer
+except ImportError:                     # CPYTHON: THE MAIN LOOP SAMPLES ON SCHEDULE INSTEAD
+    Timer = None
+
+_MICROPYTHON = sys.implementation.name == "micropython"
 
 # try random; fall back to urandom if needed
 try:
@@ -9,6 +34,158 @@ except ImportError:
     import urandom
     _randint = lambda: (urandom.getrandbits(7) % 101)
 
+class Acquisition():
+    '''
+    Samples every channel at `rate_hz`, averaging `oversample` reads per channel, into a preallocated ring of float32
+    rows (array('f'), no allocation per sample) and writes them to the host `block` rows per write.
+    Row layout matches the header sent for command '1': LOAD, DISP, then the resistance channels.
+    If the host falls behind by more than the ring holds, the oldest rows are overwritten and counted in `dropped`.
+    `samples` is only written by the sampler and `sent` only by `flush`, so a timer callback can sample while the main
+    loop flushes without a lock.
+    '''
+    def __init__(self, width, read_channel, rate_hz=100, oversample=1, block=16, out=None):
+        self.width = width
+        self.read_channel = read_channel      # read_channel(i) -> one raw reading of column i
+        self.rate_hz = rate_hz
+        self.oversample = max(1, oversample)
+        self.block = max(1, block)
+        self.out = out if out is not None else sys.stdout
+        self.capacity = 4 * self.block
+        self.ring = array('f', [0.0] * (self.capacity * width))
+        self.samples = 0                      # ROWS WRITTEN (ROW samples % capacity IS NEXT)
+        self.sent = 0                         # ROWS SENT OR DROPPED
+        self.dropped = 0
+        self.stop_at = None                   # SAMPLE COUNT AT WHICH sample() STOPS WRITING, None = NO LIMIT
+        self.period_us = 1_000_000 // max(1, rate_hz)
+        self.next_us = ticks_us()
+        self.timer = None
+
+    @property
+    def pending(self):
+        return self.samples - self.sent
+
+    def start_timer(self):
+        ''' Sample from a hardware / virtual timer, so command handling can't shift sample times. False if none '''
+        if Timer is None:
+            return False
+        self.stop_timer()
+        try:
+            timer = Timer(-1)             # VIRTUAL TIMER (RP2); PORTS WITHOUT ONE FALL BACK TO THE POLLED LOOP
+            timer.init(mode=Timer.PERIODIC, freq=self.rate_hz, callback=lambda t: self.sample())
+        except (ValueError, OSError):
+            return False
+        self.timer = timer
+        return True
+
+    def stop_timer(self):
+        if self.timer is not None:
+            self.timer.deinit()
+            self.timer = None
+
+    def sample(self):
+        ''' One averaged row into the ring; nothing once `stop_at` rows were taken (a timer may still fire) '''
+        if self.stop_at is not None and self.samples >= self.stop_at:
+            return
+        ring, read, k = self.ring, self.read_channel, self.oversample
+        base = (self.samples % self.capacity) * self.width
+        for i in range(self.width):
+            acc = 0.0
+            for _ in range(k):
+                acc += read(i)
+            ring[base + i] = acc / k
+        self.samples += 1
+
+    def flush(self, limit=None):
+        ''' Send up to `limit` pending rows (all by default) with a single write '''
+        samples = self.samples
+        lag = samples - self.sent
+        if lag > self.capacity:               # OVERWRITTEN BEFORE THEY COULD BE SENT
+            self.dropped += lag - self.capacity
+            self.sent = samples - self.capacity
+            lag = self.capacity
+        n = lag if limit is None else min(limit, lag)
+        if n == 0:
+            return 0
+        ring, width = self.ring, self.width
+        row = self.sent % self.capacity
+        lines = []
+        for _ in range(n):
+            base = row * width
+            lines.append(",".join(["%.6g" % ring[base + i] for i in range(width)]))
+            row = (row + 1) % self.capacity
+        self.sent += n
+        self.out.write("\n".join(lines) + "\n")
+        return n
+
+    def due(self, now=None):
+        ''' True when the next sample time has come (catch-up steps keep the average rate exact) '''
+        now = ticks_us() if now is None else now
+        if ticks_diff(now, self.next_us) < 0:
+            return False
+        self.next_us += self.period_us
+        if ticks_diff(now, self.next_us) > self.period_us * self.capacity:
+            self.next_us = now + self.period_us   # TOO FAR BEHIND (E.G. PAUSED): RESTART THE SCHEDULE
+        return True
+
+    def step(self):
+        ''' One pass of the main loop: sample if due (no timer), send every complete block '''
+        if self.timer is None and self.due():
+            self.sample()
+        while self.pending >= self.block:
+            self.flush(self.block)
+
+    def wait_us(self):
+        ''' How long the main loop may sleep before the next sample is due '''
+        if self.timer is not None:
+            return self.period_us
+        return max(0, ticks_diff(self.next_us, ticks_us()))
+
+
+class CommandReader():
+    '''
+    Non-blocking line reader on stdin: `readline` returns a complete command or None right away.
+    MicroPython polls stdin with uselect and reads it one char at a time; streams that can't be polled (StringIO in the
+    host-side tests) are treated as always readable.
+    '''
+    MAX_CHARS = 64                            # PER CALL, SO A LONG BURST CAN'T HOLD UP SAMPLING
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdin
+        self.chars = []
+        try:
+            self.poller = select.poll()
+            self.poller.register(self.stream, select.POLLIN)
+        except (AttributeError, OSError, TypeError, ValueError):
+            self.poller = None
+
+    def ready(self, timeout_ms=0):
+        ''' True if input is waiting, waits up to timeout_ms for it '''
+        if self.poller is None:
+            return True
+        return bool(self.poller.poll(timeout_ms))
+
+    def readline(self):
+        if not _MICROPYTHON:
+            # CPYTHON STDIN IS LINE BUFFERED: A READY STREAM HAS A WHOLE LINE
+            if not self.ready(0):
+                return None
+            line = self.stream.readline()
+            return line.strip() if line else None
+
+        for _ in range(self.MAX_CHARS):
+            if not self.ready(0):
+                return None
+            c = self.stream.read(1)
+            if not c:
+                return None
+            if c == "\n":
+                line = "".join(self.chars).strip()
+                self.chars = []
+                return line
+            self.chars.append(c)
+        return None
+
+
 class DataHandler():
     '''
     Handles the exchange of data between the microcontroller and host computer
@@ -23,11 +200,20 @@ class DataHandler():
         self.paused = True
         self.channels = 0
         self.ready = False
+        self.rate_hz = 100        # ACQ: SAMPLES PER SECOND
+        self.oversample = 1       # ACQ: READS AVERAGED PER CHANNEL AND SAMPLE
+        self.block = 16           # ACQ: ROWS PER WRITE
+        self.acq = None
+        self.streaming = False    # ACQ RUNNING (COMMANDS KEEP BEING SERVED)
+        self.stream_end = None    # ACQ SAMPLE COUNT TO STOP AT, None = UNTIL PAUSE
+        self.expect_config = False  # NEXT LINE IS THE CONFIG THAT FOLLOWS COMMAND '1'
+        self.commands = CommandReader()
+        self.IDLE_MS = 20
 
     def wait(self):
         '''Waits until parameters have been configured. CALL AFTER RUN, BEFORE GETTERS'''
         while not self.ready:
-            time.sleep(1)
+            time.sleep(0.01)
 
     def get_speed(self) -> int:
         return self.speed
@@ -46,51 +232,84 @@ class DataHandler():
 
     def run(self):
         while True:
-            self._process_command()
+            self.poll()
+
+    def poll(self):
+        ''' One pass: serve a command if a full line arrived, keep the acquisition going, sleep until there's work '''
+        command = self.commands.readline()
+        if command is not None:
+            self._process_command(command)
+
+        if not self.streaming:
+            if command is None:
+                self.commands.ready(self.IDLE_MS)
+            return
+
+        acq = self.acq
+        acq.step()
+        if self.stream_end is not None and acq.samples >= self.stream_end:
+            self._stop_stream()
+        elif command is None:
+            wait_ms = acq.wait_us() // 1000
+            if wait_ms > 0:
+                self.commands.ready(min(wait_ms, self.IDLE_MS))
 
-    def _send_data(self):  # REMOVE IN FINAL PRODUCT
-        ''' Sends x and y data values to the host '''
-        datastr = ""
-        iter_n = self.channels if self.channels != 21 else 40
-        for _ in range(iter_n):
-            datastr += f',{_randint()}'
-        sys.stdout.write(f"0.1,0.1{datastr}\n")
+    def _start_stream(self, n_samples):
+        acq = self._acquisition()
+        acq.flush()
+        acq.next_us = ticks_us()
+        self.stream_end = None if n_samples is None else acq.samples + n_samples
+        acq.stop_at = self.stream_end
+        self.streaming = True
+        acq.start_timer()
 
-    def _process_command(self):
-        ''' Processes incoming commands from host '''
-        command = sys.stdin.readline().strip()
+    def _stop_stream(self):
+        self.streaming = False
+        if self.acq is not None:
+            self.acq.stop_timer()
+            self.acq.stop_at = None
+            self.acq.flush()
 
+    def _width(self):
+        ''' LOAD, DISP + resistance columns of the header sent for command '1' '''
+        return 2 + (self.channels if self.channels != 21 else 40)
+
+    def _read_channel(self, i):  # REMOVE IN FINAL PRODUCT
+        ''' Raw reading of column i '''
+        return 0.1 if i < 2 else _randint()
+
+    def _acquisition(self):
+        ''' Acquisition for the current channels / ACQ settings, rebuilt only when they change '''
+        acq = self.acq
+        if (acq is None or acq.width != self._width() or acq.rate_hz != self.rate_hz
+                or acq.oversample != self.oversample or acq.block != self.block):
+            if acq is not None:
+                acq.stop_timer()
+            acq = self.acq = Acquisition(self._width(), self._read_channel, self.rate_hz, self.oversample, self.block)
+        return acq
+
+    def _send_data(self):
+        ''' Sends one averaged sample to the host (host-polled 'r') '''
+        acq = self._acquisition()
+        acq.flush()               # LEFTOVERS OF AN EARLIER CAPTURE GO FIRST
+        acq.sample()
+        acq.flush()
+
+    def _process_command(self, command):
+        ''' Processes one command line from the host '''
         if not command:
             return  # nothing to do
 
-        if command == '0':
+        if self.expect_config:
+            self.expect_config = False
+            self._configure(command)
+
+        elif command == '0':
             sys.stdout.write("0\n")
 
         elif command == '1':
             sys.stdout.write("0\n")  # e.g. wait for calibration first if needed
-            config_data = sys.stdin.readline().strip().split(',')
-            self.channels = int(config_data[-1])
-
-            if self.channels == 8:
-                channel_header = ('1001 <R1> (OHM), 1002 <R2> (OHM), 1003 <R3> (OHM), 1004 <R4> (OHM),'
-                                  '1006 <C1> (OHM), 1007 <C2> (OHM), 1008 <C3> (OHM), 1009 <C4> (OHM)')
-            elif self.channels == 10:
-                channel_header = ('1001 <R1> (OHM), 1002 <R2> (OHM), 1003 <R3> (OHM),'
-                                  '1004 <R4> (OHM), 1005 <R5> (OHM),'
-                                  '1006 <C1> (OHM), 1007 <C2> (OHM), 1008 <C3> (OHM),'
-                                  '1009 <C4> (OHM), 1010 <C5> (OHM)')
-            elif self.channels == 21:
-                channel_header = ('1-1p (6001),1-3p (6002),2-4p (6003),3-1p (6004),3-5p (6005),4-2p (6006),4-6p (6007),'
-                                  '5-3p (6008),5-7p (6009),6-4p (6010),6-8p (6011),7-5p (6012),7-9p (6013),8-6p (6014),8-10p (6015),'
-                                  '9-7p (6016),9-11p (6017),10-8p (6018),10-12p (6019),11-9p (6020),11-13p (6021),12-10p (6022),12-14p (6023),'
-                                  '13-11p (6024),13-15p (6025),14-12p (6026),14-16p (6027),15-13p (6028),15-17p (6029),16-14p (6030),16-18p (6031),'
-                                  '17-15p (6032),17-19p (6033),18-16p (6034),18-20p (6035),19-17p (6036),19-21p (6037),20-18p (6038),'
-                                  '21-19p (6039),21-21p (6040)')
-            else:
-                channel_header = "Resistance (6001)"
-                    
-            sys.stdout.write(f"5001 <LOAD> (VDC),5021 <DISP> (VDC),{channel_header}\n")
-            #sys.stdout.write(f"{channel_header}\n")
+            self.expect_config = True
 
         elif command == 'r':
             self._send_data()
@@ -112,15 +331,57 @@ class DataHandler():
                     self.vary_angle = (int(p2[0][1:]), int(p2[1][1:]), int(p2[2][1:]))
             self.ready = True
 
+        elif command.startswith("ACQ"):  # ACQ <rate>HZ <k>OS <m>BLK [<n>N], WITHOUT N IT STREAMS UNTIL PAUSE
+            self._stop_stream()
+            n_samples = None
+            for p in command.split()[1:]:
+                if p.endswith('HZ'):
+                    self.rate_hz = int(p[:-2])
+                elif p.endswith('OS'):
+                    self.oversample = int(p[:-2])
+                elif p.endswith('BLK'):
+                    self.block = int(p[:-3])
+                elif p.endswith('N'):
+                    n_samples = int(p[:-1])
+            self._start_stream(n_samples)
+
         elif command.startswith("PAUSE"):
+            self._stop_stream()
             self.paused = True
-        
+
         elif command.startswith("END"):
+            self._stop_stream()
             sys.exit()
 
         else:
             print("No command received")
 
+    def _configure(self, config_line):
+        ''' Second line of command '1': ...,<channels>. Answers with the header '''
+        config_data = config_line.split(',')
+        self.channels = int(config_data[-1])
+
+        if self.channels == 8:
+            channel_header = ('1001 <R1> (OHM), 1002 <R2> (OHM), 1003 <R3> (OHM), 1004 <R4> (OHM),'
+                              '1006 <C1> (OHM), 1007 <C2> (OHM), 1008 <C3> (OHM), 1009 <C4> (OHM)')
+        elif self.channels == 10:
+            channel_header = ('1001 <R1> (OHM), 1002 <R2> (OHM), 1003 <R3> (OHM),'
+                              '1004 <R4> (OHM), 1005 <R5> (OHM),'
+                              '1006 <C1> (OHM), 1007 <C2> (OHM), 1008 <C3> (OHM),'
+                              '1009 <C4> (OHM), 1010 <C5> (OHM)')
+        elif self.channels == 21:
+            channel_header = ('1-1p (6001),1-3p (6002),2-4p (6003),3-1p (6004),3-5p (6005),4-2p (6006),4-6p (6007),'
+                              '5-3p (6008),5-7p (6009),6-4p (6010),6-8p (6011),7-5p (6012),7-9p (6013),8-6p (6014),8-10p (6015),'
+                              '9-7p (6016),9-11p (6017),10-8p (6018),10-12p (6019),11-9p (6020),11-13p (6021),12-10p (6022),12-14p (6023),'
+                              '13-11p (6024),13-15p (6025),14-12p (6026),14-16p (6027),15-13p (6028),15-17p (6029),16-14p (6030),16-18p (6031),'
+                              '17-15p (6032),17-19p (6033),18-16p (6034),18-20p (6035),19-17p (6036),19-21p (6037),20-18p (6038),'
+                              '21-19p (6039),21-21p (6040)')
+        else:
+            channel_header = "Resistance (6001)"
+                
+        sys.stdout.write(f"5001 <LOAD> (VDC),5021 <DISP> (VDC),{channel_header}\n")
+        #sys.stdout.write(f"{channel_header}\n")
+
 if __name__ == "__main__":
     dh = DataHandler()
     dh.run()
\ No newline at end of file
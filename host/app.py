@@ -5,6 +5,7 @@ from serial_interface import SerialInterface
 import serial.tools.list_ports as list_ports
 
 from payload import Payload
+from render_scheduler import RenderScheduler
 
 from control_page import ControlPage, ComPortMenu
 from multi_display import WaveformApp
@@ -112,6 +113,9 @@ class App(ctk.CTk):
         # Pages dict to manage different pages
         self.pages = {}
 
+        # Redraws the live pages from the Tk main loop, only the one shown in the Navbar
+        self.scheduler = RenderScheduler(self)
+
         # Para mantener referencia a la BendingPage cuando se use
         self.bending_page = None
 
@@ -206,10 +210,16 @@ class App(ctk.CTk):
         for page in self.pages.values():
             page.grid(row=0, column=0, sticky="nsew")
 
+        self.scheduler.register("Waveform", self.pages["Waveform"]._update_graph, lambda: p.version)
+        self.scheduler.register("∆R/Ro", r_div._update_graph, lambda: p.version)
+        self.scheduler.register("Heatmap", self.pages["Heatmap"].draw_heatmap, lambda: p.version)
+        self.scheduler.start()
+
         # Display Settings Tab Initially
         self.switch_frame("Settings")
 
     def switch_frame(self, selected):
+        self.scheduler.show(selected)
         if selected in self.pages:
             self.pages[selected].tkraise()
         else:
@@ -224,6 +234,7 @@ class App(ctk.CTk):
             widget.destroy()
 
     def close(self):
+        self.scheduler.stop()
         self.clear_window()
         self.serial_interface.disconnect()
         exit()
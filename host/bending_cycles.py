@@ -0,0 +1,153 @@
+"""
+bending_cycles.py  –  Online cycle segmentation and hysteresis statistics for bending sweeps
+Texas A&M University X UADY
+"""
+
+import math
+from typing import List, Optional
+
+
+class CycleStats:
+    """
+    One completed cycle, minimum angle to minimum angle.
+    `loop_area` is the signed ∮ R dθ over the cycle (Ω·°): positive when R is higher on the way up than on the way back.
+    `delta_r_max_angle` is R at the cycle's largest angle minus R at its start. Resistance figures are NaN for cycles
+    without any resistance reading.
+    """
+
+    FIELDS = ("index", "t_start", "period", "max_angle", "peak_resistance", "delta_r_max_angle", "loop_area")
+
+    def __init__(self, index: int, t_start: float, period: float, max_angle: float, peak_resistance: float,
+                 delta_r_max_angle: float, loop_area: float):
+        self.index = index
+        self.t_start = t_start
+        self.period = period
+        self.max_angle = max_angle
+        self.peak_resistance = peak_resistance
+        self.delta_r_max_angle = delta_r_max_angle
+        self.loop_area = loop_area
+
+    def as_tuple(self):
+        return tuple(getattr(self, f) for f in self.FIELDS)
+
+
+class _Segment:
+    '''Running statistics of a stretch of samples; two consecutive segments merge into the stats of both'''
+
+    def __init__(self, t: float):
+        self.t_start = t
+        self.t_end = t
+        self.r_start = math.nan            # FIRST VALID RESISTANCE
+        self.peak_r = math.nan
+        self.area = 0.0
+        self.max_angle = -math.inf
+        self.r_at_max_angle = math.nan
+
+    def add(self, t: float, angle: float, r: float, area: float) -> None:
+        self.t_end = t
+        self.area += area
+        if r == r:
+            if self.r_start != self.r_start:
+                self.r_start = r
+            if not (self.peak_r >= r):
+                self.peak_r = r
+        if angle > self.max_angle:
+            self.max_angle = angle
+            self.r_at_max_angle = r
+
+    def merge(self, later: "_Segment") -> None:
+        self.t_end = later.t_end
+        self.area += later.area
+        if self.r_start != self.r_start:
+            self.r_start = later.r_start
+        if later.peak_r == later.peak_r and not (self.peak_r >= later.peak_r):
+            self.peak_r = later.peak_r
+        if later.max_angle > self.max_angle:
+            self.max_angle = later.max_angle
+            self.r_at_max_angle = later.r_at_max_angle
+
+
+class CycleAnalyzer:
+    """
+    Splits the (time, angle, resistance) stream into cycles at angle minima and keeps per-cycle statistics, O(1) per
+    sample and without keeping the samples. A minimum (or maximum) only counts once the angle has moved `deadband`
+    degrees away from it, so encoder jitter doesn't split cycles. The samples after the running extreme are held in a
+    separate segment until the reversal is confirmed, so each cycle ends exactly at its minimum. Whatever precedes the
+    first confirmed minimum (the approach from home) is not a cycle.
+    """
+
+    def __init__(self, deadband: float = 1.0):
+        self.deadband = deadband
+        self.reset()
+
+    def reset(self) -> None:
+        self.cycles: List[CycleStats] = []
+        self._rising = False                # WAITING FOR A MINIMUM FIRST
+        self._extreme: Optional[float] = None
+        self._cycle: Optional[_Segment] = None
+        self._tail: Optional[_Segment] = None
+        self._last_angle = math.nan         # LAST POINT WITH RESISTANCE, FOR THE TRAPEZOIDS OF THE LOOP AREA
+        self._last_r = math.nan
+
+    def add(self, t: float, angle: float, resistance: Optional[float]) -> Optional[CycleStats]:
+        '''Feed one sample; returns the cycle it closes, if any'''
+        r = math.nan if resistance is None else resistance
+        area = 0.0
+        if r == r:
+            if self._last_r == self._last_r:
+                area = 0.5 * (r + self._last_r) * (angle - self._last_angle)
+            self._last_angle, self._last_r = angle, r
+
+        if self._extreme is None:
+            self._extreme = angle
+            self._tail = _Segment(t)
+            self._tail.add(t, angle, r, area)
+            return None
+
+        if (angle > self._extreme) if self._rising else (angle < self._extreme):
+            # NEW EXTREME: EVERYTHING UP TO IT BELONGS TO THE CURRENT CYCLE, THE TAIL RESTARTS HERE
+            self._extreme = angle
+            self._absorb_tail()
+            if self._cycle is not None:
+                self._cycle.add(t, angle, r, area)
+            self._tail = _Segment(t)
+            self._tail.add(t, angle, r, 0.0)
+            return None
+
+        self._tail.add(t, angle, r, area)
+        if abs(angle - self._extreme) < self.deadband:
+            return None
+
+        # REVERSAL CONFIRMED
+        closed = None
+        if self._rising:
+            self._absorb_tail()                 # MAXIMUM: SAME CYCLE, NOW ON THE WAY BACK
+        else:
+            closed = self._close_cycle()        # MINIMUM: THE TAIL STARTS THE NEXT CYCLE
+            self._cycle = self._tail
+        self._rising = not self._rising
+        self._extreme = angle
+        self._tail = _Segment(t)
+        self._tail.add(t, angle, r, 0.0)
+        return closed
+
+    def extend(self, samples) -> int:
+        '''Feed (t, angle, resistance) triples, returns how many cycles closed'''
+        closed = 0
+        for t, angle, resistance in samples:
+            if self.add(t, angle, resistance) is not None:
+                closed += 1
+        return closed
+
+    def _absorb_tail(self) -> None:
+        if self._cycle is not None and self._tail is not None:
+            self._cycle.merge(self._tail)
+
+    def _close_cycle(self) -> Optional[CycleStats]:
+        c = self._cycle
+        if c is None:
+            return None
+        stats = CycleStats(len(self.cycles) + 1, c.t_start, c.t_end - c.t_start, c.max_angle, c.peak_r,
+                           c.r_at_max_angle - c.r_start, c.area)
+        self.cycles.append(stats)
+        return stats
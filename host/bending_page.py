@@ -1,9 +1,9 @@
 # bending_page.py
 import customtkinter as ctk
+import numpy
 import threading
 import time
 import json
-import ast
 import csv
 from datetime import datetime
 from tkinter import filedialog  # diálogo para guardar CSV
@@ -16,13 +16,25 @@ try:
 except Exception:
     _HAS_MPL = False
 
-from serial_interface import SerialInterface
+from serial_interface import LineReader, SerialInterface
+from bending_telemetry import FORMAT_COMMAND, ReportInterval, batch_times, parse_report
+from column_buffer import ColumnBuffer, DecimatedSeries
+from csv_stream import CsvStream
+from bending_cycles import CycleAnalyzer
 
-# === presetsBending ===
-import presetsBending  # importamos tus presetsBending .py
+# === presets (presets.json, compartido con ControlPage) ===
+from preset_store import BENDING_PRESETS
 
 
 class BendingPage(ctk.CTkFrame):
+    # parámetro de la gráfica de tendencia -> campo de CycleStats
+    CYCLE_TREND_FIELDS = {
+        "R pico (Ω)": "peak_resistance",
+        "ΔR en ángulo máx (Ω)": "delta_r_max_angle",
+        "Área del lazo (Ω·°)": "loop_area",
+        "Periodo (s)": "period",
+    }
+
     def __init__(self, master, serial_interface: SerialInterface, on_back):
         super().__init__(master)
         self.serial_interface = serial_interface
@@ -32,14 +44,30 @@ class BendingPage(ctk.CTkFrame):
         self.reader_thread = None
         self.stop_event = threading.Event()
         self.listening = False
+        self.report_format_ser = None      # conexión serial a la que ya se pidió el formato compacto
+        self.line_reader = None            # LineReader activo (métricas: líneas/s, backlog)
+
+        # ===== Lecturas en pantalla =====
+        # El lector solo sobrescribe el último valor (buzón); un tick de UI a ~20 Hz lo dibuja si cambió.
+        # Así la carga de Tk no depende de la tasa de muestras.
+        self.UI_TICK_MS = 50
+        self.ui_job = None
+        self.readings_latest = None        # (modo, ángulo, velocidad, resistencia) más reciente
+        self.readings_posted = 0           # muestras publicadas en el buzón
+        self.readings_drawn = 0            # readings_posted al último dibujado
+        self.readings_coalesced = 0        # publicaciones que nunca se dibujaron (sobrescritas antes del tick)
 
         # ===== Logging/mediciones =====
         self.logging_active = False        # se activa tras la PRIMERA muestra válida recibida
         self.log_start_ts = None           # epoch relativo inicio (perf_counter)
-        # filas: [t_rel, velocity, angle, resistance]
-        self.data_rows = []
+        self.log_last_t = None             # t_rel del último reporte registrado
+        self.report_interval = ReportInterval()   # periodo de reporte del firmware, estimado de las llegadas
+        # columnas: t_rel, velocity, angle, resistance (NaN si no viene); crece por duplicación, sin listas por fila
+        self.data_rows = ColumnBuffer(["time", "velocity", "angle", "resistance"])
         self.expected_modo = 1             # modo esperado según selección UI
         self.log_lock = threading.Lock()   # acceso thread-safe al buffer
+        self.csv_stream = None             # CsvStream de la sesión (archivo elegido en Submit, se escribe en bloques)
+        self.cycle_analyzer = CycleAnalyzer()   # ciclos mínimo→mínimo de ángulo, alimentado por el lector (bajo log_lock)
 
         # ===== Plot en vivo =====
         self.LIVE_REFRESH_MS = 250         # intervalo de refresco (ms)
@@ -47,6 +75,8 @@ class BendingPage(ctk.CTkFrame):
         self.live_job = None
         self.plot_x_name = "tiempo"
         self.plot_y_name = "angulo"
+        self.plot_series = DecimatedSeries()   # puntos ya graficados (decimados en corridas largas)
+        self.plot_rows = 0                     # filas de data_rows ya pasadas a plot_series
 
         # refs matplotlib
         self._mpl_canvas = None
@@ -54,6 +84,13 @@ class BendingPage(ctk.CTkFrame):
         self._mpl_ax = None
         self._mpl_line = None
 
+        # ===== Ciclos (tabla + tendencia) =====
+        self.cycles_shown = 0                  # ciclos ya agregados a la tabla
+        self.cycle_trend = {f: [] for f in self.CYCLE_TREND_FIELDS.values()}
+        self._cycle_canvas = None
+        self._cycle_ax = None
+        self._cycle_line = None
+
         # ===== Estado de modo activo y calibración =====
         self.mode_running = False
         self.calibrating = False
@@ -280,6 +317,30 @@ class BendingPage(ctk.CTkFrame):
         self.plot_canvas_container = ctk.CTkFrame(self.plot_section, fg_color="transparent")
         self.plot_canvas_container.pack(fill="both", expand=True)
 
+        # ====== Ciclos: tabla y tendencia por ciclo ======
+        cycle_controls = ctk.CTkFrame(self.plot_section, fg_color="transparent")
+        cycle_controls.pack(fill="x", pady=(10, 4))
+        ctk.CTkLabel(cycle_controls, text="Ciclos", font=("Helvetica", 16, "bold")).pack(side="left")
+        self.cycle_count_label = ctk.CTkLabel(cycle_controls, text="0", font=("Helvetica", 13))
+        self.cycle_count_label.pack(side="left", padx=(8, 16))
+        ctk.CTkLabel(
+            cycle_controls, text="Tendencia:", font=("Helvetica", 13, "bold")
+        ).pack(side="left", padx=(0, 6))
+        self.cycle_trend_combo = ctk.CTkComboBox(
+            cycle_controls, values=list(self.CYCLE_TREND_FIELDS), width=200,
+            command=self._on_cycle_trend_changed
+        )
+        self.cycle_trend_combo.set(next(iter(self.CYCLE_TREND_FIELDS)))
+        self.cycle_trend_combo.pack(side="left")
+
+        self.cycle_table = ctk.CTkTextbox(self.plot_section, height=140, font=("Courier", 12))
+        self.cycle_table.pack(fill="x", padx=6)
+        self.cycle_table.insert("end", self._cycle_table_header())
+        self.cycle_table.configure(state="disabled")
+
+        self.cycle_plot_container = ctk.CTkFrame(self.plot_section, fg_color="transparent")
+        self.cycle_plot_container.pack(fill="both", expand=True)
+
         if not _HAS_MPL:
             warn = ctk.CTkLabel(
                 self.plot_canvas_container,
@@ -526,53 +587,10 @@ class BendingPage(ctk.CTkFrame):
         """
         Devuelve (modo, velocity, angle, resistance)
         resistance puede ser None si no viene en el arreglo.
+        Acepta el arreglo ['modo', 1, 'velocity', 7, 'angle', 12.3] y el formato compacto T,1,7,12.3 (ver
+        bending_telemetry.py); sin ast.literal_eval por línea.
         """
-        try:
-            lst = ast.literal_eval(s)
-            if not isinstance(lst, list):
-                return None, None, None, None
-
-            d = {}
-            i = 0
-            while i + 1 < len(lst):
-                k = lst[i]
-                v = lst[i + 1]
-                if isinstance(k, str):
-                    key = k.strip().lower()
-                    d[key] = v
-                i += 2
-
-            modo = d.get("modo")
-            velocity = d.get("velocity", d.get("velocidad"))
-            angle = d.get("angle", d.get("angulo"))
-            resistance = d.get("resistance", d.get("resistencia"))
-
-            try:
-                modo = int(modo)
-            except Exception:
-                return None, None, None, None
-
-            def to_float(x):
-                if isinstance(x, (int, float)):
-                    return float(x)
-                if isinstance(x, str):
-                    x = x.strip()
-                    try:
-                        return float(x)
-                    except Exception:
-                        return None
-                return None
-
-            velocity = to_float(velocity)
-            angle = to_float(angle)
-            res_val = to_float(resistance) if resistance is not None else None
-
-            if (velocity is None) or (angle is None):
-                return None, None, None, None
-
-            return modo, velocity, angle, res_val
-        except Exception:
-            return None, None, None, None
+        return parse_report(s)
 
     # ===================== Calibración: control de UI =====================
     def _set_calibrating_ui(self, flag: bool):
@@ -641,6 +659,7 @@ class BendingPage(ctk.CTkFrame):
 
     # ===================== Lector RX =====================
     def _start_reader(self):
+        self._schedule_ui_tick()
         if self.listening:
             return
         self.stop_event.clear()
@@ -656,48 +675,18 @@ class BendingPage(ctk.CTkFrame):
                     self._set_status("Serial no disponible.")
                     self.listening = False
                     return
+                # Formato compacto de reporte, una vez por conexión (firmware viejo lo ignora y sigue con la lista)
+                if self.report_format_ser is not ser:
+                    self.report_format_ser = ser
+                    ser.write((FORMAT_COMMAND + "\n").encode())
                 self._set_status("Leyendo datos...")
+                # Bloquea hasta que llegan datos y procesa todo lo acumulado en lote (sin sleep por línea)
+                self.line_reader = LineReader(ser)
                 while not self.stop_event.is_set():
-                    raw = self.serial_interface.ser.readline().decode().strip()
-                    if not raw:
-                        continue
-
-                    up = raw.upper()
-
-                    # --- Mensajes relacionados con calibración ---
-
-                    # 1) FIN de calibración
-                    if ("CALIBRACION LISTA" in up or
-                        "MOTOR EN HOME" in up or
-                        "CALIBRADO" in up):
-                        self._set_calibrating_ui(False)
-                        time.sleep(0.003)
+                    lines = self.line_reader.read_batch()
+                    if not lines:
                         continue
-
-                    # 2) INICIO / progreso de calibración
-                    if ("CALIBRANDO" in up) or (up.strip() == "CALIBRACION"):
-                        self._set_calibrating_ui(True)
-                        time.sleep(0.003)
-                        continue
-
-                    print(f"[RX] {raw}")
-                    modo, vel, ang, res = self._parse_modo_velocity_angle(raw)
-                    if (modo is not None) and (vel is not None) and (ang is not None):
-                        if modo == self.expected_modo or modo == 0:
-                            with self.log_lock:
-                                now = time.perf_counter()
-                                if not self.logging_active:
-                                    self.logging_active = True
-                                    self.log_start_ts = now
-                                t_rel = now - self.log_start_ts
-
-                                res_val = float(res) if res is not None else None
-                                self.data_rows.append(
-                                    [t_rel, float(vel), float(ang), res_val]
-                                )
-
-                            self._update_readings(modo, ang, vel, res)
-                    time.sleep(0.003)
+                    self._process_lines(lines, time.perf_counter())
 
             except Exception as e:
                 self._set_status(f"Error lector: {e}")
@@ -707,41 +696,116 @@ class BendingPage(ctk.CTkFrame):
         self.reader_thread = threading.Thread(target=_worker, daemon=True)
         self.reader_thread.start()
 
+    def _process_lines(self, lines, now: float):
+        """Un lote del lector: mensajes de calibración, reportes válidos al buffer con un solo lock, UI una vez."""
+        samples = []
+        last = None
+        for raw in lines:
+            up = raw.upper()
+
+            # --- Mensajes relacionados con calibración ---
+
+            # 1) FIN de calibración
+            if ("CALIBRACION LISTA" in up or
+                "MOTOR EN HOME" in up or
+                "CALIBRADO" in up):
+                self._set_calibrating_ui(False)
+                continue
+
+            # 2) INICIO / progreso de calibración
+            if ("CALIBRANDO" in up) or (up.strip() == "CALIBRACION"):
+                self._set_calibrating_ui(True)
+                continue
+
+            modo, vel, ang, res = self._parse_modo_velocity_angle(raw)
+            if (modo is None) or (vel is None) or (ang is None):
+                print(f"[RX] {raw}")
+                continue
+            if modo == self.expected_modo or modo == 0:
+                samples.append((vel, ang, res))
+                last = (modo, ang, vel, res)
+
+        if not samples:
+            return
+        # El último reporte del lote llega en `now`; los anteriores se fechan hacia atrás un periodo estimado cada uno
+        step = self.report_interval.observe(len(samples), now)
+        with self.log_lock:
+            if not self.logging_active:
+                self.logging_active = True
+                self.log_start_ts = now - (len(samples) - 1) * step
+                self.log_last_t = None
+            times = batch_times(len(samples), now - self.log_start_ts, self.log_last_t, step)
+            self.log_last_t = times[-1]
+            for t_rel, (vel, ang, res) in zip(times, samples):
+                self.data_rows.append((t_rel, vel, ang, res))
+                self.cycle_analyzer.add(t_rel, ang, res)
+        self._update_readings(*last, count=len(samples))
+
     def _set_status(self, text: str):
         self.after(0, lambda: self.status_label.configure(text=text))
 
-    def _update_readings(self, mode_val: int, angle_val: float, speed_val: float, resistance_val=None):
-        def _do():
-            if hasattr(self, "mode_value_label"):
-                self.mode_value_label.configure(text=str(mode_val))
+    def _update_readings(self, mode_val: int, angle_val: float, speed_val: float, resistance_val=None, count: int = 1):
+        """Desde el lector: solo deja el valor más reciente en el buzón, lo dibuja _ui_tick."""
+        self.readings_latest = (mode_val, angle_val, speed_val, resistance_val)
+        self.readings_posted += count
 
-            if hasattr(self, "angle_value_label"):
-                if isinstance(angle_val, float):
-                    self.angle_value_label.configure(text=f"{angle_val:.6f}")
-                else:
-                    self.angle_value_label.configure(text=str(angle_val))
+    def _schedule_ui_tick(self):
+        if self.ui_job is None:
+            self.ui_job = self.after(self.UI_TICK_MS, self._ui_tick)
 
-            if hasattr(self, "speed_value_label"):
-                if isinstance(speed_val, float) and not float(speed_val).is_integer():
-                    self.speed_value_label.configure(text=f"{speed_val:.6f}")
-                else:
-                    self.speed_value_label.configure(text=str(int(speed_val)))
+    def _stop_ui_tick(self):
+        if self.ui_job is not None:
+            try:
+                self.after_cancel(self.ui_job)
+            except Exception:
+                pass
+            self.ui_job = None
+
+    def _ui_tick(self):
+        self.ui_job = None
+        posted = self.readings_posted          # primero el contador: en el peor caso se redibuja el mismo valor
+        latest = self.readings_latest
+        if latest is not None and posted != self.readings_drawn:
+            self.readings_coalesced += posted - self.readings_drawn - 1
+            self.readings_drawn = posted
+            self._draw_readings(*latest)
+        self._schedule_ui_tick()
+
+    def _draw_readings(self, mode_val: int, angle_val: float, speed_val: float, resistance_val=None):
+        if hasattr(self, "mode_value_label"):
+            self.mode_value_label.configure(text=str(mode_val))
+
+        if hasattr(self, "angle_value_label"):
+            if isinstance(angle_val, float):
+                self.angle_value_label.configure(text=f"{angle_val:.6f}")
+            else:
+                self.angle_value_label.configure(text=str(angle_val))
 
-            if hasattr(self, "resistance_value_label"):
-                if resistance_val is None:
-                    txt = "N/E"
+        if hasattr(self, "speed_value_label"):
+            if isinstance(speed_val, float) and not float(speed_val).is_integer():
+                self.speed_value_label.configure(text=f"{speed_val:.6f}")
+            else:
+                self.speed_value_label.configure(text=str(int(speed_val)))
+
+        if hasattr(self, "resistance_value_label"):
+            if resistance_val is None:
+                txt = "N/E"
+            else:
+                if isinstance(resistance_val, float) and not float(resistance_val).is_integer():
+                    txt = f"{resistance_val:.6f}"
                 else:
-                    if isinstance(resistance_val, float) and not float(resistance_val).is_integer():
-                        txt = f"{resistance_val:.6f}"
-                    else:
-                        txt = str(int(resistance_val))
-                self.resistance_value_label.configure(text=txt)
+                    txt = str(int(resistance_val))
+            self.resistance_value_label.configure(text=txt)
 
-            if hasattr(self, "samples_label"):
-                with self.log_lock:
-                    n = len(self.data_rows)
-                self.samples_label.configure(text=f"Muestras: {n}")
-        self.after(0, _do)
+        if hasattr(self, "samples_label"):
+            with self.log_lock:
+                n = len(self.data_rows)
+            reader = self.line_reader
+            text = f"Muestras: {n}  ·  coalescidas {self.readings_coalesced}"
+            if reader is not None:
+                text += (f"  ·  {reader.lines_per_s:.0f} líneas/s  ·  backlog {reader.backlog_bytes} B"
+                         f" (máx {reader.peak_backlog_bytes} B)")
+            self.samples_label.configure(text=text)
 
     # ===================== Controles manuales =====================
     def _send_manual_command(self, cmd: str):
@@ -807,10 +871,18 @@ class BendingPage(ctk.CTkFrame):
             return
 
         self.expected_modo = self._mode_number(mode)
+        try:
+            self._finish_csv_stream()       # la sesión anterior se cierra ANTES de vaciar el buffer
+        except Exception as e:
+            self._set_status(f"Error CSV anterior: {e}")
         with self.log_lock:
             self.logging_active = False
             self.log_start_ts = None
-            self.data_rows = []
+            self.data_rows.clear()
+            self.cycle_analyzer.reset()
+        self._reset_plot_series()
+        self._reset_cycle_view()
+        self._start_csv_stream()
 
         cmd_str = self._compose_command_json(cfg)
         self._send_submit_command(cmd_str)
@@ -867,14 +939,17 @@ class BendingPage(ctk.CTkFrame):
                     self.serial_interface.send_command("STOP")
                 else:
                     self.serial_interface.ser.write(b"STOP\n")
-            self._set_status("STOP enviado. Exportando CSV...")
+            self._set_status("STOP enviado. Cerrando CSV...")
 
             if self.listening:
                 self.stop_event.set()
                 if self.reader_thread and self.reader_thread.is_alive():
                     self.reader_thread.join(timeout=0.5)
 
-            self._export_csv()
+            # con sesión en streaming solo falta el último bloque; sin ella, volcado completo como antes
+            finished = self._finish_csv_stream()
+            if finished is None:
+                self._export_csv()
 
             with self.log_lock:
                 self.logging_active = False
@@ -883,7 +958,10 @@ class BendingPage(ctk.CTkFrame):
             self.mode_running = False
             self._set_calibrating_ui(False)
 
-            self._set_status("CSV exportado.")
+            if finished is None:
+                self._set_status("CSV exportado.")
+            else:
+                self._set_status(f"CSV guardado: {finished[0]} ({finished[1]} filas)")
         except Exception as e:
             self._set_status(f"Error STOP/CSV: {e}")
 
@@ -899,12 +977,28 @@ class BendingPage(ctk.CTkFrame):
 
     def _export_csv(self):
         with self.log_lock:
-            rows = list(self.data_rows)
+            rows = self.data_rows.rows()
 
-        if not rows:
+        if len(rows) == 0:
             self._set_status("No hay datos para exportar.")
             return
 
+        path = self._ask_csv_path()
+
+        # Resistencia ausente (NaN) -> celda vacía
+        rows_to_write = [[t, v, a, "" if res != res else res] for t, v, a, res in rows.tolist()]
+
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.data_rows.fields)
+                writer.writerows(rows_to_write)
+        except Exception as e:
+            self._set_status(f"No se pudo guardar CSV: {e}")
+            return
+
+    @staticmethod
+    def _ask_csv_path() -> str:
         default_name = f"bending_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         try:
             path = filedialog.asksaveasfilename(
@@ -915,28 +1009,26 @@ class BendingPage(ctk.CTkFrame):
             )
         except Exception:
             path = ""
+        return path or default_name
 
-        if not path:
-            path = default_name
-
-        # Normalizamos filas y convertimos None en vacío para resistance
-        rows_to_write = []
-        for r in rows:
-            r = list(r)
-            if len(r) < 4:
-                r += [None] * (4 - len(r))
-            t, v, a, res = r[:4]
-            res_out = "" if res is None else res
-            rows_to_write.append([t, v, a, res_out])
-
+    def _start_csv_stream(self):
+        '''Archivo de la sesión elegido al hacer Submit; las filas se agregan en bloques desde un hilo propio'''
+        path = self._ask_csv_path()
         try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["time", "velocity", "angle", "resistance"])
-                writer.writerows(rows_to_write)
+            self.csv_stream = CsvStream(path, self.data_rows.fields, self.data_rows, self.log_lock)
         except Exception as e:
-            self._set_status(f"No se pudo guardar CSV: {e}")
-            return
+            self.csv_stream = None
+            self._set_status(f"No se pudo abrir CSV, se exportará al detener: {e}")
+
+    def _finish_csv_stream(self):
+        '''Escribe el último bloque y cierra. (ruta, filas) o None si no había sesión en streaming'''
+        stream, self.csv_stream = self.csv_stream, None
+        if stream is None:
+            return None
+        rows = stream.finalize()
+        if stream.error is not None:
+            raise RuntimeError(f"CSV STREAM FAILED: path={stream.path}, rows={rows}, error={stream.error}")
+        return stream.path, rows
 
     # ===================== Gráfica (en vivo) =====================
     def _on_param_changed(self, _value=None):
@@ -948,6 +1040,7 @@ class BendingPage(ctk.CTkFrame):
         if self.plot_x_name == self.plot_y_name:
             self._set_status("X y Y no pueden ser el mismo parámetro.")
             return
+        self._reset_plot_series()
         if _HAS_MPL:
             self._ensure_plot_initialized(force_new_axes=True)
             if not self.live_enabled:
@@ -1024,54 +1117,114 @@ class BendingPage(ctk.CTkFrame):
                 pass
             self.live_job = None
 
+    def _reset_plot_series(self):
+        self.plot_series.reset()
+        self.plot_rows = 0
+
     def _live_plot_tick(self):
+        """Solo procesa las filas nuevas desde el último tick; plot_series se decima sola en corridas largas."""
         self.live_job = None
         if not self.live_enabled or not _HAS_MPL:
             return
+        self._refresh_cycles()
 
-        idx_map = {"tiempo": 0, "velocidad": 1, "angulo": 2, "resistencia": 3}
+        field_map = {"tiempo": "time", "velocidad": "velocity", "angulo": "angle", "resistencia": "resistance"}
         x_name = self.plot_x_name
         y_name = self.plot_y_name
 
-        if x_name == y_name or (x_name not in idx_map) or (y_name not in idx_map):
+        if x_name == y_name or (x_name not in field_map) or (y_name not in field_map):
             self._schedule_live_tick()
             return
 
         with self.log_lock:
-            rows = list(self.data_rows)
-
-        if len(rows) >= 2:
-            xi, yi = idx_map[x_name], idx_map[y_name]
-            valid_pairs = []
-            for r in rows:
-                r = list(r)
-                if len(r) <= max(xi, yi):
-                    continue
-                vx = r[xi]
-                vy = r[yi]
-                if vx is None or vy is None:
-                    continue
-                valid_pairs.append((vx, vy))
-
-            if valid_pairs:
-                x = [p[0] for p in valid_pairs]
-                y = [p[1] for p in valid_pairs]
-            else:
-                x, y = [], []
-        else:
-            x, y = [], []
+            if len(self.data_rows) < self.plot_rows:       # buffer reiniciado (nuevo Submit)
+                self._reset_plot_series()
+            start = self.plot_rows
+            x = self.data_rows.column(field_map[x_name], start)
+            y = self.data_rows.column(field_map[y_name], start)
+            self.plot_rows = len(self.data_rows)
+
+        ok = ~(numpy.isnan(x) | numpy.isnan(y))
+        added = self.plot_series.extend(x[ok], y[ok])
 
         self._ensure_plot_initialized()
 
-        if self._mpl_line is not None:
-            self._mpl_line.set_data(x, y)
-            if len(x) > 0 and len(y) > 0:
+        if self._mpl_line is not None and (added or start == 0):
+            self._mpl_line.set_data(self.plot_series.x, self.plot_series.y)
+            if self.plot_series.size > 0:
                 self._mpl_ax.relim()
                 self._mpl_ax.autoscale_view()
             self._mpl_canvas.draw_idle()
 
         self._schedule_live_tick()
 
+    # ===================== Ciclos =====================
+    @staticmethod
+    def _cycle_table_header() -> str:
+        return (f"{'#':>4} {'t0 (s)':>9} {'T (s)':>7} {'θmáx (°)':>9} {'R pico (Ω)':>12}"
+                f" {'ΔR θmáx (Ω)':>12} {'Área (Ω·°)':>12}\n")
+
+    @staticmethod
+    def _cycle_table_row(c) -> str:
+        return (f"{c.index:>4} {c.t_start:>9.2f} {c.period:>7.2f} {c.max_angle:>9.2f} {c.peak_resistance:>12.2f}"
+                f" {c.delta_r_max_angle:>12.2f} {c.loop_area:>12.1f}\n")
+
+    def _reset_cycle_view(self):
+        self.cycles_shown = 0
+        for values in self.cycle_trend.values():
+            values.clear()
+        if hasattr(self, "cycle_table"):
+            self.cycle_table.configure(state="normal")
+            self.cycle_table.delete("1.0", "end")
+            self.cycle_table.insert("end", self._cycle_table_header())
+            self.cycle_table.configure(state="disabled")
+            self.cycle_count_label.configure(text="0")
+        self._redraw_cycle_trend()
+
+    def _refresh_cycles(self):
+        """Agrega a la tabla y a la tendencia solo los ciclos cerrados desde la última llamada."""
+        with self.log_lock:
+            new = self.cycle_analyzer.cycles[self.cycles_shown:]
+        if not new:
+            return
+        self.cycles_shown += len(new)
+        for c in new:
+            for field, values in self.cycle_trend.items():
+                values.append(getattr(c, field))
+
+        self.cycle_table.configure(state="normal")
+        self.cycle_table.insert("end", "".join(self._cycle_table_row(c) for c in new))
+        self.cycle_table.configure(state="disabled")
+        self.cycle_table.see("end")
+        self.cycle_count_label.configure(text=str(self.cycles_shown))
+        self._redraw_cycle_trend()
+
+    def _on_cycle_trend_changed(self, _value=None):
+        if self._cycle_ax is not None:
+            self._cycle_ax.set_ylabel(self.cycle_trend_combo.get())
+        self._redraw_cycle_trend()
+
+    def _redraw_cycle_trend(self):
+        if not _HAS_MPL or not hasattr(self, "cycle_plot_container"):
+            return
+        if self._cycle_canvas is None:
+            fig = Figure(figsize=(6, 2.4), dpi=100)
+            ax = fig.add_subplot(111)
+            (line,) = ax.plot([], [], marker="o", markersize=3)
+            ax.grid(True, linestyle="--", alpha=0.3)
+            ax.set_xlabel("Ciclo")
+            ax.set_ylabel(self.cycle_trend_combo.get())
+            canvas = FigureCanvasTkAgg(fig, master=self.cycle_plot_container)
+            canvas.get_tk_widget().pack(fill="both", expand=True, padx=6, pady=6)
+            self._cycle_canvas, self._cycle_ax, self._cycle_line = canvas, ax, line
+
+        y = self.cycle_trend[self.CYCLE_TREND_FIELDS[self.cycle_trend_combo.get()]]
+        self._cycle_line.set_data(range(1, len(y) + 1), y)
+        if y:
+            self._cycle_ax.relim()
+            self._cycle_ax.autoscale_view()
+        self._cycle_canvas.draw_idle()
+
     # ===================== UI de lectura =====================
     def _build_read_section(self):
         self.read_frame.pack(fill="x", pady=(12, 6))
@@ -1117,6 +1270,11 @@ class BendingPage(ctk.CTkFrame):
         if self.listening:
             self.stop_event.set()
         self._stop_live_plot()
+        self._stop_ui_tick()
+        try:
+            self._finish_csv_stream()
+        except Exception as e:
+            print(f"[CSV] {e}")
         self.mode_running = False
         self._set_calibrating_ui(False)
         if callable(self.on_back):
@@ -1124,7 +1282,7 @@ class BendingPage(ctk.CTkFrame):
 
     # ===================== presetsBending: lógica =====================
     def _reload_presetsBending(self):
-        self._all_presetsBending = presetsBending.load_all()
+        self._all_presetsBending = BENDING_PRESETS.load_all()
         names = list(self._all_presetsBending.keys())
         if not names:
             names = [""]
@@ -1232,10 +1390,10 @@ class BendingPage(ctk.CTkFrame):
             name = entry.get().strip()
             prompt.destroy()
             try:
-                if presetsBending.is_builtin(name):
+                if BENDING_PRESETS.is_builtin(name):
                     self._set_status("No se puede sobreescribir un preset base. Usa otro nombre.")
                     return
-                presetsBending.save_user_preset(name, store)
+                BENDING_PRESETS.save_user_preset(name, store)
                 self._reload_presetsBending()
                 self.preset_combo.set(name)
                 self._set_status(f"Preset guardado: {name}")
@@ -1260,10 +1418,10 @@ class BendingPage(ctk.CTkFrame):
         if not name:
             self._set_status("Selecciona un preset.")
             return
-        if presetsBending.is_builtin(name):
+        if BENDING_PRESETS.is_builtin(name):
             self._set_status("No se puede eliminar un preset base.")
             return
-        ok = presetsBending.delete_user_preset(name)
+        ok = BENDING_PRESETS.delete_user_preset(name)
         if ok:
             self._reload_presetsBending()
             self._set_status(f"Preset eliminado: {name}")
@@ -0,0 +1,137 @@
+"""
+bending_telemetry.py  –  Parser for the sample reports printed by Bending/BendingCode.py
+Texas A&M University X UADY
+"""
+
+from typing import List, Optional, Tuple
+
+# THE FIRMWARE PRINTS A PYTHON LIST OF KEY / VALUE PAIRS BY DEFAULT:  ['modo', 1, 'velocity', 7, 'angle', 12.3]
+# AFTER THE HOST SENDS FORMAT_COMMAND IT SWITCHES TO THE COMPACT FORM:  T,<modo>,<velocity>,<angle>[,<resistance>]
+# FIRMWARE WITHOUT THE COMMAND KEEPS THE LIST FORM, parse_report ACCEPTS BOTH AT ANY TIME
+FORMAT_COMMAND = "FMT C"
+FORMAT_REPLY = "FMT C"
+COMPACT_PREFIX = "T,"
+
+# STARTING ESTIMATE OF THE TIME BETWEEN TWO REPORTS (THE FIRMWARE'S DEFAULT INTERVAL_MS). ONLY A SEED:
+# ReportInterval REPLACES IT WITH THE INTERVAL OBSERVED FROM ARRIVAL TIMES, SO INTERVAL_MS CAN CHANGE FREELY
+REPORT_INTERVAL_S = 0.150
+
+Report = Tuple[Optional[int], Optional[float], Optional[float], Optional[float]]
+NO_REPORT: Report = (None, None, None, None)
+
+_VELOCITY_KEYS = ("velocity", "velocidad")
+_ANGLE_KEYS = ("angle", "angulo")
+_RESISTANCE_KEYS = ("resistance", "resistencia")
+
+
+def parse_report(line: str) -> Report:
+    """
+    (modo, velocity, angle, resistance) from one report line; resistance is None when the report has none.
+    Returns NO_REPORT for anything that isn't a complete report (status messages, errors, partial lines).
+    Same results as the former ast.literal_eval + dict walk, with a single split instead of building an AST.
+    """
+    if line.startswith(COMPACT_PREFIX):
+        return _parse_compact(line)
+    if not (line.startswith("[") and line.endswith("]")):
+        return NO_REPORT
+
+    tokens = line[1:-1].split(",")
+    fields = {}
+    for i in range(0, len(tokens) - 1, 2):
+        key = tokens[i].strip()
+        # ONLY QUOTED (STRING) KEYS COUNT, A LATER REPEAT OVERWRITES AN EARLIER ONE
+        if len(key) >= 2 and key[0] == key[-1] and key[0] in "'\"":
+            fields[key[1:-1].strip().lower()] = tokens[i + 1].strip()
+
+    try:
+        modo = _to_int(fields["modo"])
+    except (KeyError, TypeError, ValueError):
+        return NO_REPORT
+
+    velocity = _first_float(fields, _VELOCITY_KEYS)
+    angle = _first_float(fields, _ANGLE_KEYS)
+    if velocity is None or angle is None:
+        return NO_REPORT
+    return modo, velocity, angle, _first_float(fields, _RESISTANCE_KEYS)
+
+
+def _parse_compact(line: str) -> Report:
+    parts = line[len(COMPACT_PREFIX):].split(",")
+    try:
+        modo = int(parts[0])
+        velocity = float(parts[1])
+        angle = float(parts[2])
+        resistance = float(parts[3]) if len(parts) > 3 and parts[3].strip() else None
+    except (IndexError, ValueError):
+        return NO_REPORT
+    return modo, velocity, angle, resistance
+
+
+def _first_float(fields, aliases) -> Optional[float]:
+    for key in aliases:
+        if key in fields:
+            return _to_float(fields[key])
+    return None
+
+
+def _to_int(token: str) -> int:
+    '''int() of the literal: 1 -> 1, 1.9 -> 1, '2' -> 2'''
+    value = _number(token)
+    if value is token and any(c in token for c in ".eEn"):
+        return int(float(token))
+    return int(value)
+
+
+def _to_float(token: str) -> Optional[float]:
+    '''Numeric literal or quoted numeric string -> float, anything else -> None'''
+    try:
+        return float(_number(token))
+    except (TypeError, ValueError):
+        return None
+
+
+def _number(token: str):
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "'\"":
+        return token[1:-1].strip()
+    if token in ("True", "False"):
+        return token == "True"
+    if token == "None":
+        return None
+    return token
+
+
+class ReportInterval:
+    """
+    Time between two firmware reports, estimated from arrival times: an EMA of the gaps between consecutive reader
+    batches that held a single report (a batch of several means the reader fell behind, so its arrival time says
+    nothing about the spacing). Gaps far from the current estimate (pauses, one report split over two reads) are
+    ignored, which still lets the estimate follow a changed INTERVAL_MS step by step.
+    """
+
+    def __init__(self, initial_s: float = REPORT_INTERVAL_S, alpha: float = 0.1):
+        self.value = initial_s
+        self.alpha = alpha
+        self._last_single = None        # ARRIVAL TIME OF THE PREVIOUS BATCH IF IT HELD ONE REPORT, ELSE None
+
+    def observe(self, n: int, t_arrival: float) -> float:
+        '''Feed one batch of n reports that arrived at t_arrival; returns the current estimate'''
+        if n == 1 and self._last_single is not None:
+            gap = t_arrival - self._last_single
+            if self.value / 4 <= gap <= self.value * 10:
+                self.value += self.alpha * (gap - self.value)
+        self._last_single = t_arrival if n == 1 else None
+        return self.value
+
+
+def batch_times(n: int, t_now: float, t_last: Optional[float] = None,
+                interval_s: float = REPORT_INTERVAL_S) -> List[float]:
+    """
+    Timestamps for the n reports of one reader batch that arrived at t_now: the last one gets t_now and the earlier
+    ones are back-dated one `interval_s` each, so a reader that fell behind doesn't stack them on one instant.
+    When that would reach back to t_last (the previous batch's last timestamp) they are spread evenly over
+    (t_last, t_now] instead, so times never go backwards.
+    """
+    step = interval_s
+    if n > 1 and t_last is not None and t_now - (n - 1) * step <= t_last:
+        step = (t_now - t_last) / n
+    return [t_now - (n - 1 - i) * step for i in range(n)]
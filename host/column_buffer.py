@@ -0,0 +1,115 @@
+"""
+column_buffer.py  –  Growable NumPy column store for run-length measurements, plus a decimated plot series
+Texas A&M University X UADY
+"""
+
+from typing import Dict, Sequence
+
+import numpy
+
+
+class ColumnBuffer:
+    """
+    Append-only (rows x fields) float array with amortized doubling, for measurements kept for a whole run.
+    Missing values (None) are stored as NaN, so `numpy.isfinite` of a column is its validity mask. Rows below `len` never
+    change once written, so a `rows(start)` view taken under the writer's lock stays consistent after it is released.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int = 4096):
+        if capacity <= 0:
+            raise RuntimeError(f"BUFFER CAPACITY MUST BE POSITIVE: capacity={capacity}")
+        self.fields = tuple(fields)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        self.data = numpy.full((capacity, len(self.fields)), numpy.nan)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, row) -> None:
+        '''One row in field order, None -> NaN'''
+        if self.size == len(self.data):
+            self._grow(self.size + 1)
+        self.data[self.size] = [numpy.nan if v is None else v for v in row]
+        self.size += 1
+
+    def extend(self, block) -> None:
+        block = numpy.asarray(block, dtype=float).reshape(-1, len(self.fields))
+        if self.size + len(block) > len(self.data):
+            self._grow(self.size + len(block))
+        self.data[self.size:self.size + len(block)] = block
+        self.size += len(block)
+
+    def rows(self, start: int = 0) -> numpy.ndarray:
+        '''View of rows [start, len), oldest first'''
+        return self.data[start:self.size]
+
+    def column(self, name: str, start: int = 0) -> numpy.ndarray:
+        return self.data[start:self.size, self.index[name]]
+
+    def clear(self) -> None:
+        self.size = 0
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.data)
+        while capacity < needed:
+            capacity *= 2
+        grown = numpy.full((capacity, len(self.fields)), numpy.nan)
+        grown[:self.size] = self.data[:self.size]
+        self.data = grown
+
+
+class DecimatedSeries:
+    """
+    (x, y) points for a live plot fed in slices. Keeps at most `max_points`: when full, every other stored point is
+    dropped and later slices are taken at twice the stride, so each tick costs O(new samples) however long the run.
+    """
+
+    def __init__(self, max_points: int = 20_000):
+        self.max_points = max_points
+        self.reset()
+
+    def reset(self) -> None:
+        self.stride = 1
+        self.phase = 0              # SAMPLES TO SKIP BEFORE THE NEXT KEPT ONE (KEEPS THE STRIDE ACROSS SLICES)
+        self.size = 0
+        self._x = numpy.empty(self.max_points)
+        self._y = numpy.empty(self.max_points)
+
+    @property
+    def x(self) -> numpy.ndarray:
+        return self._x[:self.size]
+
+    @property
+    def y(self) -> numpy.ndarray:
+        return self._y[:self.size]
+
+    def extend(self, x: numpy.ndarray, y: numpy.ndarray) -> int:
+        '''Append a slice of samples (already filtered to valid pairs). Returns how many points were kept'''
+        kept = 0
+        while len(x):
+            x_s, y_s = x[self.phase::self.stride], y[self.phase::self.stride]
+            room = self.max_points - self.size
+            take = min(room, len(x_s))
+            self._x[self.size:self.size + take] = x_s[:take]
+            self._y[self.size:self.size + take] = y_s[:take]
+            self.size += take
+            kept += take
+
+            if take == len(x_s):
+                self.phase = (self.phase - len(x)) % self.stride
+                break
+            # FULL: HALVE THE STORED POINTS, DOUBLE THE STRIDE, CONTINUE WITH THE REST OF THE SLICE
+            consumed = self.phase + take * self.stride
+            x, y = x[consumed:], y[consumed:]
+            self._halve()
+        return kept
+
+    def _halve(self) -> None:
+        # THE NEXT SAMPLE AT THE OLD STRIDE IS KEPT ONLY IF THE LAST STORED POINT IS DROPPED (EVEN COUNT)
+        self.phase = 0 if self.size % 2 == 0 else self.stride
+        half = (self.size + 1) // 2
+        self._x[:half] = self._x[:self.size:2]
+        self._y[:half] = self._y[:self.size:2]
+        self.size = half
+        self.stride *= 2
@@ -2,56 +2,78 @@ import customtkinter as ctk
 
 from robot import Robot
 from serial_interface import SerialInterface
-import serial.tools.list_ports as list_ports
+from port_watcher import get_port_watcher
 import input_validation as iv
-import presets  # <-- usar el módulo completo
-import pprint
-import os
-import importlib
+from preset_store import CONTROL_PRESETS
 
 
 class ComPortMenu(ctk.CTkFrame):
-    '''A dropdown showing available open COM ports.'''
+    '''A dropdown showing available open COM ports, fed by the background port watcher.'''
+    PLACEHOLDER = "Select a Port"
+
     def __init__(self, master, setPortCallback):
         super().__init__(master, fg_color='transparent')
-
-        def get_com_ports():
-            port_info = ["Select a Port"]
-            for port in list_ports.comports():
-                port_info.append(f"{port.description}")
-            return port_info
-        
-        def update_com_ports():
-            self.port_dropdown.configure(values=get_com_ports())
-
-        def select_port(entry):
-            for port in list_ports.comports():
-                if port.device in entry:
-                    setPortCallback(port.device)
-
-        ports = get_com_ports()
+        self.set_port = setPortCallback
+        self.watcher = get_port_watcher()
+        self.by_label = {}              # dropdown text -> PortInfo (sin volver a enumerar al seleccionar)
+        self.selected = None            # device elegido (a mano o auto-seleccionado)
 
         port_frame = ctk.CTkFrame(self, fg_color='transparent')
         port_frame.pack(pady=20)
 
-        self.port_dropdown = ctk.CTkComboBox(port_frame, values=ports, width=200, command=select_port)
+        self.port_dropdown = ctk.CTkComboBox(port_frame, values=[self.PLACEHOLDER], width=200,
+                                             command=self._select_port)
+        self.port_dropdown.set(self.PLACEHOLDER)
         self.port_dropdown.pack(side="left", padx=(0, 10))
 
-        refresh_button = ctk.CTkButton(port_frame, text="Refresh", command=update_com_ports, width=60)
+        refresh_button = ctk.CTkButton(port_frame, text="Refresh", command=self.watcher.rescan, width=60)
         refresh_button.pack(side="left")
 
+        self.watcher.subscribe(self._on_ports_changed)
 
-class ControlPage(ctk.CTkFrame):
-    '''A page which houses all configuration settings for the test.'''
-    def __init__(self, master, serial_interface: SerialInterface, board: str, on_config_selected, on_back):
-        super().__init__(master)
+    def destroy(self):
+        self.watcher.unsubscribe(self._on_ports_changed)
+        super().destroy()
 
-        # --- Recargar presets de disco cada vez que se entra a esta página ---
+    def _on_ports_changed(self, ports):
+        # HILO DEL WATCHER -> TK
         try:
-            importlib.reload(presets)
+            self.after(0, lambda: self._show_ports(ports))
         except Exception:
             pass
 
+    def _show_ports(self, ports):
+        self.by_label = {p.label: p for p in ports}
+        self.port_dropdown.configure(values=[self.PLACEHOLDER, *self.by_label])
+
+        current = next((p for p in ports if p.device == self.selected), None)
+        if current is None:
+            # SIN SELECCIÓN (O SE DESCONECTÓ): AUTO-SELECCIONAR LA PRIMERA PLACA CONOCIDA POR USB ID
+            current = next((p for p in ports if p.board), None)
+            if current is not None:
+                self._select(current)
+            else:
+                self.selected = None
+                self.port_dropdown.set(self.PLACEHOLDER)
+                return
+        self.port_dropdown.set(current.label)
+
+    def _select_port(self, entry):
+        port = self.by_label.get(entry)
+        if port is not None:
+            self._select(port)
+
+    def _select(self, port):
+        self.selected = port.device
+        self.port_dropdown.set(port.label)
+        self.set_port(port.device)
+
+
+class ControlPage(ctk.CTkFrame):
+    '''A page which houses all configuration settings for the test.'''
+    def __init__(self, master, serial_interface: SerialInterface, board: str, on_config_selected, on_back):
+        super().__init__(master)
+
         # === CONTENEDOR PRINCIPAL CON SCROLL ===
         scrollable = ctk.CTkScrollableFrame(self, fg_color="transparent")
         scrollable.pack(fill="both", expand=True, padx=10, pady=10)
@@ -86,25 +108,6 @@ class ControlPage(ctk.CTkFrame):
                     pass
             return out
 
-        def _presets_path():
-            # Guardar SIEMPRE junto al archivo actual
-            return os.path.join(os.path.dirname(__file__), "presets.py")
-
-        def _save_preset_to_file(new_presets):
-            try:
-                content = "PRESETS = " + pprint.pformat(new_presets, width=100, sort_dicts=False) + "\n"
-                with open(_presets_path(), "w", encoding="utf-8") as f:
-                    f.write(content)
-                # Actualizar el módulo en memoria para esta sesión
-                presets.PRESETS = new_presets
-                try:
-                    importlib.reload(presets)  # por si hay otros lugares que lo lean
-                except Exception:
-                    pass
-                return True, None
-            except Exception as e:
-                return False, str(e)
-
         def save_current_preset():
             name = preset_name_entry.get().strip()
             if not name:
@@ -127,19 +130,17 @@ class ControlPage(ctk.CTkFrame):
             if preset["material"] in ["Choose a Material", "Select a Material"]:
                 preset["material"] = ""
 
-            # Tomar lo actual del módulo y actualizar
-            new_presets = dict(presets.PRESETS)
-            new_presets[name] = preset
-
-            ok, err = _save_preset_to_file(new_presets)
-            if ok:
-                save_status.configure(text=f"Preset '{name}' guardado en presets.py", text_color="green")
-                # refrescar combo local
-                current_values = list(preset_combo.cget("values"))
-                if name not in current_values:
-                    preset_combo.configure(values=[*current_values, name])
-            else:
-                save_status.configure(text=f"Error al guardar: {err}", text_color="red")
+            # Escritura atómica en presets.json (solo JSON, sin reload de módulos)
+            try:
+                CONTROL_PRESETS.save_user_preset(name, preset)
+            except Exception as e:
+                save_status.configure(text=f"Error al guardar: {e}", text_color="red")
+                return
+            save_status.configure(text=f"Preset '{name}' guardado en presets.json", text_color="green")
+            # refrescar combo local
+            current_values = list(preset_combo.cget("values"))
+            if name not in current_values:
+                preset_combo.configure(values=[*current_values, name])
         # ============================================================
 
         # ---------- Resto de tu código (igual que antes) ----------
@@ -680,16 +681,16 @@ class ControlPage(ctk.CTkFrame):
         presets_row = ctk.CTkFrame(presets_frame, fg_color="transparent")
         presets_row.pack(anchor="w", pady=5)
 
-        preset_names = ["Selecciona...", *presets.PRESETS.keys()]  # <-- del módulo recargado
+        preset_names = ["Selecciona...", *CONTROL_PRESETS.load_all().keys()]  # <-- de presets.json (caché por mtime)
         preset_combo = ctk.CTkComboBox(presets_row, values=preset_names, width=220)
         preset_combo.set(preset_names[0])
         preset_combo.pack(side="left", padx=(0, 10))
 
         def apply_preset():
             name = preset_combo.get()
-            if name not in presets.PRESETS:
+            preset = CONTROL_PRESETS.load_all().get(name)
+            if preset is None:
                 return
-            preset = presets.PRESETS[name]
             if "machine" in preset:
                 machine_combo.set(preset["machine"])
                 machine_option_picker(preset["machine"])
@@ -0,0 +1,74 @@
+"""
+csv_stream.py  –  Background incremental CSV export of a growing ColumnBuffer
+Texas A&M University X UADY
+"""
+
+import csv
+import os
+import threading
+from typing import Optional, Sequence
+
+from column_buffer import ColumnBuffer
+
+
+class CsvStream:
+    """
+    Appends the rows added to `buffer` since the last flush to `path`, from its own thread, every `flush_interval_s`.
+    Rows are copied under `lock` (only the new slice) and formatted / written outside it, so neither the reader nor the
+    Tk thread waits on the disk. The file is flushed and fsynced on every pass, so a crash loses at most one interval.
+    `finalize` writes what is left and closes the file; the buffer must not be cleared before it returns.
+    NaN (missing) values are written as empty cells.
+    """
+
+    FLUSH_INTERVAL_S = 1.0
+
+    def __init__(self, path: str, header: Sequence[str], buffer: ColumnBuffer, lock: threading.Lock,
+                 flush_interval_s: float = FLUSH_INTERVAL_S):
+        self.path = path
+        self.buffer = buffer
+        self.lock = lock
+        self.flush_interval_s = flush_interval_s
+        self.written = 0
+        self.error: Optional[Exception] = None
+
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(header)
+        self._file.flush()
+
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            self.write_pending()
+
+    def write_pending(self) -> int:
+        '''Append the rows not yet on disk, returns how many'''
+        with self._write_lock:
+            if self._file.closed or self.error is not None:
+                return 0
+            with self.lock:
+                rows = self.buffer.rows(self.written).copy()
+            if len(rows) == 0:
+                return 0
+            try:
+                self._writer.writerows([["" if v != v else v for v in row] for row in rows.tolist()])
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except Exception as e:
+                self.error = e
+                return 0
+            self.written += len(rows)
+            return len(rows)
+
+    def finalize(self) -> int:
+        '''Stop the timer, write the remaining rows and close the file. Returns the total rows written'''
+        self._stop.set()
+        self._thread.join(timeout=2 * self.flush_interval_s)
+        self.write_pending()
+        with self._write_lock:
+            self._file.close()
+        return self.written
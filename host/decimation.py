@@ -0,0 +1,107 @@
+"""
+decimation.py  –  Min/max-per-pixel reduction of the waveform window
+Texas A&M University X UADY
+"""
+
+from typing import List, Tuple
+
+import numpy
+
+
+
+def minmax_buckets(t: numpy.ndarray, values: numpy.ndarray, bucket_size: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Reduce every `bucket_size` consecutive samples to two points per channel: the bucket min and max, in the order
+    they happened, so spikes survive and the trace keeps its shape. len(t) must be a multiple of bucket_size.
+    :param t: (n,) sample times
+    :param values: (n, channels) samples
+    :return: x (2 * buckets,) with each bucket's first/last time, y (2 * buckets, channels)
+    """
+    buckets = len(t) // bucket_size
+    channels = values.shape[1]
+    blocks = values.reshape(buckets, bucket_size, channels)
+
+    i_min = blocks.argmin(axis=1)
+    i_max = blocks.argmax(axis=1)
+    v_min = numpy.take_along_axis(blocks, i_min[:, None, :], axis=1)[:, 0, :]
+    v_max = numpy.take_along_axis(blocks, i_max[:, None, :], axis=1)[:, 0, :]
+    min_first = i_min <= i_max
+
+    y = numpy.empty((buckets * 2, channels), dtype=values.dtype)
+    y[0::2] = numpy.where(min_first, v_min, v_max)
+    y[1::2] = numpy.where(min_first, v_max, v_min)
+
+    x = numpy.empty(buckets * 2, dtype=t.dtype)
+    x[0::2] = t[0::bucket_size]
+    x[1::2] = t[bucket_size - 1::bucket_size]
+    return x, y
+
+
+class MinMaxDecimator:
+    """
+    Sits between Payload (or its RelativeResistance stage) and WaveformApp. Buckets are aligned to the absolute sample
+    index of the source ring, so a bucket never changes once it is complete: each call only reads and reduces the
+    samples that arrived since the last complete bucket, and the output is at most ~2 points per canvas pixel
+    regardless of the window length.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.bucket_size = 1
+        self.next_abs = 0                       # ABSOLUTE INDEX WHERE THE FIRST NOT-YET-CACHED BUCKET STARTS
+        self.x = numpy.empty(0)
+        self.y = numpy.empty((0, 0))
+
+    def reset(self) -> None:
+        self.key = None
+
+    def window(self, source, keys: List[str], n_window: int, width_px: int) \
+            -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        The last `n_window` samples of `keys` from `source` (anything with samples/col_index/tail_arrays), decimated
+        to roughly `width_px` buckets. Windows that already fit in two points per pixel come back untouched.
+        """
+        bucket_size = max(1, n_window // max(width_px, 1))
+        if bucket_size <= 2:
+            return source.tail_arrays(keys, n_window)
+
+        ring = source.samples
+        key = (tuple(keys), bucket_size)
+        if key != self.key:
+            self.key = key
+            self.bucket_size = bucket_size
+            self.next_abs = 0
+            self.x = numpy.empty(0)
+            self.y = numpy.empty((0, len(keys)))
+
+        # FIRST BUCKET (ABSOLUTE) STILL INSIDE THE WINDOW -> DROP OLDER CACHED BUCKETS
+        window_start = max(ring.total - n_window, ring.total - ring.size, 0)
+        first_abs = -(-window_start // bucket_size) * bucket_size
+        if self.next_abs < first_abs:
+            self.next_abs = first_abs
+            self.x = numpy.empty(0)
+            self.y = numpy.empty((0, len(keys)))
+        else:
+            cached_start = self.next_abs - (len(self.x) // 2) * bucket_size
+            drop = max(0, (first_abs - cached_start) // bucket_size) * 2
+            self.x = self.x[drop:]
+            self.y = self.y[drop:]
+
+        rows, start = ring.since(self.next_abs)
+        cols = [source.col_index[k] for k in keys]
+        t, values = rows[:, 0], rows[:, cols]
+
+        complete = (len(t) // bucket_size) * bucket_size
+        if complete:
+            x_new, y_new = minmax_buckets(t[:complete], values[:complete], bucket_size)
+            self.x = numpy.concatenate((self.x, x_new))
+            self.y = numpy.concatenate((self.y, y_new))
+            self.next_abs = start + complete
+
+        # THE PARTIAL BUCKET AT THE HEAD IS RECOMPUTED EVERY CALL AND NEVER CACHED
+        x_out, y_out = self.x, self.y
+        if complete < len(t):
+            x_tail, y_tail = minmax_buckets(t[complete:], values[complete:], len(t) - complete)
+            x_out = numpy.concatenate((x_out, x_tail))
+            y_out = numpy.concatenate((y_out, y_tail))
+        return x_out, y_out
@@ -0,0 +1,109 @@
+"""
+derived_channels.py  –  ∆R/Ro computed once per sample at ingest, with per-channel baselines
+Texas A&M University X UADY
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+import numpy
+
+from ring_buffer import RingBuffer
+
+
+class RelativeResistance:
+    """
+    Derived-channel stage fed by Payload.push. Keeps ∆R/Ro = (R - Ro) / Ro for every resistive channel in its own ring,
+    aligned sample-for-sample (same `total`) with the Payload ring, so every view reads the precomputed values.
+    Exposes the same read interface as Payload (samples, col_index, tail_arrays, get_most_recent_data).
+
+    Baselines (Ro) are per channel and come from:
+    - set_baseline(): a value typed by the user (one for all channels or one per channel)
+    - tare(): mean of the most recent samples, on demand
+    - the mean of the first `baseline_samples` samples, captured automatically (0 disables it)
+    The latest of set_baseline() / tare() wins; the automatic first-N capture only runs while no baseline exists.
+    Until a baseline exists the derived values are NaN. Changing the baseline recomputes the whole ring.
+    """
+
+    def __init__(self, source: RingBuffer, source_cols: List[int], keys: List[str], baseline_samples: int = 100):
+        self.source = source
+        self.source_cols = source_cols
+        self.keys = list(keys)
+        self.col_index: Dict[str, int] = {key: i + 1 for i, key in enumerate(self.keys)}
+        self.samples = RingBuffer(source.capacity, len(self.keys) + 1)
+
+        self.ro = numpy.full(len(self.keys), numpy.nan)
+        self.baseline_samples = baseline_samples
+        self.baseline_version = 0       # BUMPED ON EVERY BASELINE CHANGE -> VIEWS DROP CACHED RESULTS
+        self._acc = numpy.zeros(len(self.keys))
+        self._acc_n = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return bool(numpy.isfinite(self.ro).any())
+
+    @property
+    def version(self) -> int:
+        return self.samples.total
+
+    def push(self, row: numpy.ndarray) -> None:
+        '''
+        Append one raw row (epoch seconds first) to `source` and its derived row here. Both appends happen under the
+        same lock as tare() / set_baseline(), so a rebuild never sees a source row that is not derived yet
+        '''
+        values = row[self.source_cols]
+        with self._lock:
+            self.source.append(row)
+            if self.baseline_samples and not self.ready:
+                self._acc += values
+                self._acc_n += 1
+                if self._acc_n >= self.baseline_samples:
+                    # THE SOURCE ALREADY HOLDS THIS ROW -> THE REBUILD COVERS IT
+                    self._set_ro(self._acc / self._acc_n)
+                    return
+
+            out = numpy.empty(len(self.keys) + 1)
+            out[0] = row[0]
+            out[1:] = (values - self.ro) / self.ro
+            self.samples.append(out)
+
+    def set_baseline(self, ro) -> None:
+        '''Manual Ro, a scalar for every channel or a sequence with one value per channel'''
+        ro = numpy.broadcast_to(numpy.asarray(ro, dtype=float), self.ro.shape)
+        if (ro <= 0).any():
+            raise RuntimeError(f"BASE RESISTANCE MUST BE POSITIVE: ro={ro}")
+        with self._lock:
+            self._set_ro(ro)
+
+    def tare(self, n: int = None) -> None:
+        '''Take the mean of the last n samples (default `baseline_samples`) as the new per-channel baseline'''
+        n = n or self.baseline_samples or 1
+        with self._lock:
+            block = self.source.tail(n)
+            if len(block) == 0:
+                raise RuntimeError("NO DATA TO TARE")
+            self._set_ro(block[:, self.source_cols].mean(axis=0))
+
+    def _set_ro(self, ro: numpy.ndarray) -> None:
+        ro = numpy.array(ro, dtype=float)
+        ro[ro == 0] = numpy.nan         # DEAD CHANNEL -> NaN INSTEAD OF inf
+        self.ro = ro
+        self.baseline_version += 1
+
+        raw = self.source.tail()
+        self.samples.clear()
+        self.samples.extend(numpy.column_stack((raw[:, 0], (raw[:, self.source_cols] - ro) / ro)))
+        self.samples.total = self.source.total      # KEEP ABSOLUTE INDICES ALIGNED WITH THE SOURCE
+
+    def tail_arrays(self, keys: List[str], n: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        '''Most recent n derived samples as (epoch seconds, n x len(keys) values) arrays, oldest first'''
+        block = self.samples.tail(n)
+        cols = [self.col_index[k] for k in keys]
+        return block[:, 0], block[:, cols]
+
+    def get_most_recent_data(self) -> Dict[str, float]:
+        last = self.samples.tail(1)
+        if len(last) == 0:
+            return {key: 0 for key in self.keys}
+        return dict(zip(self.keys, last[0, 1:].tolist()))
@@ -1,8 +1,12 @@
+from functools import lru_cache
 from typing import Dict, Any, Tuple, Optional, List
 import numpy
 import re
 import warnings
+
+import program_configrations
 from payload import Payload
+from sensor_layout import LayoutMap, compile_named_layout, fill_gaps
 
 
 # Patrón típico de las columnas sensoriales: "1-3p (6002)"
@@ -14,174 +18,73 @@ class Heatmap:
     - Filtra columnas no sensoriales (p. ej., 'Scan') antes del mapeo (opción 1).
     - Tolera llaves desconocidas sin romper (opción 2) y las reporta vía warnings.
       Si deseas el comportamiento anterior (romper), usa strict=True.
+    - La validación del encabezado se hace una vez por sesión (check_header, en caché por encabezado); cada frame solo
+      indexa la última fila numérica del payload, sin print, regex ni warnings.
     """
 
     def __init__(self, payload: Payload, ro: Optional[float] = None, *, strict: bool = False, use_regex_filter: bool = True):
         """
-        :param payload: instancia de Payload (usa get_most_recent_data()).
-        :param ro: resistencia base opcional para normalizar (derivada).
+        :param payload: instancia de Payload (lee su última fila en cada cálculo); también acepta payload.relative para
+                        ∆R/Ro ya calculado por canal en la ingesta, o cualquier objeto con get_most_recent_data().
+                        Conviene reutilizar la instancia entre frames: guarda los índices de columna ya resueltos.
+        :param ro: resistencia base global opcional para normalizar (derivada). Innecesaria con payload.relative.
         :param strict: si True, lanza error si existen llaves desconocidas.
         :param use_regex_filter: si True, aplica filtro por regex de clave sensorial además del filtrado por switcher.
         """
-        self.payload_entree = payload.get_most_recent_data()
+        self.payload = payload
+        self.payload_entree: Optional[Dict[str, Any]] = None    # FIJADO CON set_payload_entree, TIENE PRIORIDAD
         self.ro = ro
         self.strict = strict
         self.use_regex_filter = use_regex_filter
+        self._columns: Dict[Tuple[str, ...], numpy.ndarray] = {}
 
     # Calculating the points for the heatmap from the diagonal resistance values for like the 5x41 materials
     # -> CAN HAVE DIFFERENT HORIZONTAL WIDTH BUT SAME OVERALL STRUCTURE OF THE 5x41 and SAME HEIGHT/DEPTH OF 5
+    # THE GEOMETRY IS COMPILED ONCE PER SET OF COORDS INTO A LayoutMap (compile_diagonal_map), EACH FRAME IS THE SAME
+    # SPARSE GATHER + GAP FILL USED BY EVERY OTHER BOARD LAYOUT
     def calc_pts_diagonal(self, switcher: Dict[str, Tuple]) -> numpy.ndarray:
-        mapped_pts: Dict[Tuple[int, int], float] = self._mapping_coord(switcher)
-        width_list = [k[0] for k in mapped_pts]
-        if width_list is None:
-            max_width = 0
-        else:
-            max_width = max(width_list)
-        max_height = 4
-
-        # OUTPUT 2D MATRIX WILL HAVE THE DIMENSION: max_width*2 (to account for the half points in the intersections)
-        # OUTPUTS WILL BE MAPPED AT TWICE THE COLUMN DIMENSION AND REFLECTED ONCE AT THE PT TO THE LEFT, EXCLUDING
-        # THE OUTER MOST PTS
-        # THE EXCEPTION CASE, SHIFT RIGHT: (0,0) -> (0,0),(0,1);
-        # GENERAL CASE, SHIFT LEFT: (0,2) -> (0,3)(0,4) & (0,3) -> (0,6) (0,5)
-        # x max_height
-        depth = max_height
-        rows = depth + 1
-        cols = max_width * 2 + 1
-        output_matrix = numpy.full((rows, cols), -1.0, dtype=float)
-
-        real_vals = sorted({r for (r, _) in mapped_pts})
-
-        # THE ITERATION IS BASED ON THE DIAGONAL LINES FROM TOP LEFT (OF NORMAL) TO BOTTOM RIGHT (OF PRIME)
-        for norm_num in real_vals:  # 1, 2, ..., max_width
-            prim_num = norm_num + (max_height // 2)
-            # LOWER BOUND IS PRIME_NUM >= 5 b/c STARTS @ 1 NOT 0
-            # BASE CASE INTERCEPTS
-            if (norm_num < prim_num) and (prim_num >= max_height + 1) and (norm_num <= max_width - max_height):
-                for i in range(max_height + 1):
-                    key_a = (norm_num, prim_num)
-                    key_b = (norm_num + i, prim_num - 4 + i)
-
-                    if key_a in mapped_pts and key_b in mapped_pts:
-                        output_matrix[i][(norm_num + i) + norm_num] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-                    else:
-                        raise RuntimeError(f"HEATMAP CALC. ERROR, KEY DOESN'T EXIST: KEY_A= {key_a}, KEY_B= {key_b}")
-
-            # EDGE CASE NOT THE OUTERMOST
-            elif (norm_num < prim_num) and (prim_num <= max_width):
-
-                # RIGHT SIDE: 18-19
-                if (max_width - norm_num) < norm_num:
-                    itr = max_width - norm_num + 1
-                    for i in range(itr):
-                        key_a = (norm_num, prim_num)
-                        key_b = (norm_num + i, prim_num - 4 + i)
-
-                        output_matrix[i][(norm_num + i) + norm_num] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-                # LEFT SIDE
-                else:
-                    itr = norm_num + (max_height // 2)
-
-                    # GO FROM BOTTOM TO TOP INSTEAD
-                    for j in range(itr):
-                        i = max_height - j
-                        key_a = (norm_num, prim_num)
-                        key_b = (norm_num + i, prim_num - 4 + i)
-
-                        output_matrix[i][(norm_num + i) + norm_num] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-        # FOR THE EDGE CASES
-        # PTS W/ NO INTERSECTIONS
-        # 2-4'
-        k = 2
-        key_a = (k, k + (max_height // 2))
-        output_matrix[0][k * 2] = mapped_pts[key_a]
-
-        # 20-18'
-        k = max_width - 1
-        key_a = (k, k - (max_height // 2))
-        output_matrix[0][k * 2] = mapped_pts[key_a]
-
-        # 2-4'
-        k = 2
-        key_a = (k, k + (max_height // 2))
-        output_matrix[max_height][k * 2] = mapped_pts[key_a]
-
-        # 18-20'
-        k = max_width - 1
-        key_a = (k - (max_height // 2), k)
-        output_matrix[max_height][k * 2] = mapped_pts[key_a]
-
-        # 1-1'
-        k = 1
-        key_a = (1, 1)
-        key_b = (1, 1 + (max_height // 2))
-        output_matrix[0][k * 2] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-        # 3-1'
-        k = 1
-        key_a = (1, 1)
-        key_b = (1, 3)
-        output_matrix[max_height][k * 2] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-        # ONLY IF THE FULL CONFIGURATION OF SENSOR SINCE THIS IS THE ONLY VERTICAL COMPONENTS
-        if max_width == 22:
-            # 21-19'
-            k = max_width
-            key_a = (k, k - (max_height // 2))
-            key_b = (k, k)
-            output_matrix[0][k * 2] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-            # 19-21'
-            k = max_width
-            key_a = (k - (max_height // 2), k)
-            key_b = (k, k)
-            output_matrix[max_height][k * 2] = (mapped_pts[key_a] + mapped_pts[key_b]) / 2
-
-        # FILL IN THE WHITESPACE BETWEEN EACH OF THE PTS W/ THE SURROUNDING AVERAGES
-        baseline = output_matrix.copy()
-        rows, cols = baseline.shape
-        for y in range(rows):
-            for x in range(cols):
-                if baseline[y, x] == -1:
-                    neigh_vals = []
-
-                    # top
-                    if y > 0 and baseline[y - 1, x] != -1:
-                        neigh_vals.append(baseline[y - 1, x])
-                    # bottom
-                    if y < rows - 1 and baseline[y + 1, x] != -1:
-                        neigh_vals.append(baseline[y + 1, x])
-                    # left
-                    if x > 0 and baseline[y, x - 1] != -1:
-                        neigh_vals.append(baseline[y, x - 1])
-                    # right
-                    if x < cols - 1 and baseline[y, x + 1] != -1:
-                        neigh_vals.append(baseline[y, x + 1])
-
-                    if neigh_vals:
-                        output_matrix[y, x] = sum(neigh_vals) / len(neigh_vals)
-
-        return output_matrix
-
-    def _filter_payload_keys(self, switcher: Dict[str, Tuple]) -> List[str]:
-        """
-        Opción 1 (filtrado previo):
-        - Mantén solo llaves que estén en el switcher (whitelist).
-        - Si use_regex_filter=True, ignora de entrada las que no parecen sensoriales por regex.
-        Retorna la lista de llaves a considerar para el mapeo.
-        """
-        keys = list(self.payload_entree.keys())
-
-        # Si se activa regex, filtramos a priori por patrón sensorial
-        if self.use_regex_filter:
-            keys = [k for k in keys if (k in switcher) or SENSOR_KEY_REGEX.match(k)]
-
-        # Al final, conservamos solo las que estén realmente en el switcher (whitelist estricta para el mapeo)
-        keys = [k for k in keys if k in switcher]
-
-        return keys
+        check = self._check(switcher)
+        layout = compile_diagonal_map(check.coords)
+        return layout.apply(self._normalize(self._latest(check.names)))
+
+    # ANY BOARD: layout / names AS RETURNED BY resolve_layout; CHANNELS MISSING FROM THE PAYLOAD READ AS NaN
+    def calc_pts_layout(self, layout: LayoutMap, names: Tuple[str, ...]) -> numpy.ndarray:
+        return layout.apply(self._normalize(self._latest(names)))
+
+    def _header(self) -> Tuple[str, ...]:
+        if self.payload_entree is not None:
+            return tuple(self.payload_entree)
+        if hasattr(self.payload, "keys"):
+            return tuple(self.payload.keys)
+        return tuple(self.payload.get_most_recent_data())
+
+    def _check(self, switcher: Dict[str, Tuple]) -> "HeaderCheck":
+        check = check_header(self._header(), tuple(switcher.items()), self.use_regex_filter)
+        if self.strict and check.unknown:
+            # Comportamiento anterior (romper)
+            raise RuntimeError(
+                f"Unknown keys found (strict mode): {list(check.unknown)}. "
+                f"The payload header must match the switcher."
+            )
+        return check
+
+    def _latest(self, names: Tuple[str, ...]) -> numpy.ndarray:
+        '''Most recent value of each key in `names` (NaN when absent, 0 before the first sample, as the payload does)'''
+        if self.payload_entree is None and hasattr(self.payload, "samples"):
+            cols = self._columns.get(names)
+            if cols is None:
+                index = self.payload.col_index
+                cols = self._columns[names] = numpy.array([index.get(k, -1) for k in names], dtype=numpy.intp)
+            row = self.payload.samples.tail(1)
+            if len(row) == 0:
+                return numpy.zeros(len(names))
+            return numpy.where(cols >= 0, row[0, cols], numpy.nan)
+
+        entree = self.payload_entree if self.payload_entree is not None else self.payload.get_most_recent_data()
+        return numpy.array([entree.get(k, numpy.nan) for k in names], dtype=float)
+
+    def _normalize(self, values: numpy.ndarray) -> numpy.ndarray:
+        return values if self.ro is None else (values - self.ro) / self.ro
 
     # RETURNS THE mapping according to the SWITCHER PARAMETER configuration for each col name
     # like 6001 (ohm) = 1 - 1p or (1,1)
@@ -190,56 +93,11 @@ class Heatmap:
     def _mapping_coord(self, switcher: Dict[str, Tuple]) -> Dict[Tuple[int, int], float]:
         """
         Opción 1: filtra antes (whitelist + regex opcional).
-        Opción 2: tolera llaves desconocidas (reporta por warning); si strict=True, lanza excepción.
+        Opción 2: tolera llaves desconocidas (reporta por warning una vez por encabezado); si strict=True, lanza excepción.
         """
-        map_result: Dict[Tuple[int, int], float] = {}
-        print(switcher)
-        print(self.payload_entree.keys())
-        # --- Filtrado previo (Opción 1) ---
-        filtered_payload_keys = self._filter_payload_keys(switcher)
-
-        # Para reporte (Opción 2): todo lo que llegó y no está en switcher
-        payload_keys_set = set(self.payload_entree.keys())
-        switcher_keys_set = set(switcher.keys())
-        unknown_keys = sorted(list(payload_keys_set - switcher_keys_set))
-
-        # Si hay desconocidas, decide comportamiento según strict
-        if unknown_keys:
-            msg = (
-                f"[Heatmap] Se ignorarán {len(unknown_keys)} llaves desconocidas (p. ej., columnas auxiliares): "
-                f"{unknown_keys[:10]}{' ...' if len(unknown_keys) > 10 else ''}\n"
-                f"Sugerencia: verifica tu export o actualiza el switcher si corresponde."
-            )
-            if self.strict:
-                # Comportamiento anterior (romper)
-                raise RuntimeError(
-                    f"Unknown keys found (strict mode): {unknown_keys}. "
-                    f"The payload header must match the switcher."
-                )
-            else:
-                warnings.warn(msg)
-
-        # --- Mapeo tolerante (Opción 2) ---
-        for key in filtered_payload_keys:
-            convert_key: Optional[Tuple[int, int]] = switcher.get(key)
-            if convert_key is None:
-                # No debería ocurrir tras el filtrado por whitelist, pero lo ponemos por seguridad.
-                warnings.warn(f"[Heatmap] Llave '{key}' filtrada pero no encontrada en switcher. Se omite.")
-                continue
-
-            val = self.payload_entree[key]
-            if self.ro is None:
-                map_result[convert_key] = val
-            else:
-                map_result[convert_key] = (val - self.ro) / self.ro
-
-        if not map_result:
-            raise RuntimeError(
-                "No se pudo mapear ninguna clave válida. "
-                "Revisa que el switcher corresponda al archivo y que el payload tenga datos."
-            )
-
-        return map_result
+        check = self._check(switcher)
+        values = self._normalize(self._latest(check.names))
+        return dict(zip(check.coords, values.tolist()))
 
     # UPDATE THE HEATMAP'S PAYLOAD ENTRE that's being used
     def set_payload_entree(self, payload_entree: Dict[str, Any]):
@@ -251,7 +109,7 @@ class Heatmap:
         Devuelve un dict con: faltantes en payload, desconocidas en payload, y coincidencias.
         Útil para diagnóstico rápido.
         """
-        payload_keys = set(self.payload_entree.keys())
+        payload_keys = set(self._header())
         switcher_keys = set(switcher.keys())
 
         unknown = sorted(list(payload_keys - switcher_keys))
@@ -263,3 +121,239 @@ class Heatmap:
             "missing_from_payload": missing,
             "matched": common,
         }
+
+
+class HeaderCheck:
+    """
+    Result of validating one payload header against a switcher: the sensor keys to read (`names`) and the diagonal
+    coord each one maps to (`coords`, sorted, same order), plus the header keys the switcher doesn't know (`unknown`).
+    """
+
+    def __init__(self, names: Tuple[str, ...], coords: Tuple[Tuple[int, int], ...], unknown: Tuple[str, ...]):
+        self.names = names
+        self.coords = coords
+        self.unknown = unknown
+
+
+@lru_cache(maxsize=None)
+def check_header(header: Tuple[str, ...], switcher_items: Tuple[Tuple[str, Tuple[int, int]], ...],
+                 use_regex_filter: bool = True) -> HeaderCheck:
+    """
+    Header validation done once per (header, switcher): filtering (whitelist + optional regex), the unknown-key
+    warning and the key -> coord resolution. Heatmap looks the result up on every frame.
+    """
+    switcher = dict(switcher_items)
+
+    # --- Filtrado previo (Opción 1) ---
+    keys = list(header)
+    if use_regex_filter:
+        keys = [k for k in keys if (k in switcher) or SENSOR_KEY_REGEX.match(k)]
+    keys = [k for k in keys if k in switcher]
+
+    # Para reporte (Opción 2): todo lo que llegó y no está en switcher
+    unknown_keys = sorted(set(header) - set(switcher))
+    if unknown_keys:
+        warnings.warn(
+            f"[Heatmap] Se ignorarán {len(unknown_keys)} llaves desconocidas (p. ej., columnas auxiliares): "
+            f"{unknown_keys[:10]}{' ...' if len(unknown_keys) > 10 else ''}\n"
+            f"Sugerencia: verifica tu export o actualiza el switcher si corresponde."
+        )
+
+    if not keys:
+        raise RuntimeError(
+            "No se pudo mapear ninguna clave válida. "
+            "Revisa que el switcher corresponda al archivo y que el payload tenga datos."
+        )
+
+    by_coord = {switcher[k]: k for k in keys}
+    coords = tuple(sorted(by_coord))
+    return HeaderCheck(tuple(by_coord[c] for c in coords), coords, tuple(unknown_keys))
+
+
+def layout_inputs(keys: List[str], block: numpy.ndarray,
+                  switcher: Dict[str, Tuple] = None) -> Tuple[LayoutMap, numpy.ndarray]:
+    """
+    Batch counterpart of Heatmap.calc_pts_diagonal / calc_pts_layout: for a (time x channels) block whose columns are
+    named by `keys`, the layout map and the block's columns in its input order, so `layout.apply(values)` is the
+    (time x rows x cols) tensor in one pass. Columns the layout doesn't use are dropped. With a switcher the diagonal
+    geometry is used, otherwise the layout is picked from the header (resolve_layout). Each frame matches the
+    single-frame mapping on the same values.
+    """
+    if switcher is not None:
+        column = {switcher[k]: i for i, k in enumerate(keys) if k in switcher}
+        if not column:
+            raise RuntimeError("No se pudo mapear ninguna clave válida. Revisa que el switcher corresponda al archivo.")
+        layout = compile_diagonal_map(tuple(sorted(column)))
+        cols = [column[c] for c in layout.keys]
+    else:
+        resolved = resolve_layout(tuple(keys))
+        if resolved is None:
+            raise RuntimeError("Ningún layout de heatmap corresponde a las columnas del archivo.")
+        layout, names = resolved
+        position = {k: i for i, k in enumerate(keys)}
+        cols = [position[k] for k in names]
+    return layout, numpy.asarray(block, dtype=float)[:, cols]
+
+
+@lru_cache(maxsize=None)
+def resolve_layout(keys: Tuple[str, ...]) -> Optional[Tuple[LayoutMap, Tuple[str, ...]]]:
+    """
+    Heatmap layout for a header, compiled once per header: the diagonal material when any S5X41 channel is present,
+    otherwise the program_configrations.HEATMAP_LAYOUTS entry using the most channels among those whose channels are
+    all in the header (a MUX10 header also contains every MUX08 channel).
+    Returns the map and, for each of its inputs, the header key that feeds it; None when no layout fits.
+    """
+    switcher = program_configrations.S5X41_SWITCHER
+    present = {switcher[k]: k for k in keys if k in switcher}
+    if present:
+        layout = compile_diagonal_map(tuple(sorted(present)))
+        return layout, tuple(present[c] for c in layout.keys)
+
+    header = set(keys)
+    fits = [name for name, description in program_configrations.HEATMAP_LAYOUTS.items()
+            if header.issuperset(description["segments"])]
+    if not fits:
+        return None
+    layout = compile_named_layout(max(fits, key=lambda n: len(program_configrations.HEATMAP_LAYOUTS[n]["segments"])))
+    return layout, tuple(layout.keys)
+
+
+class DiagonalPlan:
+    """
+    Precomputed scatter for the diagonal layout: output cell `cells[k]` (flat index) gets
+    (values[idx_a[k]] + values[idx_b[k]]) * weights[k], where `values` follows the order of `coords`.
+    Cells fed by a single line use idx_b == idx_a. compile_diagonal_map turns it into the LayoutMap that applies it.
+    """
+
+    def __init__(self, coords: Tuple[Tuple[int, int], ...], shape: Tuple[int, int], pair_a: numpy.ndarray,
+                 pair_b: numpy.ndarray):
+        self.coords = coords
+        self.shape = shape
+        self.cells = numpy.flatnonzero(pair_a >= 0)
+        self.idx_a = pair_a.ravel()[self.cells]
+        self.idx_b = pair_b.ravel()[self.cells]
+        self.weights = numpy.full(self.cells.size, 0.5)
+
+
+@lru_cache(maxsize=None)
+def compile_diagonal_plan(coords: Tuple[Tuple[int, int], ...]) -> DiagonalPlan:
+    """
+    Walk the diagonal geometry once for the given (sorted) mapped coords and record, per output cell, which pair of
+    lines is averaged. Same traversal (and same overwrite order / errors) as the original calc_pts_diagonal.
+    """
+    index = {c: i for i, c in enumerate(coords)}
+    width_list = [k[0] for k in coords]
+    if width_list is None:
+        max_width = 0
+    else:
+        max_width = max(width_list)
+    max_height = 4
+
+    # OUTPUT 2D MATRIX WILL HAVE THE DIMENSION: max_width*2 (to account for the half points in the intersections)
+    # OUTPUTS WILL BE MAPPED AT TWICE THE COLUMN DIMENSION AND REFLECTED ONCE AT THE PT TO THE LEFT, EXCLUDING
+    # THE OUTER MOST PTS
+    # THE EXCEPTION CASE, SHIFT RIGHT: (0,0) -> (0,0),(0,1);
+    # GENERAL CASE, SHIFT LEFT: (0,2) -> (0,3)(0,4) & (0,3) -> (0,6) (0,5)
+    # x max_height
+    depth = max_height
+    rows = depth + 1
+    cols = max_width * 2 + 1
+    pair_a = numpy.full((rows, cols), -1, dtype=numpy.intp)
+    pair_b = numpy.full((rows, cols), -1, dtype=numpy.intp)
+
+    def put(y, x, key_a, key_b=None):
+        pair_a[y][x] = index[key_a]
+        pair_b[y][x] = index[key_a if key_b is None else key_b]
+
+    real_vals = sorted({r for (r, _) in coords})
+
+    # THE ITERATION IS BASED ON THE DIAGONAL LINES FROM TOP LEFT (OF NORMAL) TO BOTTOM RIGHT (OF PRIME)
+    for norm_num in real_vals:  # 1, 2, ..., max_width
+        prim_num = norm_num + (max_height // 2)
+        # LOWER BOUND IS PRIME_NUM >= 5 b/c STARTS @ 1 NOT 0
+        # BASE CASE INTERCEPTS
+        if (norm_num < prim_num) and (prim_num >= max_height + 1) and (norm_num <= max_width - max_height):
+            for i in range(max_height + 1):
+                key_a = (norm_num, prim_num)
+                key_b = (norm_num + i, prim_num - 4 + i)
+
+                if key_a in index and key_b in index:
+                    put(i, (norm_num + i) + norm_num, key_a, key_b)
+                else:
+                    raise RuntimeError(f"HEATMAP CALC. ERROR, KEY DOESN'T EXIST: KEY_A= {key_a}, KEY_B= {key_b}")
+
+        # EDGE CASE NOT THE OUTERMOST
+        elif (norm_num < prim_num) and (prim_num <= max_width):
+
+            # RIGHT SIDE: 18-19
+            if (max_width - norm_num) < norm_num:
+                itr = max_width - norm_num + 1
+                for i in range(itr):
+                    key_a = (norm_num, prim_num)
+                    key_b = (norm_num + i, prim_num - 4 + i)
+
+                    put(i, (norm_num + i) + norm_num, key_a, key_b)
+
+            # LEFT SIDE
+            else:
+                itr = norm_num + (max_height // 2)
+
+                # GO FROM BOTTOM TO TOP INSTEAD
+                for j in range(itr):
+                    i = max_height - j
+                    key_a = (norm_num, prim_num)
+                    key_b = (norm_num + i, prim_num - 4 + i)
+
+                    put(i, (norm_num + i) + norm_num, key_a, key_b)
+
+    # FOR THE EDGE CASES
+    # PTS W/ NO INTERSECTIONS
+    # 2-4'
+    k = 2
+    put(0, k * 2, (k, k + (max_height // 2)))
+
+    # 20-18'
+    k = max_width - 1
+    put(0, k * 2, (k, k - (max_height // 2)))
+
+    # 2-4'
+    k = 2
+    put(max_height, k * 2, (k, k + (max_height // 2)))
+
+    # 18-20'
+    k = max_width - 1
+    put(max_height, k * 2, (k - (max_height // 2), k))
+
+    # 1-1'
+    k = 1
+    put(0, k * 2, (1, 1), (1, 1 + (max_height // 2)))
+
+    # 3-1'
+    k = 1
+    put(max_height, k * 2, (1, 1), (1, 3))
+
+    # ONLY IF THE FULL CONFIGURATION OF SENSOR SINCE THIS IS THE ONLY VERTICAL COMPONENTS
+    if max_width == 22:
+        # 21-19'
+        k = max_width
+        put(0, k * 2, (k, k - (max_height // 2)), (k, k))
+
+        # 19-21'
+        k = max_width
+        put(max_height, k * 2, (k - (max_height // 2), k), (k, k))
+
+    return DiagonalPlan(coords, (rows, cols), pair_a, pair_b)
+
+
+@lru_cache(maxsize=None)
+def compile_diagonal_map(coords: Tuple[Tuple[int, int], ...]) -> LayoutMap:
+    """
+    The diagonal plan as a LayoutMap over `coords`: crossed cells average their pair of lines (a line alone keeps
+    its value), then fill_gaps runs on the result. Halving each input before the sum is exact, so frames are
+    bit-identical to the original per-cell code.
+    """
+    plan = compile_diagonal_plan(coords)
+    taps: List[Dict[int, float]] = [{} for _ in range(plan.shape[0] * plan.shape[1])]
+    for cell, a, b in zip(plan.cells, plan.idx_a, plan.idx_b):
+        taps[cell] = {int(a): 1.0} if a == b else {int(a): 0.5, int(b): 0.5}
+    return LayoutMap(coords, plan.shape, taps)
@@ -1,18 +1,18 @@
 # heatmap_ctk_refactored.py
 # pip install customtkinter
-import threading
 import time
+from datetime import datetime, timezone
+from tkinter import filedialog
 
 import customtkinter as ctk
 import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-import program_configrations
-
 from multi_display import WaveformApp
-from payload import Payload
-from heatmap import Heatmap
+from payload import Payload, read_output_csv
+from heatmap import Heatmap, layout_inputs, resolve_layout
+from sensor_layout import compile_upsampler
 
 #  ─── CustomTkinter Setup ─────────────────────────────────────────────────────
 ctk.set_appearance_mode("light")
@@ -20,66 +20,270 @@ ctk.set_default_color_theme("blue")
 
 
 class HeatmapApp(ctk.CTkFrame):
+    PLAY_TICK_MS = 40
+    PLAY_SPEEDS = {"0.5×": 0.5, "1×": 1, "2×": 2, "5×": 5, "10×": 10, "50×": 50}
+    SMOOTHING = {"Blocky": None, "Bilinear": "bilinear", "Bicubic": "bicubic"}
+    UPSAMPLE = 10               # OUTPUT PIXELS PER CELL (EACH AXIS) WHEN SMOOTHING, 5x43 -> 50x430
+
     def __init__(self, master, payload: Payload, waveform: WaveformApp = None):
         super().__init__(master)
         self.payload = payload
         self.waveform = waveform
+        # SENSOR GEOMETRY FOR THIS BOARD'S HEADER (DIAGONAL 5x41, MUX08, MUX10, ...), None WHEN NO LAYOUT FITS
+        self.layout = resolve_layout(tuple(payload.get_channels()))
+        self.mappers = {}           # Heatmap PER SOURCE (RAW / ∆R/Ro), KEPT SO THEIR COLUMN LOOKUPS ARE RESOLVED ONCE
+
+        # REVIEW MODE: (time x rows x cols) TENSOR OVER A WINDOW, SCRUBBED / PLAYED INSTEAD OF THE LATEST SCAN
+        self.review_frames = None
+        self.review_layout = None
+        self.review_values = None   # (time x layout inputs), FEEDS THE UPSAMPLER WITHOUT KEEPING A FINE TENSOR
+        self.review_times = None
+        self.review_idx = 0
+        self.play_job = None
+        self.play_clock = None      # (perf_counter at start, review time at start)
 
         # Controls frame with Refresh button
         ctrl = ctk.CTkFrame(self)
         ctrl.pack(fill="x", pady=6, padx=6)
-        self.refresh_btn = ctk.CTkButton(ctrl, text="Refresh Heatmap", command=self.draw_heatmap)
+        self.refresh_btn = ctk.CTkButton(ctrl, text="Refresh Heatmap", command=lambda: self.draw_heatmap(force=True))
         self.refresh_btn.pack(side="right")
+        self.smooth_sel = ctk.CTkComboBox(ctrl, values=list(self.SMOOTHING), width=100,
+                                          command=lambda _: self.draw_heatmap(force=True))
+        self.smooth_sel.set("Blocky")
+        self.smooth_sel.pack(side="right", padx=6)
 
-        # Matplotlib figure and axis setup
+        self.mode_sel = ctk.CTkSegmentedButton(ctrl, values=["Live", "Review"], command=self._on_mode)
+        self.mode_sel.set("Live")
+        self.mode_sel.pack(side="left", padx=(0, 8))
+        ctk.CTkButton(ctrl, text="Load Window", width=100, command=self.load_payload_window).pack(side="left", padx=4)
+        ctk.CTkButton(ctrl, text="Open CSV…", width=90, command=self.load_csv).pack(side="left", padx=4)
+        ctk.CTkButton(ctrl, text="Export .npz", width=90, command=self.export_npz).pack(side="left", padx=4)
+
+        # Playback row (scrub + play at N×)
+        play = ctk.CTkFrame(self, fg_color="transparent")
+        play.pack(fill="x", padx=6)
+        self.play_btn = ctk.CTkButton(play, text="▶", width=40, command=self._toggle_play)
+        self.play_btn.pack(side="left")
+        self.speed_sel = ctk.CTkComboBox(play, values=list(self.PLAY_SPEEDS), width=80,
+                                         command=lambda _: self._restart_clock())
+        self.speed_sel.set("1×")
+        self.speed_sel.pack(side="left", padx=6)
+        self.scrub = ctk.CTkSlider(play, from_=0, to=1, number_of_steps=1, command=self._on_scrub)
+        self.scrub.set(0)
+        self.scrub.pack(side="left", fill="x", expand=True, padx=6)
+        self.frame_label = ctk.CTkLabel(play, text="No review data", width=200)
+        self.frame_label.pack(side="left")
+
+        # Matplotlib figure and axis setup; the image / colorbar / twin axes persist, updates only call set_data
         self.fig, self.ax = plt.subplots(figsize=(10, 2.5), dpi=100)
-        self.fig.tight_layout()
+        self.image = None
+        self.image_shape = None
+        self.message = None
+        self.drawn_key = None
         canvas = FigureCanvasTkAgg(self.fig, master=self)
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=6, pady=(0, 6))
         self.canvas = canvas
         self.draw_heatmap()
 
-        threading.Thread(target=self.auto_update, daemon=True).start()
+    def draw_heatmap(self, force: bool = False):
+        '''Live: heatmap of the latest scan. Skipped when nothing changed since the last draw unless forced'''
+        if self.mode_sel.get() == "Review":
+            self._show_review_frame(force)
+            return
+
+        key = ("live", self.payload.version, self.payload.relative.baseline_version)
+        if key == self.drawn_key and not force:
+            return
+        self.drawn_key = key
+
+        if self.layout is None:
+            self._show_message("No heatmap layout for this board.")
+            return
+        if not self.payload.version:
+            # No samples yet; prompt user
+            self._show_message("No data available.")
+            return
+
+        # Compute matrix and plot; ∆R/Ro comes precomputed from the ingest stage once a baseline exists
+        source = self.payload.relative if self.payload.relative.ready else self.payload
+        hm = self.mappers.get(id(source))
+        if hm is None or hm.payload is not source:
+            hm = self.mappers[id(source)] = Heatmap(source)
+        layout, names = self.layout
+        mat = hm.calc_pts_layout(self._mapper(layout), names)
+        self._show_matrix(mat, layout.shape)
+
+    def _mapper(self, layout):
+        '''The layout itself, or its upsampler (weights compiled once per layout / size / method) when smoothing'''
+        method = self.SMOOTHING.get(self.smooth_sel.get())
+        if method is None:
+            return layout
+        rows, cols = layout.shape
+        return compile_upsampler(layout, (rows * self.UPSAMPLE, cols * self.UPSAMPLE), method)
 
-    def draw_heatmap(self):
+    def _build_figure(self, grid, shape):
+        '''Axes, image, colorbar and tick decorations, created once per (cell grid, image) shape'''
         self.fig.clf()
         self.ax = self.fig.add_subplot(111)
+        rows, cols = grid
+        # EXTENT PUTS CELL j ON [j, j + 1] WITH ROW 0 ON TOP, SAME GRID AS THE FORMER sns.heatmap,
+        # AN UPSAMPLED IMAGE SPANS THE SAME EXTENT SO THE TICKS STAY ON THE CELLS
+        self.image = self.ax.imshow(numpy.zeros(shape), cmap="jet", aspect="auto", interpolation="nearest",
+                                    extent=(0, cols, rows, 0))
+        self.fig.colorbar(self.image, ax=self.ax)
+        self._decorate_axes(numpy.zeros(grid))
+        self.message = self.ax.text(0.5, 0.5, "", ha="center", va="center", transform=self.ax.transAxes,
+                                    visible=False)
         self.fig.tight_layout()
+        self.image_shape = (grid, shape)
 
-        # Check payload for recent data
-        try:
-            recent_data = self.payload.get_most_recent_data()
-        except (IndexError, AttributeError):
-            recent_data = None
-
-        if not recent_data:
-            # No samples yet; prompt user
-            self.ax.text(
-                0.5, 0.5,
-                "No data available.",
-                ha="center",
-                va="center",
-                transform=self.ax.transAxes
-            )
-            self.canvas.draw_idle()
-            return
+    def _show_message(self, text):
+        if self.image is None:
+            self._build_figure((5, 43), (5, 43))
+        self.image.set_visible(False)
+        self.message.set_text(text)
+        self.message.set_visible(True)
+        self.canvas.draw_idle()
 
-        # Compute matrix and plot
-        hm = Heatmap(self.payload, self.waveform.get_ro())
-        mat = hm.calc_pts_diagonal(program_configrations.S5X41_SWITCHER)
-
-        sns.heatmap(
-            mat,
-            cmap="jet",
-            ax=self.ax,
-            xticklabels=False,
-            yticklabels=False
-        )
-        self._decorate_axes(mat)
+    def _show_matrix(self, mat, grid=None):
+        grid = grid or mat.shape
+        if self.image is None or (grid, mat.shape) != self.image_shape:
+            self._build_figure(grid, mat.shape)
+        self.message.set_visible(False)
+        self.image.set_visible(True)
+        # CELLS NO SENSOR REACHES (LayoutMap.missing) ARE LEFT BLANK AND KEPT OUT OF THE COLOUR RANGE
+        mat = numpy.ma.masked_equal(mat, -1.0)
+        self.image.set_data(mat)
+        finite = mat.compressed()
+        finite = finite[numpy.isfinite(finite)]
+        lo, hi = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+        self.image.set_clim(lo, hi if hi > lo else lo + 1e-12)
         self.canvas.draw_idle()
 
     def set_payload(self, payload: Payload):
         self.payload = payload
+        self.layout = resolve_layout(tuple(payload.get_channels()))
+        self.mappers = {}
+
+    # ===================== Review / playback =====================
+    def load_payload_window(self):
+        '''Map the whole Payload window (∆R/Ro once a baseline exists) to a heatmap tensor'''
+        source = self.payload.relative if self.payload.relative.ready else self.payload
+        keys = self.payload.get_channels()
+        times, block = source.tail_arrays(keys, source.samples.size)
+        self._set_review(times, keys, block)
+
+    def load_csv(self):
+        '''Map a saved output/*.csv to a heatmap tensor'''
+        path = filedialog.askopenfilename(initialdir="output", filetypes=[("CSV files", "*.csv")],
+                                          title="Abrir mediciones")
+        if not path:
+            return
+        try:
+            times, keys, block = read_output_csv(path)
+        except Exception as e:
+            self.frame_label.configure(text=f"Error: {e}")
+            return
+        self._set_review(times, keys, block)
+
+    def _set_review(self, times, keys, block):
+        if len(times) == 0:
+            self.frame_label.configure(text="No data available.")
+            return
+        try:
+            self.review_layout, self.review_values = layout_inputs(list(keys), block)
+        except RuntimeError:
+            self.frame_label.configure(text="No heatmap layout for these channels.")
+            return
+        self.review_frames = self.review_layout.apply(self.review_values)
+        self.review_times = numpy.asarray(times, dtype=float)
+        self.review_idx = 0
+        self.drawn_key = None
+        self.scrub.configure(to=max(len(self.review_times) - 1, 1),
+                             number_of_steps=max(len(self.review_times) - 1, 1))
+        self.scrub.set(0)
+        self.mode_sel.set("Review")
+        self._on_mode("Review")
+
+    def export_npz(self):
+        '''Save the review tensor (or the current window if none is loaded) as a compressed .npz'''
+        if self.review_frames is None:
+            self.load_payload_window()
+        if self.review_frames is None:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("NumPy archive", "*.npz")],
+                                            initialdir="output", title="Exportar heatmap")
+        if not path:
+            return
+        numpy.savez_compressed(path, frames=self.review_frames, time=self.review_times)
+        self.frame_label.configure(text=f"Exportado: {len(self.review_times)} frames")
+
+    def _on_mode(self, value):
+        if value == "Live":
+            self._stop_play()
+        self.draw_heatmap()
+
+    def _on_scrub(self, value):
+        self.review_idx = int(round(value))
+        self._restart_clock()
+        if self.mode_sel.get() == "Review":
+            self._show_review_frame()
+
+    def _show_review_frame(self, force: bool = False):
+        if self.review_frames is None:
+            self.frame_label.configure(text="No review data")
+            return
+        self.review_idx = min(max(self.review_idx, 0), len(self.review_frames) - 1)
+        key = ("review", id(self.review_frames), self.review_idx)
+        if key == self.drawn_key and not force:
+            return
+        self.drawn_key = key
+        mapper = self._mapper(self.review_layout)
+        if mapper is self.review_layout:
+            self._show_matrix(self.review_frames[self.review_idx])
+        else:
+            self._show_matrix(mapper.apply(self.review_values[self.review_idx]), self.review_layout.shape)
+        stamp = datetime.fromtimestamp(self.review_times[self.review_idx], timezone.utc)
+        self.frame_label.configure(
+            text=f"{self.review_idx + 1}/{len(self.review_frames)}  {stamp.strftime('%H:%M:%S.%f')[:-3]}")
+
+    def _toggle_play(self):
+        if self.play_job is not None:
+            self._stop_play()
+            return
+        if self.review_frames is None:
+            return
+        if self.review_idx >= len(self.review_frames) - 1:
+            self.review_idx = 0
+        self.mode_sel.set("Review")
+        self.play_btn.configure(text="⏸")
+        self._restart_clock()
+        self._play_tick()
+
+    def _restart_clock(self):
+        if self.review_times is not None:
+            self.play_clock = (time.perf_counter(), self.review_times[self.review_idx])
+
+    def _stop_play(self):
+        if self.play_job is not None:
+            self.after_cancel(self.play_job)
+            self.play_job = None
+        self.play_btn.configure(text="▶")
+
+    def _play_tick(self):
+        '''Follows the recorded timestamps at the selected speed, skipping frames if drawing falls behind'''
+        self.play_job = None
+        started, t0 = self.play_clock
+        speed = self.PLAY_SPEEDS.get(self.speed_sel.get(), 1)
+        target = t0 + (time.perf_counter() - started) * speed
+        self.review_idx = int(numpy.searchsorted(self.review_times, target, side="right")) - 1
+        self.scrub.set(self.review_idx)
+        self._show_review_frame()
+
+        if self.review_idx >= len(self.review_frames) - 1:
+            self._stop_play()
+            return
+        self.play_job = self.after(self.PLAY_TICK_MS, self._play_tick)
 
     def _decorate_axes(self, mat):
         """Add ticks, labels, and secondary axes for clarity."""
@@ -109,8 +313,3 @@ class HeatmapApp(ctk.CTkFrame):
         ax_right.set_yticklabels([f"{i}'" for i in range(1, mat.shape[0] + 1)], rotation=0, fontsize=8)
         ax_right.yaxis.set_ticks_position('right')
         ax_right.yaxis.set_label_position('right')
-
-    def auto_update(self):
-        while True:
-            self.draw_heatmap()
-            time.sleep(1)
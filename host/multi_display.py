@@ -1,31 +1,45 @@
 # pip install customtkinter
-from typing import Dict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
 import customtkinter as ctk
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-import pandas
+import numpy
 import seaborn as sns
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import threading
-import time
 
+import program_configrations
+from decimation import MinMaxDecimator
 from payload import Payload
+from strip_chart import StripChart
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
+# MATPLOTLIB DATE NUMBER OF THE UNIX EPOCH -> date_num = EPOCH_DATENUM + epoch_seconds / 86400
+EPOCH_DATENUM = mdates.date2num(datetime(1970, 1, 1, tzinfo=timezone.utc))
+
 
 class WaveformApp(ctk.CTkFrame):
+    # FRACTION OF THE WINDOW KEPT EMPTY AHEAD OF THE NEWEST SAMPLE BEFORE THE X AXIS SCROLLS
+    X_HEADROOM = 0.25
 
     # SAMPLING FREQ IN HZ
-    def __init__(self, master, payload: Payload, is_relative, sampling_freq: int = 10):
+    # BACKEND: "matplotlib" OR "tk" (SEE program_configrations.WAVEFORM_BACKEND)
+    def __init__(self, master, payload: Payload, is_relative, sampling_freq: int = 10,
+                 backend: str = program_configrations.WAVEFORM_BACKEND):
         # THE POSITION FOR THE RESISTIVE CHANNELS WILL BE [LENGTH - # CHANNELS : ]
         super().__init__(master)
+        if backend not in ("matplotlib", "tk"):
+            raise RuntimeError(f"UNKNOWN WAVEFORM BACKEND: {backend}")
+        self.backend = backend
         self.sampling_freq = sampling_freq
         self.is_relative = is_relative
 
         self.payload = payload
+        # ∆R/Ro VIEW READS THE VALUES PRECOMPUTED AT INGEST (derived_channels.py) INSTEAD OF THE RAW CHANNELS
+        self.source = payload.relative if is_relative else payload
 
         self.ro = None
 
@@ -62,17 +76,24 @@ class WaveformApp(ctk.CTkFrame):
 
         self.is_deriv = ctk.StringVar(value="off")
 
-        # WAVEFORM
-        self.fig, self.ax = plt.subplots(figsize=(5, 4), dpi=100)
-        self.fig.set_tight_layout(True)
-
         def check_and_enter_ro():
             if ro_entry.get() and ro_entry.get().isdigit() and ro_entry.get() != '0':
                 self.ro = int(ro_entry.get())
+                self.payload.relative.set_baseline(self.ro)
                 ro_entry.configure(border_color='gray50')
+                self._update_graph()
             else:
                 ro_entry.configure(border_color='red')
 
+        def tare():
+            '''Per-channel baseline from the mean of the latest samples'''
+            try:
+                self.payload.relative.tare()
+            except RuntimeError as e:
+                print(e)
+                return
+            self._update_graph()
+
         # Change layout if relative resistance option is true
         if self.is_relative:
             ro_frame = ctk.CTkFrame(body, fg_color='transparent')
@@ -84,9 +105,27 @@ class WaveformApp(ctk.CTkFrame):
             ro_entry.grid(row=0, column=1, padx=5)
 
             ctk.CTkButton(ro_frame, text="SET", command=check_and_enter_ro).grid(row=0, column=2, padx=5)
+            ctk.CTkButton(ro_frame, text="TARE", command=tare).grid(row=0, column=3, padx=5)
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=body)
-        self.canvas_widget = self.canvas.get_tk_widget()
+        # PERSISTENT ARTISTS: ONE Line2D PER CHANNEL, REBUILT ONLY WHEN artist_key CHANGES
+        self.lines: Dict[str, plt.Line2D] = {}
+        self.artist_key = None
+        self.background = None
+        self.view_lims = None
+        self.decimator = MinMaxDecimator()
+
+        # WAVEFORM
+        if self.backend == "tk":
+            self.strip = StripChart(body, title="Active Resistance of the Channels",
+                                    y_label="∆R/Ro" if self.is_relative else "Resistance (Ohms)")
+            self.canvas_widget = self.strip
+        else:
+            self.strip = None
+            self.fig, self.ax = plt.subplots(figsize=(5, 4), dpi=100)
+            self.fig.set_tight_layout(True)
+            self.canvas = FigureCanvasTkAgg(self.fig, master=body)
+            self.canvas.mpl_connect("draw_event", self._on_draw)
+            self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.grid(row=1, column=0, sticky="nsew",
                                 padx=(0, 8), pady=0)
 
@@ -112,8 +151,6 @@ class WaveformApp(ctk.CTkFrame):
         body.grid_columnconfigure(0, weight=3)
         body.grid_columnconfigure(1, weight=1)
 
-        threading.Thread(target=self.auto_update, daemon=True).start()
-
     def _time_period_switch(self, value):
         '''Switches time period, modifying how much data is shown.'''
         self.window_size_label = value
@@ -138,78 +175,138 @@ class WaveformApp(ctk.CTkFrame):
 
         self._update_graph()
 
+    @property
+    def window_days(self) -> float:
+        return self.window_size_disp / 86400.0
+
     def get_ro(self):
         '''Returns base resistance to parent'''
         return self.ro
 
-    def _update_graph(self):
-        '''Updates graph if a channel is selected.'''
-        selected_channels = [
-            name for name, cb in self.channel_box_select.items() if cb.get()
-        ]
-        self.ax.clear()
+    def _selected_channels(self) -> List[str]:
+        return [name for name, cb in self.channel_box_select.items() if cb.get()]
 
+    def _placeholder_text(self, selected_channels: List[str]) -> Optional[str]:
         if not selected_channels:
-            self.ax.text(0.5, 0.5, "SELECT AT LEAST ONE CHANNEL",
-                         ha="center", va="center", transform=self.ax.transAxes)
-        elif (self.is_relative and self.ro == None):
-            self.ax.text(0.5, 0.5, "ENTER A BASE RESISTANCE",
-                         ha="center", va="center", transform=self.ax.transAxes)
-        else:
-            df = (self.payload.to_dataframe().set_index("Time")[selected_channels])
-
-            his_amount = int(self.window_size_disp * self.sampling_freq)
-            df = df.tail(his_amount)
-
-            long_df = (df.reset_index()
-                       .melt(id_vars="Time",
-                             var_name="Channel",
-                             value_name="Value"))
-            long_df["Time"] = pandas.to_datetime(long_df["Time"],
-                                                 format="%d/%m/%Y %H:%M:%S:%f",
-                                                 utc=True)
-
-            if not self.is_relative:
-                sns.lineplot(
-                    data=long_df,
-                    x="Time",
-                    y="Value",
-                    hue="Channel",
-                    palette=sns.color_palette("husl", len(selected_channels)),
-                    ax=self.ax,
-                    legend=True
-                )
-                self.ax.set_ylabel("Resistance (Ohms)")
+            return "SELECT AT LEAST ONE CHANNEL"
+        if self.is_relative and not self.payload.relative.ready:
+            return "WAITING FOR BASELINE (ENTER A BASE RESISTANCE OR TARE)"
+        return None
+
+    def _rebuild_strip(self, selected_channels: List[str]):
+        '''Tk backend counterpart of _rebuild_artists'''
+        self.lines = {}
+        self.view_lims = None
+        message = self._placeholder_text(selected_channels)
+        if message:
+            self.strip.show_message(message)
+            return
+        self.strip.set_channels(selected_channels, sns.color_palette("husl", len(selected_channels)).as_hex())
+        self.lines = self.strip.lines
+
+    def _rebuild_artists(self, selected_channels: List[str]):
+        '''Recreates the axes content. Only called when the selection, window or Ro changes.'''
+        self.ax.clear()
+        self.lines = {}
+        self.background = None
+        self.view_lims = None
+
+        message = self._placeholder_text(selected_channels)
+        if message:
+            self.ax.text(0.5, 0.5, message, ha="center", va="center", transform=self.ax.transAxes)
+            return
+
+        # LINES ARE ANIMATED -> LEFT OUT OF THE FULL DRAW AND BLITTED ON TOP OF THE CACHED BACKGROUND
+        palette = sns.color_palette("husl", len(selected_channels))
+        for ch, color in zip(selected_channels, palette):
+            (line,) = self.ax.plot([], [], color=color, label=ch, animated=True)
+            self.lines[ch] = line
+
+        self.ax.legend(ncol=2, loc="upper right", bbox_to_anchor=(1, 1))
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        self.fig.autofmt_xdate()
+
+        self.ax.set_ylabel("∆R/Ro" if self.is_relative else "Resistance (Ohms)")
+        self.ax.set_xlabel("Time")
+        self.ax.set_title("Active Resistance of the Channels")
+
+    def _on_draw(self, event):
+        '''After every full draw: cache the static background and put the lines back on top.'''
+        if not self.lines:
+            return
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+
+    def _fit_view(self, x: numpy.ndarray, y: numpy.ndarray, window: float) -> bool:
+        '''
+        Keeps the current limits (self.view_lims) while the data fits in them. The x range leaves headroom ahead of
+        the newest sample so several frames can be blitted before the axis has to scroll (and fully redraw).
+        `window` is the display window in the units of x. Returns True when the limits moved.
+        '''
+        finite = y[numpy.isfinite(y)]
+        if x.size == 0 or finite.size == 0:
+            return False
+        x_lo, x_hi = x[0], x[-1]
+        y_lo, y_hi = float(finite.min()), float(finite.max())
+
+        if self.view_lims is not None:
+            (vx_lo, vx_hi), (vy_lo, vy_hi) = self.view_lims
+            if x_hi <= vx_hi and vy_lo <= y_lo and y_hi <= vy_hi:
+                return False
+
+        span = max(x_hi - x_lo, window)
+        pad = (y_hi - y_lo) * 0.1 or abs(y_hi) * 0.05 or 1.0
+        self.view_lims = ((x_hi - span, x_hi + span * self.X_HEADROOM), (y_lo - pad, y_hi + pad))
+        return True
 
+    def _update_graph(self):
+        '''Updates graph if a channel is selected.'''
+        selected_channels = self._selected_channels()
+        baseline = (self.payload.relative.ready, self.payload.relative.baseline_version) if self.is_relative else None
+        artist_key = (tuple(selected_channels), self.window_size_label, baseline)
+        if artist_key != self.artist_key:
+            self.artist_key = artist_key
+            self.decimator.reset()
+            if self.strip is not None:
+                self._rebuild_strip(selected_channels)
             else:
-                delta_df = long_df.copy()
-                delta_df['DeltaR_Ro'] = (delta_df['Value'] - self.ro) / self.ro
-                sns.lineplot(
-                    data=delta_df,
-                    x="Time",
-                    y="DeltaR_Ro",
-                    hue="Channel",
-                    palette=sns.color_palette("husl", len(selected_channels)),
-                    ax=self.ax,
-                    legend=True
-                )
-                self.ax.set_ylabel("∆R/Ro")
-
-            # Manually control the legend with 2 columns
-            handles, labels = self.ax.get_legend_handles_labels()
-            self.ax.legend(handles, labels, ncol=2, loc="upper right", bbox_to_anchor=(1, 1))
-            
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            self.fig.autofmt_xdate()
-
-            self.ax.set_xlabel("Time")
-            self.ax.set_title("Active Resistance of the Channels")
-
-        self.canvas.draw_idle()
-
-    def auto_update(self):
-        '''Updates graph every second. Spawned in a thread.'''
-        while True:
-            self._update_graph()
-            time.sleep(1)
+                self._rebuild_artists(selected_channels)
+                if not self.lines:
+                    self.canvas.draw_idle()
+
+        if not self.lines:
+            return
+
+        # ~2 POINTS PER AXES PIXEL NO MATTER HOW LONG THE WINDOW IS
+        his_amount = int(self.window_size_disp * self.sampling_freq)
+        if self.strip is not None:
+            left, _, right, _ = self.strip.plot_box()
+            t, values = self.decimator.window(self.source, selected_channels, his_amount, int(right - left))
+            if self._fit_view(t, values, self.window_size_disp):
+                self.strip.set_view(*self.view_lims)
+            self.strip.update_data(t, values)
+            return
+
+        t, values = self.decimator.window(self.source, selected_channels, his_amount, int(self.ax.bbox.width))
+        x = EPOCH_DATENUM + t / 86400.0
+
+        for i, line in enumerate(self.lines.values()):
+            line.set_data(x, values[:, i])
+
+        if self._fit_view(x, values, self.window_days):
+            self.ax.set_xlim(*self.view_lims[0])
+            self.ax.set_ylim(*self.view_lims[1])
+            # LIMITS MOVED -> FULL DRAW, _on_draw RECAPTURES THE BACKGROUND
+            self.canvas.draw()
+            return
+        if self.background is None:
+            # NO BACKGROUND CAPTURED YET (FIRST FRAME / RESIZE) -> FULL DRAW, _on_draw CAPTURES IT
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self.background)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
@@ -6,10 +6,14 @@ Texas A&M University X UADY
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Deque, Any, List
+from typing import Dict, Deque, Any, List, Tuple
 
+import numpy
 import pandas
 
+from derived_channels import RelativeResistance
+from ring_buffer import RingBuffer
+
 class Payload:
     """
     Collect variable-length CSV payload lines into fixed-length deques,
@@ -18,7 +22,7 @@ class Payload:
 
     # WINDOW SIZE IS THE AMOUNT OF DEPTH/SCANS OF DATA - Y VALUE
     def __init__(self, window_size: int, num_rows_detach: int, out_file_name: str, channels: int = None,
-                 keys: list[str] = None):
+                 keys: list[str] = None, baseline_samples: int = 100):
 
         if (keys is not None) and (channels is not None):
             self.channels = channels
@@ -46,6 +50,15 @@ class Payload:
         for key in self.keys:
             self.data[key] = deque(maxlen=window_size)
 
+        # NUMERIC MIRROR OF THE WINDOW FOR THE PLOTS: COL 0 = EPOCH SECONDS, COL i = self.keys[i + 1]
+        # THE DEQUES ARE STILL THE SOURCE FOR THE CSV EXPORT, THIS ONE IS NEVER DETACHED
+        self.samples = RingBuffer(window_size, len(self.keys) - 1)
+        self.col_index: Dict[str, int] = {key: i + 1 for i, key in enumerate(self.keys[2:])}
+
+        # ∆R/Ro OF THE RESISTIVE CHANNELS, COMPUTED ONCE PER PUSH (SEE derived_channels.py)
+        self.relative = RelativeResistance(self.samples, [self.col_index[k] for k in self.get_channels()],
+                                           self.get_channels(), baseline_samples)
+
     def push(self, raw_payload: str, scan: int = None, time: datetime = None) -> None:
         """
         Split `raw_payload` on commas and append each value to its deque.
@@ -65,15 +78,16 @@ class Payload:
         else:
             self.data["Scan"].append(scan)
         if time is None:
-            ts = datetime.now(timezone.utc)
-            self.data["Time"].append(ts)
-        else:
-            self.data["Time"].append(time)
+            time = datetime.now(timezone.utc)
+        self.data["Time"].append(time)
 
-        i = 0
-        for key in self.keys[2:]:
-            self.data[key].append(float(buffer[i]))
-            i += 1
+        values = [float(v) for v in buffer]
+        for key, value in zip(self.keys[2:], values):
+            self.data[key].append(value)
+        # NAIVE TIMESTAMPS ARE TAKEN AS UTC, SAME AS to_dataframe()
+        epoch = (time if time.tzinfo else time.replace(tzinfo=timezone.utc)).timestamp()
+        row = numpy.array([epoch, *values])
+        self.relative.push(row)         # APPENDS TO self.samples TOO, UNDER THE BASELINE LOCK
 
         # TOTAL DATA (ALL WINDOWS) IS FULL -> UNLOAD SOME WINDOWS TO THE DISK (CSV)
         while len(self.data["Scan"]) >= self.window_size:
@@ -99,10 +113,21 @@ class Payload:
         df = df.astype({"Scan": "int64"})
         return df
 
+    @property
+    def version(self) -> int:
+        '''Grows with every push, lets views skip redraws when nothing new arrived'''
+        return self.samples.total
+
     def get_channels(self) -> list[str]:
         '''Get channel keys'''
         return self.keys[-self.channels:]
 
+    def tail_arrays(self, keys: List[str], n: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        '''Most recent n samples as (epoch seconds, n x len(keys) values) arrays, oldest first'''
+        block = self.samples.tail(n)
+        cols = [self.col_index[k] for k in keys]
+        return block[:, 0], block[:, cols]
+
     def get_most_recent_data(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {}
         for k, dq in self.data.items():
@@ -135,3 +160,28 @@ class Payload:
         path = Path(file_name)
 
         df.to_csv(path, mode="a", index=False, header=not path.exists())
+
+
+def read_output_csv(path: str) -> Tuple[numpy.ndarray, List[str], numpy.ndarray]:
+    '''
+    Load a CSV written by Payload (to_csv / detach_rows) back as arrays.
+    Returns (epoch seconds (T,), numeric column names, T x len(names) values)
+    '''
+    df = pandas.read_csv(path)
+    if df.empty:
+        raise RuntimeError(f"CSV HAS NO ROWS: {path}")
+
+    # to_csv WRITES "%d/%m/%Y %H:%M:%S:%f", detach_rows WRITES THE RAW datetime (ISO)
+    raw = df["Time"].astype(str)
+    epoch = _epoch_seconds(pandas.to_datetime(raw, format="%d/%m/%Y %H:%M:%S:%f", utc=True, errors="coerce"))
+    missing = numpy.isnan(epoch)
+    if missing.any():
+        epoch[missing] = _epoch_seconds(pandas.to_datetime(raw[missing], format="ISO8601", utc=True, errors="coerce"))
+
+    keys = [k for k in df.columns if k not in ("Scan", "Time")]
+    return epoch, keys, df[keys].to_numpy(dtype=float)
+
+
+def _epoch_seconds(ts: pandas.Series) -> numpy.ndarray:
+    '''tz-aware datetimes -> float epoch seconds, NaT -> NaN'''
+    return numpy.array((ts - pandas.Timestamp(0, tz="UTC")).dt.total_seconds(), dtype=float)
@@ -0,0 +1,149 @@
+"""
+port_watcher.py  –  Background serial port enumeration with a cached device list
+Texas A&M University X UADY
+"""
+
+import os
+import sys
+import threading
+from typing import Callable, List, Optional, Tuple
+
+import serial.tools.list_ports as list_ports
+
+import program_configrations
+
+
+class PortInfo:
+    """One enumerated serial port. `board` names the known board behind its USB ID, None otherwise."""
+
+    def __init__(self, device: str, description: str, vid: Optional[int] = None, pid: Optional[int] = None,
+                 serial_number: Optional[str] = None):
+        self.device = device
+        self.description = description
+        self.vid = vid
+        self.pid = pid
+        self.serial_number = serial_number
+        self.board = program_configrations.KNOWN_USB_BOARDS.get((vid, pid)) if vid is not None else None
+
+    @property
+    def label(self) -> str:
+        '''Dropdown text, unique per device'''
+        text = self.device if self.description in ("", "n/a", self.device) else f"{self.device} — {self.description}"
+        if self.board:
+            text += f"  [{self.board}]"
+        return text
+
+    def _key(self):
+        return self.device, self.description, self.vid, self.pid, self.serial_number
+
+    def __eq__(self, other):
+        return isinstance(other, PortInfo) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+def _enumerate() -> Tuple[PortInfo, ...]:
+    return tuple(PortInfo(p.device, p.description or "", p.vid, p.pid, p.serial_number)
+                 for p in sorted(list_ports.comports(), key=lambda p: p.device))
+
+
+class PortWatcher:
+    """
+    Enumerates serial ports on its own thread every `poll_s` and calls the subscribers with the new tuple of PortInfo
+    whenever it changes, so the Tk thread never waits on enumeration. On Linux the scan is skipped while /dev is
+    unchanged (its mtime moves whenever a tty node appears or goes away). Subscribers run on the watcher thread and
+    must hand the update over to Tk themselves (e.g. with `after`).
+    """
+
+    POLL_S = 1.0
+    DEV_DIR = "/dev"
+
+    def __init__(self, poll_s: float = POLL_S, enumerate_ports: Callable[[], Tuple[PortInfo, ...]] = _enumerate):
+        self.poll_s = poll_s
+        self.enumerate_ports = enumerate_ports
+        self.ports: Optional[Tuple[PortInfo, ...]] = None        # None UNTIL THE FIRST SCAN FINISHES
+        self.scans = 0
+        self._subscribers: List[Callable[[Tuple[PortInfo, ...]], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dev_mtime = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PortWatcher":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self
+
+    def subscribe(self, callback: Callable[[Tuple[PortInfo, ...]], None]) -> None:
+        '''Called now with the cached list (if a scan already finished), then on every change'''
+        with self._lock:
+            self._subscribers.append(callback)
+            ports = self.ports
+        if ports is not None:
+            callback(ports)
+
+    def unsubscribe(self, callback) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def rescan(self) -> None:
+        '''Force a full enumeration on the next pass (Refresh button), without blocking the caller'''
+        self._dev_mtime = None
+        self._wake.set()
+
+    def find(self, device: str) -> Optional[PortInfo]:
+        for p in self.ports or ():
+            if p.device == device:
+                return p
+        return None
+
+    def poll(self) -> bool:
+        '''One pass. Returns True if the list changed (subscribers were notified)'''
+        if sys.platform.startswith("linux"):
+            try:
+                mtime = os.stat(self.DEV_DIR).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime == self._dev_mtime and self.ports is not None:
+                return False
+            self._dev_mtime = mtime
+
+        try:
+            ports = self.enumerate_ports()
+        except Exception as e:
+            print(f"[PORTS] {e}")
+            return False
+        self.scans += 1
+        if ports == self.ports:
+            return False
+
+        with self._lock:
+            self.ports = ports
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(ports)
+            except Exception as e:
+                print(f"[PORTS] {e}")
+        return True
+
+    def _run(self) -> None:
+        while True:
+            self.poll()
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+
+
+_watcher: Optional[PortWatcher] = None
+
+
+def get_port_watcher() -> PortWatcher:
+    '''The app-wide watcher, started on first use'''
+    global _watcher
+    if _watcher is None:
+        _watcher = PortWatcher()
+    return _watcher.start()
@@ -0,0 +1,154 @@
+"""
+preset_store.py  –  Presets of the control and bending pages, kept in one JSON file
+Texas A&M University X UADY
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# presets.json:  {"control": {name: preset, ...}, "bending": {name: cfg, ...}}
+# ONLY EVER PARSED AS JSON (NOTHING FROM DISK IS IMPORTED OR EXECUTED), REWRITTEN AS A WHOLE THROUGH A TEMP FILE + RENAME
+PRESETS_JSON = Path(__file__).with_name("presets.json")
+LEGACY_BENDING_JSON = Path(__file__).with_name("presets_user.json")
+
+Preset = Dict[str, Any]
+
+# BENDING PRESETS SHIPPED WITH THE APP: ALWAYS LISTED, CAN'T BE OVERWRITTEN OR DELETED
+BENDING_BUILTIN: Dict[str, Preset] = {
+    # ----- MODO 1 (ángulo y velocidad constantes) -----
+    "Demo M1 7rpm @ 10°": {"modo": 1, "angle": 10, "speed": 7},
+    "Lento M1 7rpm @ 1°": {"modo": 1, "angle": 1, "speed": 7},
+
+    # ----- MODO 2 (ángulo variable, velocidad constante) -----
+    "Barrido A 0→90 step 5 @ 10rpm": {
+        "modo": 2, "velocity": 10, "init_angle": 0, "final_angle": 90, "step_angle": 5
+    },
+
+    # ----- MODO 3 (ángulo constante, velocidad variable) -----
+    "Escalera V 7→30 step 3 @ 5°": {
+        "modo": 3, "angle": 5, "init_vel": 7, "final_vel": 30, "step_vel": 3
+    },
+
+    # ----- MODO 4 (ángulo y velocidad variables) -----
+    "Sweep AV A:0→45 s:5 / V:7→20 s:2": {
+        "modo": 4,
+        "init_angle": 0, "final_angle": 45, "step_angle": 5,
+        "init_vel": 7, "final_vel": 20, "step_vel": 2
+    },
+}
+
+_lock = threading.Lock()
+_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Dict[str, Preset]]]] = {}
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read(path: Path) -> Dict[str, Dict[str, Preset]]:
+    '''Whole file, parsed only when its mtime / size changed since the last read. Callers must not mutate it'''
+    stamp = _stamp(path)
+    cached = _cache.get(path)
+    if stamp is not None and cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    data = {}
+    if stamp is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not all(isinstance(v, dict) for v in data.values()):
+            raise RuntimeError(f"MALFORMED PRESETS FILE: path={path}")
+    if path == PRESETS_JSON and "bending" not in data:
+        data = {**data, **_read_legacy()}
+    if stamp is not None:
+        _cache[path] = (stamp, data)
+    return data
+
+
+def _read_legacy() -> Dict[str, Dict[str, Preset]]:
+    '''Bending presets saved before presets.json existed; moved into it by the next save'''
+    try:
+        with open(LEGACY_BENDING_JSON, "r", encoding="utf-8") as f:
+            user = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {"bending": user} if isinstance(user, dict) else {}
+
+
+def _write(path: Path, data: Dict[str, Dict[str, Preset]]) -> None:
+    '''Readers see either the old file or the new one, never a partial write'''
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _cache[path] = (_stamp(path), data)
+
+
+class PresetStore:
+    """
+    One namespace of the presets file. Reads are served from the cache until the file changes on disk, so pages can
+    call `load_all` whenever they need the list. Saves re-read the file under a lock and replace it atomically, so the
+    other namespace and presets saved meanwhile by another page are kept.
+    """
+
+    def __init__(self, namespace: str, builtin: Optional[Dict[str, Preset]] = None, path: Path = PRESETS_JSON):
+        self.namespace = namespace
+        self.builtin = dict(builtin or {})
+        self.path = Path(path)
+
+    def load_all(self) -> Dict[str, Preset]:
+        '''Built-in presets first, then the saved ones. A fresh dict, but the preset dicts are shared: don't modify them'''
+        with _lock:
+            saved = _read(self.path).get(self.namespace, {})
+        data = dict(self.builtin)
+        data.update(saved)
+        return data
+
+    def is_builtin(self, name: str) -> bool:
+        return name in self.builtin
+
+    def save_user_preset(self, name: str, cfg: Preset) -> None:
+        name = name.strip()
+        if not name:
+            raise ValueError("Nombre vacío no permitido.")
+        if self.is_builtin(name):
+            raise ValueError("No se puede sobreescribir un preset base.")
+        with _lock:
+            data = dict(_read(self.path))
+            section = dict(data.get(self.namespace, {}))
+            section[name] = cfg
+            data[self.namespace] = section
+            _write(self.path, data)
+
+    def delete_user_preset(self, name: str) -> bool:
+        '''Returns True if it existed. Built-in presets are never deleted'''
+        with _lock:
+            data = dict(_read(self.path))
+            section = dict(data.get(self.namespace, {}))
+            if name not in section:
+                return False
+            del section[name]
+            data[self.namespace] = section
+            _write(self.path, data)
+        return True
+
+
+CONTROL_PRESETS = PresetStore("control")
+BENDING_PRESETS = PresetStore("bending", BENDING_BUILTIN)
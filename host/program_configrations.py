@@ -2,6 +2,9 @@ from typing import Dict, Tuple, Final
 
 # IF ANY OF THE HEADER INFORMATION CHANGES FOR THE MCU -> UPDATE THE CONSTS ACCORDINGLY
 
+# WAVEFORM RENDERER: "matplotlib" (FULL AXES, BLITTED) OR "tk" (strip_chart.py, LIGHTER FOR 20-30 FPS ON LAPTOPS)
+WAVEFORM_BACKEND: Final[str] = "matplotlib"
+
 # CONST CONFIGURATIONS FOR THE DIFFERENT MATERIAL SET UPS
 
 # 5x41 MATERIAL CONFIGURATION
@@ -48,3 +51,36 @@ S5X41_SWITCHER: Final[Dict[str, Tuple[int, int]]] = {
     "21-19p (6039)": (21, 19),
     "21-21p (6040)": (21, 21),
 }
+
+# HEATMAP LAYOUTS FOR THE BOARDS WITHOUT THE DIAGONAL MATERIAL (COMPILED BY sensor_layout.py)
+# EACH CHANNEL IS A SENSING SEGMENT ((row, col) START, (row, col) END) ON THE OUTPUT GRID
+# MUX08 / MUX10: R<i> STRIPS RUN ALONG THE ROWS, C<j> STRIPS ALONG THE COLUMNS, EACH CROSSING AVERAGES ITS PAIR
+MUX08_LAYOUT: Final[Dict] = {
+    "grid": (4, 4),
+    "segments": {
+        **{f"100{i} <R{i}> (OHM)": ((i - 1, 0), (i - 1, 3)) for i in range(1, 5)},
+        **{f"100{j + 5} <C{j}> (OHM)": ((0, j - 1), (3, j - 1)) for j in range(1, 5)},
+    },
+}
+
+MUX10_LAYOUT: Final[Dict] = {
+    "grid": (5, 5),
+    "segments": {
+        **{f"100{i} <R{i}> (OHM)": ((i - 1, 0), (i - 1, 4)) for i in range(1, 6)},
+        **{f"{1005 + j} <C{j}> (OHM)": ((0, j - 1), (4, j - 1)) for j in range(1, 6)},
+    },
+}
+
+HEATMAP_LAYOUTS: Final[Dict[str, Dict]] = {
+    "MUX08": MUX08_LAYOUT,
+    "MUX10": MUX10_LAYOUT,
+}
+
+# USB (VID, PID) OF THE MICROCONTROLLER BOARDS THE HOST TALKS TO, FOR AUTO-SELECTING THEIR PORT (SEE port_watcher.py)
+KNOWN_USB_BOARDS: Final[Dict[Tuple[int, int], str]] = {
+    (0x2E8A, 0x0005): "Raspberry Pi Pico (MicroPython)",
+    (0x2E8A, 0x000A): "Raspberry Pi Pico (USB CDC)",
+    (0x303A, 0x1001): "ESP32-S3 (USB JTAG/serial)",
+    (0x10C4, 0xEA60): "ESP32 (CP210x)",
+    (0x1A86, 0x7523): "ESP32 (CH340)",
+}
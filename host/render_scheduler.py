@@ -0,0 +1,107 @@
+"""
+render_scheduler.py  –  Main-thread redraw loop for the live pages
+Texas A&M University X UADY
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+
+class _RenderEntry:
+    def __init__(self, render: Callable[[], None], version: Optional[Callable[[], int]]):
+        self.render = render
+        self.version = version
+        self.last_version = None
+        self.dirty = True
+        self.cost_ms = 0.0      # EXPONENTIAL MOVING AVERAGE OF THE RENDER TIME
+
+
+class RenderScheduler:
+    """
+    Single Tk `after` loop that redraws only the page the Navbar currently shows.
+    - Pages register a render callback and (optionally) a version getter, e.g. the Payload version; a page is only
+      redrawn when it was requested or its version moved since the last draw.
+    - Any number of requests between two ticks collapse into one render.
+    - The tick interval follows the measured render cost so drawing never takes more than LOAD of the main loop.
+    """
+
+    MIN_INTERVAL_MS = 33        # ~30 FPS CEILING
+    MAX_INTERVAL_MS = 1000
+    LOAD = 0.5                  # MAX FRACTION OF MAIN-LOOP TIME SPENT RENDERING
+    SMOOTHING = 0.2             # EMA WEIGHT OF THE NEWEST MEASUREMENT
+
+    def __init__(self, root):
+        self.root = root
+        self.pages: Dict[str, _RenderEntry] = {}
+        self.visible: Optional[str] = None
+        self.interval_ms = self.MIN_INTERVAL_MS
+        self.job = None
+        self.job_is_idle = False
+        self.running = False
+
+    def register(self, name: str, render: Callable[[], None], version: Callable[[], int] = None) -> None:
+        self.pages[name] = _RenderEntry(render, version)
+
+    def show(self, name: str) -> None:
+        '''Called by the Navbar switch. Hidden pages keep their state and are redrawn as soon as they are shown'''
+        self.visible = name
+        self.request(name)
+
+    def request(self, name: str = None) -> None:
+        '''Mark a page (default: the visible one) for redraw. Redundant requests coalesce into the next tick'''
+        name = self.visible if name is None else name
+        entry = self.pages.get(name)
+        if entry is None:
+            return
+        entry.dirty = True
+        if self.running and name == self.visible and not self.job_is_idle:
+            self._cancel()
+            self.job = self.root.after_idle(self._tick)
+            self.job_is_idle = True
+
+    def start(self) -> None:
+        if not self.running:
+            self.running = True
+            self._schedule()
+
+    def stop(self) -> None:
+        self.running = False
+        self._cancel()
+
+    def _cancel(self) -> None:
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except Exception:
+                pass
+        self.job = None
+        self.job_is_idle = False
+
+    def _schedule(self) -> None:
+        self.job = self.root.after(int(self.interval_ms), self._tick)
+        self.job_is_idle = False
+
+    def _tick(self) -> None:
+        self.job = None
+        self.job_is_idle = False
+        if not self.running:
+            return
+
+        entry = self.pages.get(self.visible)
+        if entry is not None:
+            version = entry.version() if entry.version else None
+            if entry.dirty or version is None or version != entry.last_version:
+                entry.dirty = False
+                entry.last_version = version
+
+                start = time.perf_counter()
+                try:
+                    entry.render()
+                except Exception as e:
+                    print(f"Render error ({self.visible}): {e}")
+                cost_ms = (time.perf_counter() - start) * 1000
+                entry.cost_ms += self.SMOOTHING * (cost_ms - entry.cost_ms)
+
+            self.interval_ms = min(max(entry.cost_ms / self.LOAD, self.MIN_INTERVAL_MS), self.MAX_INTERVAL_MS)
+
+        self._schedule()
@@ -0,0 +1,81 @@
+"""
+ring_buffer.py  –  Fixed-capacity NumPy ring for numeric sample rows
+Texas A&M University X UADY
+"""
+
+from typing import Tuple
+
+import numpy
+
+
+class RingBuffer:
+    """
+    Preallocated (capacity x width) float array written circularly.
+    Rows are samples, columns are fields; `tail` returns the most recent rows in chronological order
+    """
+
+    def __init__(self, capacity: int, width: int, dtype=float):
+        if capacity <= 0:
+            raise RuntimeError(f"RING CAPACITY MUST BE POSITIVE: capacity={capacity}")
+        if width <= 0:
+            raise RuntimeError(f"RING WIDTH MUST BE POSITIVE: width={width}")
+
+        self.capacity = capacity
+        self.width = width
+        self.data = numpy.full((capacity, width), numpy.nan, dtype=dtype)
+        self.head = 0       # NEXT ROW TO WRITE
+        self.size = 0       # VALID ROWS (<= capacity)
+        self.total = 0      # ROWS EVER WRITTEN -> LETS READERS DETECT NEW SAMPLES
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, row) -> None:
+        '''Write a single row, overwriting the oldest one when full'''
+        self.data[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, block) -> None:
+        '''Write a (n x width) block of rows in at most two slice copies'''
+        block = numpy.asarray(block, dtype=self.data.dtype).reshape(-1, self.width)
+        n = block.shape[0]
+        if n == 0:
+            return
+        if n >= self.capacity:
+            block = block[-self.capacity:]
+            self.data[:] = block
+            self.head = 0
+        else:
+            first = min(n, self.capacity - self.head)
+            self.data[self.head:self.head + first] = block[:first]
+            self.data[:n - first] = block[first:]
+            self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        self.total += n
+
+    def tail(self, n: int = None) -> numpy.ndarray:
+        '''Copy of the most recent n rows (all rows if n is None), oldest first'''
+        if n is None or n > self.size:
+            n = self.size
+        if n <= 0:
+            return numpy.empty((0, self.width), dtype=self.data.dtype)
+
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.data[start:start + n].copy()
+        return numpy.concatenate((self.data[start:], self.data[:self.head]))
+
+    def since(self, start: int) -> Tuple[numpy.ndarray, int]:
+        '''
+        Rows whose absolute index (position in the whole stream, see `total`) is >= start.
+        Returns the rows and the absolute index of the first one, which is later than `start` if those were overwritten
+        '''
+        start = max(start, self.total - self.size)
+        return self.tail(self.total - start), start
+
+    def clear(self) -> None:
+        self.head = 0
+        self.size = 0
+        self.total = 0
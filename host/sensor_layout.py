@@ -0,0 +1,238 @@
+"""
+sensor_layout.py  –  Declarative sensor layouts compiled to sparse channel -> grid interpolation maps
+Texas A&M University X UADY
+"""
+
+from functools import lru_cache
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy
+
+import program_configrations
+
+
+# A LAYOUT DESCRIPTION IS PLAIN DATA (SEE program_configrations.HEATMAP_LAYOUTS):
+#   {"grid": (rows, cols),
+#    "segments": {channel key: ((row_0, col_0), (row_1, col_1)), ...}}
+# EVERY CHANNEL IS A SENSING SEGMENT BETWEEN TWO GRID CELLS (BOTH INCLUDED, SAME CELL = A SINGLE PAD).
+# A CELL CROSSED BY k SEGMENTS SHOWS THEIR MEAN, CELLS NOT CROSSED SHOW THE MEAN OF THEIR CROSSED 4-NEIGHBOURS.
+
+
+class LayoutMap:
+    """
+    Compiled layout: a sparse (cells x inputs) matrix stored row-wise as padded (index, weight) tap slots, so applying
+    it to one frame or a stack is `taps` gathers + multiply-adds over all cells at once. Pad slots read a constant 0
+    input, which keeps NaN channels from leaking into cells they do not feed (a dense product would spread them).
+    Cells no segment crosses are then filled by fill_gaps, so the result matches the per-cell algorithm exactly.
+    `keys` names the inputs in the order `apply` expects them.
+    """
+
+    def __init__(self, keys: Sequence[Hashable], shape: Tuple[int, int], taps: List[Dict[int, float]],
+                 missing: float = -1.0, fill_gaps: bool = True):
+        """
+        :param keys: input labels (channel names, or (real, prime) coords for the diagonal material)
+        :param shape: output (rows, cols)
+        :param taps: per flat output cell, {input index: weight}; empty for cells no segment crosses
+        :param missing: value of cells left without any input
+        :param fill_gaps: give empty cells the 4-neighbour mean of the crossed ones (fill_gaps)
+        """
+        if len(taps) != shape[0] * shape[1]:
+            raise RuntimeError(f"LAYOUT TAPS DON'T MATCH THE GRID: cells={len(taps)}, shape={shape}")
+        self.keys = tuple(keys)
+        self.shape = tuple(shape)
+        self.missing = missing
+        self.fill_gaps = fill_gaps
+        self.direct_empty = numpy.array([not t for t in taps], dtype=bool)
+
+        width = max([len(t) for t in taps] + [1])
+        sentinel = len(self.keys)
+        self.index = numpy.full((len(taps), width), sentinel, dtype=numpy.intp)
+        self.weight = numpy.zeros((len(taps), width))
+        for cell, tap in enumerate(taps):
+            for slot, (i, w) in enumerate(tap.items()):
+                self.index[cell, slot] = i
+                self.weight[cell, slot] = w
+        # SAME MAP WITH THE GAP FILL AS WEIGHTS, FOR dense(); ITS EMPTY CELLS ARE THE ONES STILL `missing` AFTER THE FILL
+        self._folded = _fold_gap_fill(taps, self.shape) if fill_gaps else taps
+        self.empty = numpy.array([not t for t in self._folded], dtype=bool)
+
+    def apply(self, values: numpy.ndarray) -> numpy.ndarray:
+        '''(n_inputs,) -> (rows, cols), or a stack (..., n_inputs) -> (..., rows, cols)'''
+        values = numpy.asarray(values, dtype=float)
+        lead = values.shape[:-1]
+        padded = numpy.concatenate((values, numpy.zeros(lead + (1,))), axis=-1)
+
+        out = numpy.zeros(lead + (len(self.index),))
+        for slot in range(self.index.shape[1]):
+            out += padded[..., self.index[:, slot]] * self.weight[:, slot]
+        out[..., self.direct_empty] = self.missing
+        out = out.reshape(lead + self.shape)
+        return fill_gaps(out, self.missing) if self.fill_gaps else out
+
+    def dense(self) -> numpy.ndarray:
+        '''
+        Same map as a dense (cells x inputs) matrix, for composing with other linear stages: the gap fill is folded
+        into the weights (equal up to rounding). Empty cells are 0
+        '''
+        matrix = numpy.zeros((len(self._folded), len(self.keys)))
+        for cell, tap in enumerate(self._folded):
+            for i, w in tap.items():
+                matrix[cell, i] = w
+        return matrix
+
+
+def fill_gaps(frames: numpy.ndarray, missing: float = -1.0) -> numpy.ndarray:
+    """
+    Replace every `missing` cell with the mean of its valid 4-neighbours (top, bottom, left, right), using only the
+    original values (no propagation). Cells with no valid neighbour stay `missing`.
+    Works on one (rows x cols) matrix or a stack (..., rows x cols) of frames in a single vectorized pass.
+    The neighbours are summed in the same order as the former per-cell loop, so results match it exactly.
+    """
+    frames = numpy.asarray(frames, dtype=float)
+    valid = frames != missing
+    vals = numpy.where(valid, frames, 0.0)
+
+    sums = numpy.zeros_like(vals)
+    counts = numpy.zeros(frames.shape, dtype=numpy.int8)
+    # (destination slice, source slice) ALONG THE LAST TWO AXES: TOP, BOTTOM, LEFT, RIGHT
+    shifts = (
+        ((Ellipsis, slice(1, None), slice(None)), (Ellipsis, slice(None, -1), slice(None))),
+        ((Ellipsis, slice(None, -1), slice(None)), (Ellipsis, slice(1, None), slice(None))),
+        ((Ellipsis, slice(None), slice(1, None)), (Ellipsis, slice(None), slice(None, -1))),
+        ((Ellipsis, slice(None), slice(None, -1)), (Ellipsis, slice(None), slice(1, None))),
+    )
+    for dst, src in shifts:
+        sums[dst] += vals[src]
+        counts[dst] += valid[src]
+
+    fill = ~valid & (counts > 0)
+    out = frames.copy()
+    out[fill] = sums[fill] / counts[fill]
+    return out
+
+
+def _fold_gap_fill(taps: List[Dict[int, float]], shape: Tuple[int, int]) -> List[Dict[int, float]]:
+    '''fill_gaps as weights: empty cell -> mean of its crossed top/bottom/left/right neighbours' inputs'''
+    rows, cols = shape
+    out = []
+    for cell, tap in enumerate(taps):
+        if tap:
+            out.append(tap)
+            continue
+        y, x = divmod(cell, cols)
+        neighbours = [taps[ny * cols + nx] for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1))
+                      if 0 <= ny < rows and 0 <= nx < cols and taps[ny * cols + nx]]
+        folded: Dict[int, float] = {}
+        for n in neighbours:
+            for i, w in n.items():
+                folded[i] = folded.get(i, 0.0) + w / len(neighbours)
+        out.append(folded)
+    return out
+
+
+def rasterize_segment(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    '''Grid cells along a straight segment, one per step of its longest axis, both endpoints included'''
+    (r0, c0), (r1, c1) = start, end
+    steps = max(abs(r1 - r0), abs(c1 - c0))
+    if steps == 0:
+        return [(r0, c0)]
+    cells = []
+    for s in range(steps + 1):
+        cell = (int(round(r0 + (r1 - r0) * s / steps)), int(round(c0 + (c1 - c0) * s / steps)))
+        if not cells or cells[-1] != cell:
+            cells.append(cell)
+    return cells
+
+
+def compile_layout(layout: Dict) -> LayoutMap:
+    '''Turn a layout description into its LayoutMap. Inputs follow the order of layout["segments"]'''
+    rows, cols = layout["grid"]
+    keys = list(layout["segments"])
+    crossing: List[List[int]] = [[] for _ in range(rows * cols)]
+
+    for i, key in enumerate(keys):
+        start, end = layout["segments"][key]
+        for r, c in rasterize_segment(tuple(start), tuple(end)):
+            if not (0 <= r < rows and 0 <= c < cols):
+                raise RuntimeError(f"LAYOUT SEGMENT OUTSIDE THE GRID: key={key}, cell={(r, c)}, grid={(rows, cols)}")
+            crossing[r * cols + c].append(i)
+
+    taps = [{i: 1.0 / len(c) for i in c} for c in crossing]
+    return LayoutMap(keys, (rows, cols), taps, fill_gaps=layout.get("fill_gaps", True))
+
+
+@lru_cache(maxsize=None)
+def compile_named_layout(name: str) -> LayoutMap:
+    '''Compiled once per session for each entry of program_configrations.HEATMAP_LAYOUTS'''
+    return compile_layout(program_configrations.HEATMAP_LAYOUTS[name])
+
+
+def resample_weights(n_in: int, n_out: int, method: str = "bilinear") -> numpy.ndarray:
+    '''
+    (n_out x n_in) 1-D interpolation matrix between cell centres, edges clamped.
+    "bilinear" is linear per axis, "bicubic" the Keys cubic (a = -0.5) per axis
+    '''
+    pos = numpy.clip((numpy.arange(n_out) + 0.5) * n_in / n_out - 0.5, 0, n_in - 1)
+    base = numpy.floor(pos).astype(int)
+    frac = pos - base
+    weights = numpy.zeros((n_out, n_in))
+    rows = numpy.arange(n_out)
+
+    if method == "bilinear":
+        taps = ((0, 1 - frac), (1, frac))
+    elif method == "bicubic":
+        a = -0.5
+        def cubic(d):
+            d = numpy.abs(d)
+            return numpy.where(d <= 1, (a + 2) * d ** 3 - (a + 3) * d ** 2 + 1,
+                               numpy.where(d < 2, a * d ** 3 - 5 * a * d ** 2 + 8 * a * d - 4 * a, 0.0))
+        taps = tuple((k, cubic(frac - k)) for k in (-1, 0, 1, 2))
+    else:
+        raise RuntimeError(f"UNKNOWN INTERPOLATION METHOD: method={method}")
+
+    for offset, w in taps:
+        numpy.add.at(weights, (rows, numpy.clip(base + offset, 0, n_in - 1)), w)
+    return weights
+
+
+class Upsampler:
+    """
+    Layout map followed by a separable bilinear / bicubic resize, composed once into a dense (pixels x inputs) matrix
+    so a frame (or a stack) is a single matrix product over all channels. Same `keys` / `shape` / `apply` interface as
+    LayoutMap, so it drops in wherever a layout is applied. Cells the layout leaves empty don't contribute (the
+    remaining weights are renormalized); pixels with no valid cell in reach get `missing`. A NaN channel only turns the
+    pixels it has weight on into NaN.
+    """
+
+    def __init__(self, layout: LayoutMap, shape: Tuple[int, int], method: str = "bilinear"):
+        self.keys = layout.keys
+        self.shape = tuple(shape)
+        self.missing = layout.missing
+
+        resize = numpy.kron(resample_weights(layout.shape[0], shape[0], method),
+                            resample_weights(layout.shape[1], shape[1], method))
+        resize[:, layout.empty] = 0.0
+        norm = resize.sum(axis=1)
+        self.empty = norm < 0.5            # MOSTLY OUTSIDE THE SENSED AREA
+        resize[~self.empty] /= norm[~self.empty, None]
+
+        self.matrix = numpy.ascontiguousarray((resize @ layout.dense()).T)     # (inputs x pixels)
+        self.support = (self.matrix != 0).astype(float)
+
+    def apply(self, values: numpy.ndarray) -> numpy.ndarray:
+        '''(n_inputs,) -> shape, or a stack (..., n_inputs) -> (..., *shape)'''
+        values = numpy.asarray(values, dtype=float)
+        nan = numpy.isnan(values)
+        if nan.any():
+            out = numpy.where(nan, 0.0, values) @ self.matrix
+            out[(nan.astype(float) @ self.support) > 0] = numpy.nan
+        else:
+            out = values @ self.matrix
+        out[..., self.empty] = self.missing
+        return out.reshape(values.shape[:-1] + self.shape)
+
+
+@lru_cache(maxsize=32)
+def compile_upsampler(layout: LayoutMap, shape: Tuple[int, int], method: str = "bilinear") -> Upsampler:
+    '''Weights computed once per (layout, output size, method)'''
+    return Upsampler(layout, shape, method)
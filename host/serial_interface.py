@@ -2,6 +2,7 @@ import serial
 import serial.tools.list_ports
 import threading
 import time
+from typing import List
 
 class SerialInterface:
     def __init__(self, baudrate=115200):
@@ -60,3 +61,48 @@ class SerialInterface:
                     break   
         # thread so that real-time reading does not block sending commands to device    
         threading.Thread(target=_read, daemon=True).start()
+
+
+class LineReader:
+    """
+    Event-driven line reader over an open pyserial port: blocks until at least one byte arrives (or the port timeout
+    expires), then drains everything already buffered and returns the complete lines at once. A partial last line is
+    kept for the next call. Exposes throughput (lines_per_s) and how far behind the reader is (backlog_bytes: bytes
+    that were already waiting in the OS buffer when the reader got to them).
+    """
+
+    RATE_WINDOW_S = 1.0
+
+    def __init__(self, ser):
+        self.ser = ser
+        self._partial = b""
+        self.lines_total = 0
+        self.lines_per_s = 0.0
+        self.backlog_bytes = 0
+        self.peak_backlog_bytes = 0
+        self._window_start = time.perf_counter()
+        self._window_lines = 0
+
+    def read_batch(self) -> List[str]:
+        '''Complete, stripped, non-empty lines received since the last call; [] on timeout'''
+        first = self.ser.read(1)
+        lines: List[str] = []
+        if first:
+            waiting = self.ser.in_waiting
+            self.backlog_bytes = waiting
+            self.peak_backlog_bytes = max(self.peak_backlog_bytes, waiting)
+            chunk = self._partial + first + (self.ser.read(waiting) if waiting else b"")
+            *complete, self._partial = chunk.split(b"\n")
+            lines = [line for line in (c.decode(errors="ignore").strip() for c in complete) if line]
+        self._count(len(lines))
+        return lines
+
+    def _count(self, n: int) -> None:
+        self.lines_total += n
+        self._window_lines += n
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= self.RATE_WINDOW_S:
+            self.lines_per_s = self._window_lines / elapsed
+            self._window_start = now
+            self._window_lines = 0
@@ -0,0 +1,133 @@
+"""
+strip_chart.py  –  Pure-Tk strip chart, lightweight alternative to the matplotlib waveform
+Texas A&M University X UADY
+"""
+
+import tkinter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+
+
+class StripChart(tkinter.Canvas):
+    """
+    One canvas polyline per channel, created once and moved with `coords`. Pixel coordinates are computed for all
+    channels at once in NumPy from the (already decimated) samples; axes, ticks and legend are only redrawn when the
+    view limits or the widget size change, so a normal frame costs one `coords` call per channel.
+    """
+
+    MARGIN_LEFT = 64
+    MARGIN_RIGHT = 12
+    MARGIN_TOP = 28
+    MARGIN_BOTTOM = 30
+    TICKS = 5
+    LEGEND_ROW = 16
+    FONT = ("Helvetica", 9)
+
+    def __init__(self, master, title: str = "", y_label: str = "", **kwargs):
+        kwargs.setdefault("bg", "white")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(master, **kwargs)
+        self.title = title
+        self.y_label = y_label
+
+        self.lines: Dict[str, int] = {}
+        self.colors: Dict[str, str] = {}
+        self.view: Optional[Tuple[Tuple[float, float], Tuple[float, float]]] = None
+        self.message: Optional[str] = None
+        self.size = (1, 1)
+
+        self.bind("<Configure>", self._on_resize)
+
+    # ----- SETUP (SELECTION / WINDOW CHANGES) -----
+    def set_channels(self, channels: List[str], colors: List[str]) -> None:
+        self.delete("all")
+        self.message = None
+        self.view = None
+        self.colors = dict(zip(channels, colors))
+        self.lines = {ch: self.create_line(0, 0, 0, 0, fill=color, width=1, state="hidden", tags=("trace",))
+                      for ch, color in self.colors.items()}
+
+    def show_message(self, text: str) -> None:
+        self.set_channels([], [])
+        self.message = text
+        self._draw_static()
+
+    def set_view(self, x_lims: Tuple[float, float], y_lims: Tuple[float, float]) -> None:
+        '''x in epoch seconds. Redraws axes / ticks / legend, the traces keep their items'''
+        self.view = (x_lims, y_lims)
+        self._draw_static()
+
+    # ----- PER FRAME -----
+    def update_data(self, t: numpy.ndarray, values: numpy.ndarray) -> None:
+        if self.view is None or not self.lines or len(t) < 2:
+            return
+        (x_lo, x_hi), (y_lo, y_hi) = self.view
+        left, top, right, bottom = self.plot_box()
+
+        px = left + (t - x_lo) * ((right - left) / (x_hi - x_lo))
+        py = bottom - (values - y_lo) * ((bottom - top) / (y_hi - y_lo))
+
+        for i, item in enumerate(self.lines.values()):
+            ok = numpy.isfinite(py[:, i])
+            if ok.sum() < 2:
+                self.itemconfigure(item, state="hidden")
+                continue
+            xy = numpy.empty(ok.sum() * 2)
+            xy[0::2] = px[ok]
+            xy[1::2] = py[ok, i]
+            self.coords(item, xy.tolist())
+            self.itemconfigure(item, state="normal")
+
+    # ----- STATIC LAYER -----
+    def plot_box(self) -> Tuple[float, float, float, float]:
+        width, height = self.size
+        legend_h = self.LEGEND_ROW * ((len(self.lines) + 3) // 4)
+        return (self.MARGIN_LEFT, self.MARGIN_TOP + legend_h,
+                max(width - self.MARGIN_RIGHT, self.MARGIN_LEFT + 1), max(height - self.MARGIN_BOTTOM, 1))
+
+    def _on_resize(self, event) -> None:
+        self.size = (event.width, event.height)
+        self._draw_static()
+
+    def _draw_static(self) -> None:
+        self.delete("static")
+        width, height = self.size
+        left, top, right, bottom = self.plot_box()
+
+        self.create_text(width / 2, 4, text=self.title, anchor="n", font=("Helvetica", 10, "bold"), tags="static")
+        if self.message:
+            self.create_text(width / 2, height / 2, text=self.message, font=self.FONT, tags="static")
+            return
+
+        self.create_rectangle(left, top, right, bottom, outline="#888888", tags="static")
+        self.create_text(12, (top + bottom) / 2, text=self.y_label, angle=90, font=self.FONT, tags="static")
+
+        # LEGEND: 4 CHANNELS PER ROW ABOVE THE PLOT
+        col_w = (right - left) / 4
+        for i, (ch, color) in enumerate(self.colors.items()):
+            x = left + (i % 4) * col_w
+            y = self.MARGIN_TOP + (i // 4) * self.LEGEND_ROW
+            self.create_line(x, y + 6, x + 14, y + 6, fill=color, width=2, tags="static")
+            self.create_text(x + 18, y + 6, text=ch, anchor="w", font=self.FONT, tags="static")
+
+        if self.view is not None:
+            (x_lo, x_hi), (y_lo, y_hi) = self.view
+            for k in range(self.TICKS):
+                frac = k / (self.TICKS - 1)
+                x = left + frac * (right - left)
+                stamp = datetime.fromtimestamp(x_lo + frac * (x_hi - x_lo), timezone.utc)
+                self.create_line(x, bottom, x, bottom + 4, fill="#888888", tags="static")
+                self.create_text(x, bottom + 6, text=stamp.strftime("%H:%M:%S"), anchor="n", font=self.FONT,
+                                 tags="static")
+
+                y = bottom - frac * (bottom - top)
+                self.create_line(left - 4, y, left, y, fill="#888888", tags="static")
+                self.create_line(left, y, right, y, fill="#eeeeee", tags="static")
+                self.create_text(left - 6, y, text=f"{y_lo + frac * (y_hi - y_lo):.4g}", anchor="e", font=self.FONT,
+                                 tags="static")
+
+        # GRID / FRAME BEHIND THE TRACES
+        if self.lines:
+            self.tag_raise("trace")
@@ -0,0 +1,54 @@
+import math
+
+import numpy
+import pytest
+
+from bending_cycles import CycleAnalyzer
+
+
+def _sweeps(n_cycles, period=4.0, dt=0.01, low=5.0, high=95.0, hysteresis=10.0, noise=0.0, seed=0):
+    '''Triangle sweeps low -> high -> low, R = 1000 + 2·angle, plus `hysteresis` Ω on the way up and minus on the way back'''
+    t = numpy.arange(int(n_cycles * period / dt)) * dt
+    phase = (t % period) / period
+    up = phase < 0.5
+    angle = low + (high - low) * numpy.where(up, 2 * phase, 2 * (1 - phase))
+    r = 1000 + 2 * angle + numpy.where(up, hysteresis, -hysteresis)
+    angle = angle + numpy.random.default_rng(seed).normal(0, noise, len(t))
+    return t, angle, r
+
+
+def test_cycles_split_at_minima_with_hysteresis_stats():
+    t, angle, r = _sweeps(5)
+    analyzer = CycleAnalyzer(deadband=1.0)
+    closed = analyzer.extend(zip(t.tolist(), angle.tolist(), r.tolist()))
+
+    # THE LAST SWEEP ENDS WITHOUT A CONFIRMED MINIMUM, SO IT'S STILL OPEN
+    assert closed == len(analyzer.cycles) == 4
+    for i, c in enumerate(analyzer.cycles):
+        assert c.index == i + 1
+        assert c.t_start == pytest.approx(4.0 * i)
+        assert c.period == pytest.approx(4.0)
+        assert c.max_angle == pytest.approx(95.0)
+        assert c.peak_resistance == pytest.approx(r.max())
+        assert c.delta_r_max_angle == pytest.approx(2 * 90 - 2 * 10)
+        # ∮ R dθ = 2 · hysteresis · sweep, minus the two samples where the direction flips
+        assert c.loop_area == pytest.approx(2 * 10 * 90, rel=0.01)
+
+
+def test_jitter_inside_deadband_does_not_split_cycles():
+    t, angle, r = _sweeps(6, noise=0.2)
+    analyzer = CycleAnalyzer(deadband=1.5)
+    analyzer.extend(zip(t.tolist(), angle.tolist(), r.tolist()))
+    assert len(analyzer.cycles) == 5
+    assert [round(c.period, 1) for c in analyzer.cycles] == [4.0] * 5
+
+
+def test_missing_resistance_is_skipped():
+    t, angle, _ = _sweeps(3)
+    analyzer = CycleAnalyzer()
+    analyzer.extend((ti, ai, None) for ti, ai in zip(t.tolist(), angle.tolist()))
+    assert len(analyzer.cycles) == 2
+    c = analyzer.cycles[0]
+    assert math.isnan(c.peak_resistance) and math.isnan(c.delta_r_max_angle)
+    assert c.loop_area == 0.0
+    assert c.period == pytest.approx(4.0)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Per-line cost of the bending report parser: former ast.literal_eval path vs bending_telemetry.parse_report.
+Run from host/:  python test/bending_telemetry_bench.py [lines]
+"""
+import ast
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bending_telemetry import parse_report
+
+LIST_LINE = "['modo', 1, 'velocity', 7, 'angle', 12.345678]"
+COMPACT_LINE = "T,1,7,12.345678"
+
+
+def literal_eval_parse(line):
+    '''Body of the former BendingPage._parse_modo_velocity_angle (happy path)'''
+    items = ast.literal_eval(line)
+    d = {items[i].strip().lower(): items[i + 1] for i in range(0, len(items) - 1, 2) if isinstance(items[i], str)}
+    return int(d["modo"]), float(d["velocity"]), float(d["angle"]), None
+
+
+def per_line_us(fn, line, n):
+    runs = timeit.repeat(lambda: fn(line), number=n, repeat=5)
+    return statistics.median(runs) / n * 1e6
+
+
+if __name__ == "__main__":
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    for name, fn, line in (("literal_eval, list", literal_eval_parse, LIST_LINE),
+                           ("parse_report, list", parse_report, LIST_LINE),
+                           ("parse_report, compact", parse_report, COMPACT_LINE)):
+        print(f"{name:>22}: {per_line_us(fn, line, n_lines):6.2f} us/line")
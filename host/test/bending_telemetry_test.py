@@ -0,0 +1,80 @@
+import ast
+
+import pytest
+
+from bending_telemetry import NO_REPORT, ReportInterval, batch_times, parse_report
+
+
+def _literal_eval_reference(line):
+    '''The former BendingPage parser, kept here to pin the new one to its results'''
+    try:
+        items = ast.literal_eval(line)
+    except Exception:
+        return NO_REPORT
+    if not isinstance(items, list):
+        return NO_REPORT
+    d = {items[i].strip().lower(): items[i + 1] for i in range(0, len(items) - 1, 2) if isinstance(items[i], str)}
+    try:
+        modo = int(d.get("modo"))
+    except Exception:
+        return NO_REPORT
+
+    def to_float(x):
+        try:
+            return float(x.strip() if isinstance(x, str) else x) if isinstance(x, (int, float, str)) else None
+        except ValueError:
+            return None
+
+    velocity = to_float(d.get("velocity", d.get("velocidad")))
+    angle = to_float(d.get("angle", d.get("angulo")))
+    resistance = d.get("resistance", d.get("resistencia"))
+    if velocity is None or angle is None:
+        return NO_REPORT
+    return modo, velocity, angle, to_float(resistance) if resistance is not None else None
+
+
+@pytest.mark.parametrize("line", [
+    "['modo', 1, 'velocity', 7, 'angle', 12.3]",
+    "['modo', 2, 'init_angle', 0, 'final_angle', 90, 'step_angle', 5, 'velocity', 7, 'angle', 45.0, "
+    "'rep', 1, 'idx', 3]",
+    "['modo', 3, 'angle', 1, 'init_vel', 7, 'final_vel', 30, 'step_vel', 1]",
+    "['modo', '1', 'velocidad', '7.5', 'angulo', 3, 'resistance', 1234.5]",
+    "['MODO', 1.7, ' Velocity', 7, 'angle', -1e-3, 'resistance', None]",
+    "['modo', 1, 'velocity', 7, 'angle', 'x']",
+    "['modo', 1, 'velocity', 7, 'angle', 12.3",
+    "Modo1: Hall 90° detectado. Invirtiendo a BACKWARD.",
+    "[1, 2, 3]",
+])
+def test_list_reports_match_literal_eval(line):
+    assert parse_report(line) == _literal_eval_reference(line)
+
+
+def test_compact_reports():
+    assert parse_report("T,1,7,12.3") == (1, 7.0, 12.3, None)
+    assert parse_report("T,2,7,45.0,1100.5") == (2, 7.0, 45.0, 1100.5)
+    assert parse_report("T,1,7") == NO_REPORT
+
+
+def test_batch_times_back_date_and_never_go_backwards():
+    assert batch_times(1, 5.0, 4.85) == [5.0]
+    assert batch_times(3, 5.0, 4.0, interval_s=0.15) == pytest.approx([4.7, 4.85, 5.0])
+    # BACKLOG LONGER THAN THE GAP SINCE THE LAST BATCH: SPREAD EVENLY AFTER IT
+    times = batch_times(4, 5.0, 4.8, interval_s=0.15)
+    assert times == pytest.approx([4.85, 4.9, 4.95, 5.0])
+    assert times[0] > 4.8
+
+
+def test_report_interval_follows_the_firmware_period():
+    est = ReportInterval(initial_s=0.150)
+    t = 0.0
+    for _ in range(200):                    # FIRMWARE NOW REPORTS EVERY 250 MS
+        t += 0.250
+        est.observe(1, t)
+    assert est.value == pytest.approx(0.250, abs=1e-3)
+
+    before = est.value
+    est.observe(3, t + 0.9)                 # BACKLOG BATCH: ITS ARRIVAL SAYS NOTHING ABOUT THE SPACING
+    est.observe(1, t + 1.15)
+    est.observe(1, t + 30.0)                # PAUSE
+    est.observe(1, t + 30.001)              # ONE REPORT SPLIT OVER TWO READS
+    assert est.value == before
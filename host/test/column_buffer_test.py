@@ -0,0 +1,32 @@
+import numpy
+
+from column_buffer import ColumnBuffer, DecimatedSeries
+
+
+def test_buffer_grows_and_keeps_missing_as_nan():
+    buf = ColumnBuffer(["time", "velocity", "angle", "resistance"], capacity=2)
+    for i in range(5):
+        buf.append((i * 0.1, 7.0, float(i), None if i % 2 else 1000.0 + i))
+    view = buf.rows(3)
+
+    buf.extend(numpy.ones((10, 4)))
+
+    assert len(buf) == 15 and len(buf.data) == 16
+    numpy.testing.assert_array_equal(buf.column("angle", 0)[:5], [0, 1, 2, 3, 4])
+    assert numpy.isnan(buf.column("resistance")[[1, 3]]).all()
+    numpy.testing.assert_array_equal(view[:, 2], [3, 4])     # OLD VIEW STILL VALID AFTER GROWTH
+
+
+def test_decimated_series_keeps_a_uniform_stride_across_slices():
+    rng = numpy.random.default_rng(0)
+    series = DecimatedSeries(max_points=101)
+    total = 0
+    for _ in range(200):
+        n = int(rng.integers(0, 60))
+        x = numpy.arange(total, total + n, dtype=float)
+        series.extend(x, -x)
+        total += n
+
+    assert series.size <= 101
+    numpy.testing.assert_array_equal(series.x, numpy.arange(0, total, series.stride))
+    numpy.testing.assert_array_equal(series.y, -series.x)
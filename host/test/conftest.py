@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# HOST MODULES IMPORT EACH OTHER FLAT (from payload import Payload), SAME AS WHEN RUNNING host/main.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,40 @@
+import csv
+import threading
+import time
+
+import numpy
+
+from column_buffer import ColumnBuffer
+from csv_stream import CsvStream
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_stream_appends_blocks_and_finalizes(tmp_path):
+    path = tmp_path / "session.csv"
+    buffer = ColumnBuffer(["time", "velocity", "angle", "resistance"], capacity=4)
+    lock = threading.Lock()
+    stream = CsvStream(str(path), buffer.fields, buffer, lock, flush_interval_s=0.01)
+
+    with lock:
+        buffer.append((0.0, 7.0, 1.5, None))
+        buffer.append((0.1, 7.0, 2.5, 1000.0))
+    deadline = time.monotonic() + 2.0
+    while stream.written < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # ON DISK BEFORE STOP: A CRASH HERE KEEPS THESE ROWS
+    assert _read(path)[1:] == [["0.0", "7.0", "1.5", ""], ["0.1", "7.0", "2.5", "1000.0"]]
+
+    with lock:
+        buffer.extend(numpy.arange(40, dtype=float).reshape(10, 4))
+    assert stream.finalize() == 12
+    assert stream.error is None
+
+    rows = _read(path)
+    assert rows[0] == ["time", "velocity", "angle", "resistance"]
+    assert len(rows) == 13
+    assert rows[-1] == ["36.0", "37.0", "38.0", "39.0"]
+    assert stream.write_pending() == 0
@@ -0,0 +1,42 @@
+import numpy
+
+from decimation import MinMaxDecimator, minmax_buckets
+from payload import Payload
+
+
+def _payload(n, channels=3):
+    keys = [f"R{i}" for i in range(channels)]
+    p = Payload(window_size=n + 10, num_rows_detach=1, out_file_name="unused.csv", channels=channels, keys=keys)
+    return p, keys
+
+
+def _push(p, values):
+    for row in values:
+        p.push(",".join(str(v) for v in row))
+
+
+def test_buckets_keep_peaks_in_time_order():
+    t = numpy.arange(8, dtype=float)
+    y = numpy.array([[0], [5], [1], [2], [3], [-4], [2], [9]], dtype=float)
+
+    x_out, y_out = minmax_buckets(t, y, 4)
+
+    numpy.testing.assert_array_equal(x_out, [0, 3, 4, 7])
+    numpy.testing.assert_array_equal(y_out[:, 0], [0, 5, -4, 9])
+
+
+def test_incremental_matches_fresh_decimation():
+    rng = numpy.random.default_rng(0)
+    data = rng.normal(size=(3000, 3))
+    p, keys = _payload(3000)
+
+    incremental = MinMaxDecimator()
+    for chunk in numpy.array_split(data, 17):
+        _push(p, chunk)
+        x_inc, y_inc = incremental.window(p, keys, 1000, 100)
+
+    x_new, y_new = MinMaxDecimator().window(p, keys, 1000, 100)
+    numpy.testing.assert_array_equal(x_inc, x_new)
+    numpy.testing.assert_array_equal(y_inc, y_new)
+    assert len(x_new) <= 2 * 100 + 2
+    assert y_new.max() == data[-1000:].max()
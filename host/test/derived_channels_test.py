@@ -0,0 +1,59 @@
+import threading
+
+import numpy
+
+from payload import Payload
+
+
+def _payload(baseline_samples, out_file_name="unused.csv"):
+    keys = ["LOAD", "R0", "R1"]
+    return Payload(window_size=100, num_rows_detach=10, out_file_name=out_file_name, channels=2, keys=keys,
+                   baseline_samples=baseline_samples)
+
+
+def test_auto_baseline_from_first_samples():
+    p = _payload(baseline_samples=4)
+    for r0, r1 in [(100, 10), (100, 10), (102, 12), (98, 8), (110, 15)]:
+        p.push(f"1.0,{r0},{r1}")
+
+    numpy.testing.assert_allclose(p.relative.ro, [100, 10])
+    assert p.relative.samples.total == p.samples.total == 5
+    _, values = p.relative.tail_arrays(["R0", "R1"], 5)
+    numpy.testing.assert_allclose(values[:, 0], [0, 0, 0.02, -0.02, 0.1])
+    numpy.testing.assert_allclose(values[-1, 1], 0.5)
+
+
+def test_tare_and_manual_baseline():
+    p = _payload(baseline_samples=0)
+    p.push("1.0,200,50")
+    assert not p.relative.ready
+    assert numpy.isnan(p.relative.get_most_recent_data()["R0"])
+
+    p.relative.tare(1)
+    p.push("1.0,220,40")
+    assert p.relative.get_most_recent_data() == {"R0": 0.1, "R1": -0.2}
+
+    p.relative.set_baseline(100)
+    numpy.testing.assert_allclose(p.relative.tail_arrays(["R0"], 2)[1][:, 0], [1.0, 1.2])
+
+
+def test_tare_during_pushes_keeps_rings_aligned(tmp_path):
+    p = _payload(baseline_samples=0, out_file_name=str(tmp_path / "detached.csv"))
+    p.push("1.0,100,10")
+    done = threading.Event()
+
+    def tare_loop():
+        while not done.is_set():
+            p.relative.tare(5)
+
+    t = threading.Thread(target=tare_loop)
+    t.start()
+    try:
+        for i in range(2000):
+            p.push(f"1.0,{100 + i % 7},{10 + i % 3}")
+    finally:
+        done.set()
+        t.join()
+
+    assert p.relative.samples.total == p.samples.total
+    numpy.testing.assert_array_equal(p.relative.samples.tail()[:, 0], p.samples.tail()[:, 0])
@@ -0,0 +1,81 @@
+import numpy
+import pytest
+
+import program_configrations
+from heatmap import Heatmap, check_header, compile_diagonal_plan, fill_gaps, layout_inputs
+
+
+class _Recent:
+    def __init__(self, data):
+        self.data = data
+
+    def get_most_recent_data(self):
+        return self.data
+
+
+def _values(seed=0):
+    rng = numpy.random.default_rng(seed)
+    return {k: float(rng.normal(11_000, 500)) for k in program_configrations.S5X41_SWITCHER}
+
+
+def test_plan_is_compiled_once_per_layout():
+    coords = tuple(sorted(program_configrations.S5X41_SWITCHER.values()))
+    assert compile_diagonal_plan(coords) is compile_diagonal_plan(coords)
+
+
+def test_diagonal_cells_average_the_crossing_lines():
+    data = _values()
+    by_coord = {program_configrations.S5X41_SWITCHER[k]: v for k, v in data.items()}
+
+    mat = Heatmap(_Recent(data)).calc_pts_diagonal(program_configrations.S5X41_SWITCHER)
+
+    assert mat.shape == (5, 43)
+    # 1-1' / 1-3' CORNER AND THE 2-4' LINE WITHOUT INTERSECTIONS
+    assert mat[0, 2] == (by_coord[(1, 1)] + by_coord[(1, 3)]) / 2
+    assert mat[0, 4] == by_coord[(2, 4)]
+    # BASE CASE: LINE 3-5' CROSSING 5-3' ON THE BOTTOM ROW
+    assert mat[2, 8] == (by_coord[(3, 5)] + by_coord[(5, 3)]) / 2
+
+
+def test_fill_gaps_stack_matches_single_frames():
+    rng = numpy.random.default_rng(3)
+    stack = rng.normal(size=(6, 5, 9))
+    stack[rng.random(stack.shape) < 0.4] = -1.0
+
+    filled = fill_gaps(stack)
+
+    for frame, expected in zip(stack, filled):
+        numpy.testing.assert_array_equal(fill_gaps(frame), expected)
+    # ISOLATED GAP: MEAN OF ITS FOUR ORIGINAL NEIGHBOURS
+    grid = numpy.array([[-1, 2, -1], [4, -1, 6], [-1, 8, -1]], dtype=float)
+    assert fill_gaps(grid)[1, 1] == 5.0
+    assert fill_gaps(grid)[0, 0] == 3.0
+
+
+def test_batch_frames_match_single_frame_mapping():
+    keys = ["5001 <LOAD> (VDC)"] + list(program_configrations.S5X41_SWITCHER)
+    rng = numpy.random.default_rng(7)
+    block = rng.normal(11_000, 500, size=(25, len(keys)))
+
+    layout, values = layout_inputs(keys, block, program_configrations.S5X41_SWITCHER)
+    frames = layout.apply(values)
+
+    assert frames.shape == (25, 5, 43)
+    for row, frame in zip(block, frames):
+        single = Heatmap(_Recent(dict(zip(keys, row)))).calc_pts_diagonal(program_configrations.S5X41_SWITCHER)
+        numpy.testing.assert_array_equal(frame, single)
+
+
+def test_header_is_validated_once_and_frames_stay_silent(capsys, recwarn):
+    keys = ["5001 <LOAD> (VDC)", "Unknown (1234)"] + list(program_configrations.S5X41_SWITCHER)
+    hm = Heatmap(_Recent(dict.fromkeys(keys, 11_000.0)))
+
+    for _ in range(5):
+        hm.calc_pts_diagonal(program_configrations.S5X41_SWITCHER)
+
+    assert len(recwarn) == 1
+    assert capsys.readouterr().out == ""
+    assert check_header(tuple(keys), tuple(program_configrations.S5X41_SWITCHER.items())).unknown == \
+        ("5001 <LOAD> (VDC)", "Unknown (1234)")
+    with pytest.raises(RuntimeError):
+        Heatmap(_Recent(dict.fromkeys(keys, 1.0)), strict=True).calc_pts_diagonal(program_configrations.S5X41_SWITCHER)
@@ -0,0 +1,126 @@
+import importlib.util
+import io
+from pathlib import Path
+
+# MCU/main.py IS MICROPYTHON FIRMWARE THAT ALSO RUNS UNDER CPYTHON; LOADED BY PATH (host/main.py OWNS THE NAME "main")
+_spec = importlib.util.spec_from_file_location("mcu_main", Path(__file__).resolve().parents[2] / "MCU" / "main.py")
+mcu_main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(mcu_main)
+
+
+def test_acquisition_averages_oversamples_and_writes_blocks():
+    out = io.StringIO()
+    writes = []
+    out.write = lambda s, _w=out.write: (writes.append(s), _w(s))[1]
+    reads = iter(range(10_000))
+    acq = mcu_main.Acquisition(3, lambda i: next(reads), rate_hz=1000, oversample=2, block=4, out=out)
+
+    for _ in range(10):
+        acq.sample()
+        if acq.pending >= acq.block:
+            acq.flush(acq.block)
+    acq.flush()
+
+    rows = [[float(v) for v in line.split(",")] for line in out.getvalue().splitlines()]
+    # SAMPLE s, COLUMN i READS 6s + 2i AND 6s + 2i + 1 -> MEAN 6s + 2i + 0.5
+    assert rows == [[6 * s + 2 * i + 0.5 for i in range(3)] for s in range(10)]
+    assert [w.count("\n") for w in writes] == [4, 4, 2]
+    assert acq.dropped == 0
+
+
+def test_ring_keeps_the_newest_rows_when_the_host_falls_behind():
+    out = io.StringIO()
+    values = iter(range(100))
+    acq = mcu_main.Acquisition(1, lambda i: next(values), block=2, out=out)
+    for _ in range(acq.capacity + 3):
+        acq.sample()
+    assert acq.flush() == acq.capacity
+    assert acq.dropped == 3
+    assert [float(v) for v in out.getvalue().split()] == list(range(3, acq.capacity + 3))
+
+
+def _handler(monkeypatch, commands):
+    out = io.StringIO()
+    monkeypatch.setattr(mcu_main.sys, "stdout", out)
+    monkeypatch.setattr(mcu_main.sys, "stdin", io.StringIO(commands))
+    return mcu_main.DataHandler(), out
+
+
+def test_acq_command_runs_a_timed_capture(monkeypatch):
+    dh, out = _handler(monkeypatch, "1\n0,8\nACQ 2000HZ 4OS 8BLK 20N\n")
+    for _ in range(3):
+        dh.poll()
+    assert dh.channels == 8 and dh.streaming
+    while dh.streaming:
+        dh.poll()
+
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "0" and lines[1].startswith("5001 <LOAD> (VDC),5021 <DISP> (VDC),1001 <R1>")
+    assert len(lines[2:]) == 20
+    assert all(len(line.split(",")) == 10 for line in lines[2:])
+    assert dh.acq.samples == 20 and (dh.rate_hz, dh.oversample, dh.block) == (2000, 4, 8)
+
+
+def test_commands_are_served_while_streaming(monkeypatch):
+    clock = [0]                                     # SIMULATED ticks_us(), STEPPED BY HAND
+    monkeypatch.setattr(mcu_main, "ticks_us", lambda: clock[0])
+    monkeypatch.setattr(mcu_main, "ticks_diff", lambda a, b: a - b)
+    dh, out = _handler(monkeypatch, "1\n0,8\nACQ 1000HZ 4BLK\n")
+    for _ in range(3):
+        dh.poll()
+    assert dh.streaming and dh.acq.samples == 1
+
+    sampled = []
+    # 50 MS AT 1 kHz IN 250 US PASSES: ONE SAMPLE EVERY 4TH PASS, THE FIRST ONE TAKEN AT THE ACQ COMMAND
+    for _ in range(199):
+        clock[0] += 250
+        dh.poll()
+        # A COMMAND ARRIVING MID-STREAM IS ANSWERED ON THE NEXT PASS, SAMPLING CARRIES ON
+        if dh.acq.samples >= 10 and not sampled:
+            sampled.append(dh.acq.samples)
+            dh.commands.stream = io.StringIO("0\n")
+    assert dh.streaming and dh.acq.samples > sampled[0]
+    assert "\n0\n" in out.getvalue()
+    assert dh.acq.samples == 50
+
+    dh.commands.stream = io.StringIO("PAUSE\n")
+    dh.poll()
+    assert not dh.streaming and dh.acq.pending == 0
+
+
+class _ManualTimer:
+    '''Stands in for machine.Timer: the test fires the callback itself, between main-loop passes'''
+    PERIODIC = 1
+    instances = []
+
+    def __init__(self, _id):
+        self.callback = None
+        _ManualTimer.instances.append(self)
+
+    def init(self, mode, freq, callback):
+        self.callback = callback
+
+    def deinit(self):
+        self.callback = None
+
+
+def test_timer_sampling_stops_at_the_requested_count(monkeypatch):
+    monkeypatch.setattr(mcu_main, "Timer", _ManualTimer)
+    dh, out = _handler(monkeypatch, "1\n0,8\nACQ 2000HZ 8BLK 20N\n")
+    for _ in range(3):
+        dh.poll()
+    timer = _ManualTimer.instances[-1]
+    assert dh.streaming and dh.acq.timer is timer
+
+    # THE TIMER FIRES 3 TIMES PER PASS: 24 TICKS BEFORE THE LOOP NOTICES 20 WERE REQUESTED
+    while dh.streaming:
+        for _ in range(3):
+            if timer.callback is not None:
+                timer.callback(timer)
+        dh.poll()
+
+    assert len(out.getvalue().splitlines()[2:]) == 20
+    assert dh.acq.samples == 20 and dh.acq.pending == 0
+    dh.commands.stream = io.StringIO("r\n")         # HOST-POLLED SAMPLES STILL WORK AFTER THE CAPTURE
+    dh.poll()
+    assert dh.acq.samples == 21
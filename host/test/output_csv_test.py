@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy
+
+from payload import Payload, read_output_csv
+
+
+def test_reads_back_detached_and_exported_rows(tmp_path):
+    path = tmp_path / "run.csv"
+    p = Payload(window_size=6, num_rows_detach=3, out_file_name=str(path), channels=2, keys=["LOAD", "R0", "R1"])
+    start = datetime(2025, 3, 14, 9, 26, 53, 589000, tzinfo=timezone.utc)
+    times = [start + timedelta(milliseconds=125 * i) for i in range(8)]
+    for i, t in enumerate(times):
+        p.push(f"{i}.5,{100 + i},{10 + i}", time=t)
+
+    p.to_csv()                  # FIRST 3 ROWS WERE DETACHED (ISO TIMES), THE REST ARE EXPORTED AS dd/mm/YYYY ...:ms
+
+    epoch, keys, block = read_output_csv(str(path))
+
+    assert keys == ["LOAD", "R0", "R1"]
+    numpy.testing.assert_allclose(epoch, [t.timestamp() for t in times], atol=1e-6)
+    numpy.testing.assert_array_equal(block[:, 1], numpy.arange(100, 108))
+    assert block[0, 0] == 0.5
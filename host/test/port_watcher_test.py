@@ -0,0 +1,29 @@
+from port_watcher import PortInfo, PortWatcher
+
+
+def test_watcher_notifies_only_on_changes():
+    listing = [PortInfo("/dev/ttyACM0", "Board in FS mode", 0x2E8A, 0x0005, "E6614103E7")]
+    calls = []
+    watcher = PortWatcher(enumerate_ports=lambda: (calls.append(1), tuple(listing))[1])
+    seen = []
+
+    assert watcher.poll()
+    watcher.subscribe(seen.append)                  # GETS THE CACHED LIST RIGHT AWAY
+    assert seen == [tuple(listing)]
+    assert seen[0][0].board == "Raspberry Pi Pico (MicroPython)"
+    assert seen[0][0].label == "/dev/ttyACM0 — Board in FS mode  [Raspberry Pi Pico (MicroPython)]"
+
+    watcher.rescan()
+    assert not watcher.poll()                       # SAME DEVICES: NO NOTIFICATION
+    listing.append(PortInfo("/dev/ttyUSB0", "n/a"))
+    watcher.rescan()
+    assert watcher.poll()
+    assert [p.device for p in seen[-1]] == ["/dev/ttyACM0", "/dev/ttyUSB0"]
+    assert seen[-1][1].board is None and seen[-1][1].label == "/dev/ttyUSB0"
+    assert watcher.find("/dev/ttyUSB0") is seen[-1][1]
+
+    watcher.unsubscribe(seen.append)
+    listing.pop(0)
+    watcher.rescan()
+    assert watcher.poll() and len(seen) == 2
+    assert watcher.scans == len(calls)
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+import preset_store
+from preset_store import PresetStore
+
+
+def test_namespaces_share_one_file_and_writes_replace_it(tmp_path):
+    path = tmp_path / "presets.json"
+    control = PresetStore("control", path=path)
+    bending = PresetStore("bending", {"Base": {"modo": 1}}, path=path)
+
+    control.save_user_preset("Config 1", {"machine": "Shimadzu", "general": {"max data": "500"}})
+    bending.save_user_preset(" Mi M1 ", {"modo": 1, "angle": 10, "speed": 7})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "control": {"Config 1": {"machine": "Shimadzu", "general": {"max data": "500"}}},
+        "bending": {"Mi M1": {"modo": 1, "angle": 10, "speed": 7}},
+    }
+    assert list(bending.load_all()) == ["Base", "Mi M1"]
+    assert [p.name for p in tmp_path.iterdir()] == ["presets.json"]        # NO TEMP FILES LEFT
+
+    with pytest.raises(ValueError):
+        bending.save_user_preset("Base", {"modo": 2})
+    assert not bending.delete_user_preset("Base")
+    assert bending.delete_user_preset("Mi M1")
+    assert list(bending.load_all()) == ["Base"]
+    assert list(control.load_all()) == ["Config 1"]
+
+
+def test_reads_are_cached_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "presets.json"
+    path.write_text(json.dumps({"control": {"A": {}}}), encoding="utf-8")
+    store = PresetStore("control", path=path)
+    assert list(store.load_all()) == ["A"]
+
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(preset_store.json, "load", lambda f: loads.append(1) or real_load(f))
+    store.load_all()
+    assert loads == []
+
+    path.write_text(json.dumps({"control": {"A": {}, "B": {}}}), encoding="utf-8")
+    os.utime(path, ns=(0, 10 ** 18))
+    assert list(store.load_all()) == ["A", "B"]
+    assert loads == [1]
+
+
+def test_malformed_file_is_rejected(tmp_path):
+    path = tmp_path / "presets.json"
+    path.write_text("PRESETS = {'A': {}}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        PresetStore("control", path=path).load_all()
+    path.write_text(json.dumps(["A"]), encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        PresetStore("control", path=path).load_all()
@@ -0,0 +1,87 @@
+from render_scheduler import RenderScheduler
+
+
+class _StubRoot:
+    '''Stands in for Tk: keeps the scheduled callbacks so the test runs them explicitly'''
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = (ms, callback)
+        return self.next_id
+
+    def after_idle(self, callback):
+        return self.after("idle", callback)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for _, callback in jobs.values():
+            callback()
+
+
+def test_requests_coalesce_and_only_the_visible_page_renders():
+    root = _StubRoot()
+    scheduler = RenderScheduler(root)
+    drawn = []
+    scheduler.register("control", lambda: drawn.append("control"), version=lambda: 0)
+    scheduler.register("heatmap", lambda: drawn.append("heatmap"), version=lambda: 0)
+    scheduler.show("control")
+    scheduler.start()
+
+    for _ in range(5):
+        scheduler.request()
+    scheduler.request("heatmap")                        # HIDDEN: MARKED DIRTY, NOT DRAWN
+    assert len(root.jobs) == 1 and list(root.jobs.values())[0][0] == "idle"
+    root.run_pending()
+    assert drawn == ["control"]
+
+    root.run_pending()                                  # NOTHING NEW: NO REDRAW, LOOP KEEPS TICKING
+    assert drawn == ["control"] and len(root.jobs) == 1
+
+    scheduler.show("heatmap")
+    root.run_pending()
+    assert drawn == ["control", "heatmap"]
+
+    scheduler.stop()
+    assert root.jobs == {}
+    scheduler.request()
+    assert root.jobs == {}
+
+
+def test_version_getter_triggers_redraw():
+    root = _StubRoot()
+    scheduler = RenderScheduler(root)
+    version = [0]
+    drawn = []
+    scheduler.register("control", lambda: drawn.append(version[0]), version=lambda: version[0])
+    scheduler.show("control")
+    scheduler.start()
+
+    root.run_pending()
+    root.run_pending()
+    version[0] = 1
+    root.run_pending()
+    assert drawn == [0, 1]
+
+
+def test_render_error_keeps_the_loop_running(capsys):
+    root = _StubRoot()
+    scheduler = RenderScheduler(root)
+
+    def broken():
+        raise ValueError("boom")
+
+    scheduler.register("control", broken)
+    scheduler.show("control")
+    scheduler.start()
+    root.run_pending()
+
+    assert "Render error (control): boom" in capsys.readouterr().out
+    assert len(root.jobs) == 1
+    assert scheduler.MIN_INTERVAL_MS <= scheduler.interval_ms <= scheduler.MAX_INTERVAL_MS
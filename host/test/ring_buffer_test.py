@@ -0,0 +1,28 @@
+import numpy
+
+from ring_buffer import RingBuffer
+
+
+def test_tail_is_chronological_after_wrap():
+    ring = RingBuffer(capacity=5, width=2)
+    for i in range(8):
+        ring.append([i, i * 10])
+
+    assert len(ring) == 5
+    assert ring.total == 8
+    numpy.testing.assert_array_equal(ring.tail(3)[:, 0], [5, 6, 7])
+    numpy.testing.assert_array_equal(ring.tail()[:, 1], [30, 40, 50, 60, 70])
+
+
+def test_extend_matches_repeated_append():
+    a = RingBuffer(capacity=7, width=3)
+    b = RingBuffer(capacity=7, width=3)
+    block = numpy.arange(33, dtype=float).reshape(11, 3)
+
+    a.extend(block[:4])
+    a.extend(block[4:])
+    for row in block:
+        b.append(row)
+
+    numpy.testing.assert_array_equal(a.tail(), b.tail())
+    assert a.total == b.total == 11
@@ -0,0 +1,62 @@
+import numpy
+import pytest
+
+import program_configrations
+from heatmap import compile_diagonal_map, compile_diagonal_plan, fill_gaps, resolve_layout
+from sensor_layout import compile_layout, compile_named_layout, compile_upsampler, rasterize_segment, resample_weights
+
+
+def test_row_column_crossings_average_their_pair():
+    layout = compile_named_layout("MUX08")
+    values = numpy.arange(1.0, 9.0)         # R1..R4 = 1..4, C1..C4 = 5..8
+
+    mat = layout.apply(values)
+
+    assert mat.shape == (4, 4)
+    assert mat[0, 0] == (1 + 5) / 2
+    assert mat[3, 2] == (4 + 7) / 2
+    assert resolve_layout(tuple(program_configrations.MUX10_LAYOUT["segments"]))[0] is compile_named_layout("MUX10")
+
+
+def test_gaps_are_folded_into_the_map_and_nan_stays_local():
+    layout = compile_layout({"grid": (3, 3), "segments": {"a": ((0, 0), (0, 0)), "b": ((0, 2), (2, 2)),
+                                                          "c": ((2, 0), (2, 1))}})
+    assert rasterize_segment((0, 0), (2, 4)) == [(0, 0), (0, 1), (1, 2), (2, 3), (2, 4)]
+
+    mat = layout.apply(numpy.array([2.0, 4.0, numpy.nan]))
+
+    assert mat[0, 1] == (2.0 + 4.0) / 2     # LEFT a, RIGHT b
+    assert numpy.isnan(mat[1, 1])             # BOTTOM c (NaN), RIGHT b
+    assert numpy.isfinite(mat[0, :]).all()
+
+
+def test_diagonal_map_matches_plan_plus_fill():
+    coords = tuple(sorted(program_configrations.S5X41_SWITCHER.values()))
+    values = numpy.random.default_rng(5).normal(11_000, 500, size=(10, len(coords)))
+
+    # THE ORIGINAL ALGORITHM: PAIR AVERAGE PER CROSSED CELL, -1 ELSEWHERE, THEN THE 4-NEIGHBOUR GAP FILL
+    plan = compile_diagonal_plan(coords)
+    gathered = numpy.full((len(values), plan.shape[0] * plan.shape[1]), -1.0)
+    gathered[:, plan.cells] = (values[:, plan.idx_a] + values[:, plan.idx_b]) * plan.weights
+    expected = fill_gaps(gathered.reshape((len(values),) + plan.shape))
+
+    numpy.testing.assert_array_equal(compile_diagonal_map(coords).apply(values), expected)
+    for row, frame in zip(values, expected):
+        numpy.testing.assert_array_equal(compile_diagonal_map(coords).apply(row), frame)
+
+
+def test_upsampler_is_one_product_matching_the_coarse_map():
+    layout = compile_named_layout("MUX10")
+    values = numpy.random.default_rng(2).normal(11_000, 500, size=(4, len(layout.keys)))
+
+    same = compile_upsampler(layout, layout.shape, "bilinear")
+    fine = compile_upsampler(layout, (50, 50), "bicubic")
+
+    assert compile_upsampler(layout, (50, 50), "bicubic") is fine
+    numpy.testing.assert_allclose(same.apply(values), layout.apply(values), rtol=1e-12)
+    assert fine.apply(values).shape == (4, 50, 50)
+    assert resample_weights(5, 50, "bicubic").sum(axis=1) == pytest.approx(1.0)
+    # A NaN CHANNEL (DEAD LINE) ONLY BLANKS THE PIXELS IT FEEDS
+    values[0, 0] = numpy.nan
+    out = fine.apply(values[0])
+    assert numpy.isnan(out).any() and numpy.isfinite(out).any()
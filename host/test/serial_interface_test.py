@@ -0,0 +1,29 @@
+from serial_interface import LineReader
+
+
+class _FakeSerial:
+    '''Bytes arrive in the given chunks; read(1) returns b"" once they run out (port timeout)'''
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.buffer = b""
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def read(self, n):
+        if not self.buffer and self.chunks:
+            self.buffer = self.chunks.pop(0)
+        out, self.buffer = self.buffer[:n], self.buffer[n:]
+        return out
+
+
+def test_batches_drain_the_buffer_and_keep_partial_lines():
+    reader = LineReader(_FakeSerial([b"T,1,7,1.0\nT,1,7,2.0\nT,1,", b"7,3.0\r\n\nREADY\n"]))
+
+    assert reader.read_batch() == ["T,1,7,1.0", "T,1,7,2.0"]
+    assert reader.backlog_bytes == len(b"T,1,7,1.0\nT,1,7,2.0\nT,1,") - 1
+    assert reader.read_batch() == ["T,1,7,3.0", "READY"]
+    assert reader.read_batch() == []
+    assert reader.lines_total == 4
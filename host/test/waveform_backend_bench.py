@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Frame-time comparison of the two WaveformApp backends (matplotlib vs Tk strip chart).
+Needs a display. Run from host/:  python test/waveform_backend_bench.py [channels] [frames]
+"""
+import statistics
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import numpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import customtkinter as ctk
+
+from multi_display import WaveformApp
+from payload import Payload
+
+SAMPLING_HZ = 1000
+SAMPLES_PER_FRAME = 33          # ~30 FPS AT 1 kHz
+
+
+def _fill(p: Payload, n: int, start: datetime, rng) -> datetime:
+    phase = numpy.arange(len(p.get_channels()))
+    for _ in range(n):
+        row = 11_000 + 500 * numpy.sin(start.timestamp() * 3 + phase) + rng.normal(0, 20, len(phase))
+        p.push(",".join(f"{v:.3f}" for v in row), time=start)
+        start += timedelta(milliseconds=1000 / SAMPLING_HZ)
+    return start
+
+
+def bench(backend: str, channels: int, frames: int):
+    rng = numpy.random.default_rng(0)
+    keys = [f"{6001 + i} (OHM)" for i in range(channels)]
+    p = Payload(window_size=60_000, num_rows_detach=600, out_file_name="output/bench.csv", channels=channels,
+                keys=keys)
+    now = _fill(p, 10_000, datetime.now(timezone.utc), rng)
+
+    root = ctk.CTk()
+    root.geometry("1000x700")
+    app = WaveformApp(root, p, False, SAMPLING_HZ, backend=backend)
+    app.pack(fill="both", expand=True)
+    app._time_period_switch("10s")
+    for cb in app.channel_box_select.values():
+        cb.select()
+    root.update()
+    app._update_graph()
+    root.update()
+
+    times = []
+    for _ in range(frames):
+        now = _fill(p, SAMPLES_PER_FRAME, now, rng)
+        start = time.perf_counter()
+        app._update_graph()
+        root.update_idletasks()         # INCLUDE THE ACTUAL REPAINT
+        times.append((time.perf_counter() - start) * 1000)
+        root.update()
+    root.destroy()
+    return times
+
+
+if __name__ == "__main__":
+    n_channels = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    for name in ("matplotlib", "tk"):
+        t = bench(name, n_channels, n_frames)
+        print(f"{name:>10}: mean {statistics.mean(t):7.2f} ms   median {statistics.median(t):7.2f} ms   "
+              f"p95 {sorted(t)[int(len(t) * 0.95)]:7.2f} ms   ({n_channels} channels, {n_frames} frames)")